@@ -1,10 +1,20 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import json
-import base64
 import os
-from fantasy_auction import FantasyAuction, teams_data, SALARY, FORWARD, DEFENCE, GOALIE
+import threading
+import uuid
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from auction_log import AuctionLog, CorruptLogError, remove_unused_drafts
+from fantasy_auction import DEFAULT_LEAGUE, POSITIONS, SOLVER_BACKENDS, TOP_ROSTERS, BackgroundSolver, LeagueRegistry
+from league_optimizer import optimize_league, summarize_league
+from stochastic_roster import (MAX_SCENARIOS, OBJECTIVES, STOCHASTIC_SCENARIOS, STRESS_OVERSHOOT, STRESS_PLAYERS,
+                               optimize_stochastic)
+from table_renderer import load_logo_data, render_table_html
+
+# Columns written on a session's players table copy only that column, so sessions
+# forked from the same league baseline share every column they never change
+pd.set_option("mode.copy_on_write", True)
 
 
 # Page configuration
@@ -71,149 +81,138 @@ def load_custom_css():
 
 
 # Helper functions for styling
-def get_nhl_logo_path(team_code):
-    """Get the path to NHL team logo"""
-    # Try the new NHL logos first
-    logo_path = f"assets/nhl_logos/{team_code}.png"
-    if os.path.exists(logo_path):
-        return logo_path
-    # Fallback to FCHL logos
-    logo_path = f"assets/nhl_logos/{team_code}.png"
-    if os.path.exists(logo_path):
-        return logo_path
-    return None
-
-
-def get_logo_base64(team_code):
-    """Get base64 encoded logo for a team"""
-    logo_path = get_nhl_logo_path(team_code)
-    if logo_path:
-        try:
-            with open(logo_path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
-        except:
-            return None
-    return None
+@st.cache_resource
+def load_logo_cache():
+    """Read and base64-encode every NHL logo once per process"""
+    return load_logo_data()
+
+
+def get_logo_data_url(team_code):
+    """Get a data URL for a team logo, suitable for ImageColumn"""
+    logo = load_logo_cache().get(team_code)
+    return logo['data_url'] if logo else None
+
+
+# Directory holding one event log and snapshot set per draft, grouped by league
+AUCTION_LOG_DIRECTORY = "auction_logs"
+# Optional file of further leagues to serve, {league id: teams JSON, players CSV and settings}
+LEAGUES_CONFIG = "leagues.json"
+# Default solver limits; one thread per session so concurrent drafts share the CPUs
+SOLVER_TIME_LIMIT = 5.0
+SOLVER_GAP_LIMIT = 0.0
+SOLVER_THREADS = 1
+# Exact dynamic program by default; SCIP takes the time and gap limits
+SOLVER_BACKEND = 'knapsack'
+SOLVER_BACKEND_LABELS = {'knapsack': "Exact knapsack", 'scip': "SCIP MIP"}
+
+
+@st.cache_resource
+def get_league_registry():
+    """League registry shared by every session served from this process"""
+    registry = LeagueRegistry()
+    registry.add_league(DEFAULT_LEAGUE.name, DEFAULT_LEAGUE, "players-24.csv")
+    if os.path.exists(LEAGUES_CONFIG):
+        registry.add_leagues_from_json(LEAGUES_CONFIG)
+    return registry
+
+
+@st.cache_resource
+def get_session_solvers():
+    """Lock and BackgroundSolver by session id of every session served from this process"""
+    return threading.Lock(), {}
+
+
+def register_solver(solver):
+    """Track this session's solver, stopping the solvers of sessions that have ended"""
+    ctx = get_script_run_ctx()
+    if ctx is None or not runtime.exists():
+        return
+    lock, solvers = get_session_solvers()
+    is_active = runtime.get_instance().is_active_session
+    with lock:
+        ended = [session_id for session_id in solvers if not is_active(session_id)]
+        stopping = [solvers.pop(session_id) for session_id in ended]
+        solvers[ctx.session_id] = solver
+    for other in stopping:
+        other.stop(timeout=5.0)
+
+
+def switch_league(league_id):
+    """Start a new draft of another league in this session, stopping the current one's solver"""
+    if st.session_state.solver is not None:
+        st.session_state.solver.stop(timeout=5.0)
+    for key in ('auction', 'players_df', 'baseline_df', 'solver', 'optimal_team',
+                'league_forecast', 'stochastic_plan'):
+        st.session_state[key] = None
+    st.query_params["league"] = league_id
+    st.query_params.pop("draft", None)
+    st.rerun()
+
+
+@st.cache_resource
+def remove_unused_draft_logs():
+    """Delete, once per process, the logs of drafts that were opened and never recorded a sale"""
+    if not os.path.isdir(AUCTION_LOG_DIRECTORY):
+        return []
+    return [path for league_id in sorted(os.listdir(AUCTION_LOG_DIRECTORY))
+            for path in remove_unused_drafts(os.path.join(AUCTION_LOG_DIRECTORY, league_id))]
+
+
+def get_draft_id():
+    """Draft this session runs, named in the URL so a refresh resumes it; a new one otherwise"""
+    if "draft" not in st.query_params:
+        st.query_params["draft"] = uuid.uuid4().hex[:12]
+    return st.query_params["draft"]
+
+
+def get_auction_log(league_id, draft_id):
+    """Event log of one draft of the league, kept across browser refreshes and restarts"""
+    return AuctionLog(os.path.join(AUCTION_LOG_DIRECTORY, str(league_id), os.path.basename(str(draft_id))))
+
+
+def league_config():
+    """Config of the league this session is running an auction for"""
+    if st.session_state.auction is None:
+        return DEFAULT_LEAGUE
+    return st.session_state.auction.config
+
+
+def solver_limits():
+    """BackgroundSolver limits from the sidebar's solver settings"""
+    return {
+        'time_limit': st.session_state.solver_time_limit,
+        'gap_limit': st.session_state.solver_gap_limit / 100,
+        'threads': SOLVER_THREADS,
+    }
 
 
-def display_styled_dataframe(df, columns, title="", show_logos=True):
+def display_styled_dataframe(df, columns, title="", show_logos=True, page_size=None, key=None):
     """Display a dataframe with custom styling for groups, positions, and logos"""
     if df.empty:
         st.info(f"No data to display{' for ' + title if title else ''}")
         return
 
-    # Create a copy for display
-    display_df = df[columns].copy()
-
     if title:
         st.subheader(title)
 
-    # Style the dataframe with custom HTML
-    html_table = "<div style='max-height: 400px; overflow-y: auto;'><table style='width: 100%; border-collapse: collapse;'>"
-
-    # Header
-    html_table += "<thead><tr style='background-color: #f0f2f6; position: sticky; top: 0;'>"
-    for col in display_df.columns:
-        html_table += f"<th style='padding: 8px; text-align: left; border-bottom: 2px solid #ddd;'>{col}</th>"
-    html_table += "</tr></thead><tbody>"
-
-    # Rows
-    for idx, row in display_df.iterrows():
-        html_table += "<tr style='border-bottom: 1px solid #eee;'>"
-        for col in display_df.columns:
-            cell_value = str(row[col])
-            style = "padding: 8px; vertical-align: middle;"
-
-            # Add NHL logo for player column
-            if col == 'PLAYER' and show_logos and 'NHL TEAM' in df.columns:
-                nhl_team = df.loc[
-                    idx, 'NHL TEAM'] if 'NHL TEAM' in df.columns else ''
-                logo_b64 = get_logo_base64(nhl_team)
-                if logo_b64:
-                    cell_value = f'<img src="data:image/png;base64,{logo_b64}" style="width: 20px; height: 20px; margin-right: 5px; vertical-align: middle; object-fit: contain;">{cell_value}'
-
-            # Style group column with full CSS styles
-            elif col == 'GROUP':
-                group_styles = {
-                    '3':
-                    'background-color: rgba(69, 90, 100, 0.1); color: #455a64; border: 1px solid rgba(69, 90, 100, 0.3);',
-                    '2':
-                    'background-color: rgba(67, 160, 71, 0.1); color: #43a047; border: 1px solid rgba(67, 160, 71, 0.3);',
-                    'A':
-                    'background-color: rgba(41, 182, 246, 0.1); color: #29b6f6; border: 1px solid rgba(41, 182, 246, 0.3);',
-                    'B':
-                    'background-color: rgba(3, 169, 244, 0.1); color: #03a9f4; border: 1px solid rgba(3, 169, 244, 0.3);',
-                    'C':
-                    'background-color: rgba(3, 155, 229, 0.1); color: #039be5; border: 1px solid rgba(3, 155, 229, 0.3);',
-                    'D':
-                    'background-color: rgba(2, 136, 209, 0.1); color: #0288d1; border: 1px solid rgba(2, 136, 209, 0.3);',
-                    'E':
-                    'background-color: rgba(2, 119, 189, 0.1); color: #0277bd; border: 1px solid rgba(2, 119, 189, 0.3);',
-                    'F':
-                    'background-color: rgba(1, 87, 155, 0.1); color: #01579b; border: 1px solid rgba(1, 87, 155, 0.3);',
-                    'G':
-                    'background-color: rgba(1, 87, 155, 0.1); color: #01579b; border: 1px solid rgba(1, 87, 155, 0.3);',
-                    'T':
-                    'background-color: rgba(240, 98, 146, 0.1); color: #f06292; border: 1px solid rgba(240, 98, 146, 0.3);'
-                }
-                group_style = group_styles.get(
-                    cell_value, 'background-color: #f0f0f0; color: #666;')
-                cell_value = f'<span style="padding: 2px 6px; border-radius: 4px; font-size: 0.85em; font-weight: 500; {group_style}">{cell_value}</span>'
-
-            # Style position column with full CSS styles
-            elif col == 'POS':
-                pos_styles = {
-                    'F':
-                    'background-color: #188ae2; color: #fff; border: 1px solid #188ae2;',
-                    'D':
-                    'background-color: #5b69bc; color: #fff; border: 1px solid #5b69bc;',
-                    'G':
-                    'background-color: #3b3e47; color: #fff; border: 1px solid #3b3e47;'
-                }
-                pos_style = pos_styles.get(
-                    cell_value, 'background-color: #b2b2b2; color: #fff;')
-                cell_value = f'<span style="padding: 2px 6px; border-radius: 4px; font-size: 0.85em; font-weight: 500; {pos_style}">{cell_value}</span>'
-
-            # Style team column with full CSS styles
-            elif col == 'FCHL TEAM' and cell_value in teams_data:
-                panel_id = teams_data[cell_value].get('id', 1)
-                team_styles = {
-                    1:
-                    'background: linear-gradient(to right, #ea217b, #ff7e31); color: #fff;',
-                    2:
-                    'background: linear-gradient(to right, #000, #464646); color: #fff;',
-                    3:
-                    'background: linear-gradient(to right, #F4DD2E, #E02B15); color: #000;',
-                    4:
-                    'background: linear-gradient(to right, #26535f, #ed8e37); color: #fff;',
-                    5:
-                    'background: linear-gradient(to right, #0D4499, #E7CD38); color: #fff;',
-                    6:
-                    'background: linear-gradient(to right, #003876, #001f43); color: #fff;',
-                    7:
-                    'background: linear-gradient(to right, #012169, #FC4C02); color: #fff;',
-                    8:
-                    'background: linear-gradient(to right, #000, #d10000); color: #fff;',
-                    9:
-                    'background: linear-gradient(to right, #164846, #80C042); color: #fff;',
-                    10:
-                    'background: linear-gradient(to right, #172b1d, #8eaf38); color: #fff;',
-                    11:
-                    'background: linear-gradient(to right, #BD2F2E, #815061); color: #fff;'
-                }
-                team_style = team_styles.get(
-                    panel_id, 'background-color: #f0f0f0; color: #666;')
-                cell_value = f'<span style="padding: 2px 6px; border-radius: 4px; font-size: 0.85em; font-weight: 500; {team_style}">{cell_value}</span>'
-
-            html_table += f"<td style='{style}'>{cell_value}</td>"
-        html_table += "</tr>"
-
-    html_table += "</tbody></table></div>"
-
+    # Only the visible page is rendered and sent to the browser
+    if page_size and len(df) > page_size:
+        page_count = (len(df) - 1) // page_size + 1
+        page = st.number_input("Page",
+                               min_value=1,
+                               max_value=page_count,
+                               value=1,
+                               step=1,
+                               key=f"{key or title or 'table'}_page")
+        start = (page - 1) * page_size
+        total_rows = len(df)
+        df = df.iloc[start:start + page_size]
+        st.caption(f"Rows {start + 1}-{start + len(df)} of {total_rows}")
+
+    html_table = render_table_html(df, columns, logos=load_logo_cache(),
+                                   teams=league_config().teams, show_logos=show_logos)
     st.markdown(html_table, unsafe_allow_html=True)
 
-    return display_df
-
 
 def format_player_with_logo(player_name, nhl_team):
     """Format player name with NHL team logo (simplified for display)"""
@@ -242,6 +241,20 @@ if 'players_df' not in st.session_state:
     st.session_state.players_df = None
 if 'baseline_df' not in st.session_state:
     st.session_state.baseline_df = None
+if 'solver' not in st.session_state:
+    st.session_state.solver = None
+if 'solver_time_limit' not in st.session_state:
+    st.session_state.solver_time_limit = SOLVER_TIME_LIMIT
+if 'solver_gap_limit' not in st.session_state:
+    st.session_state.solver_gap_limit = SOLVER_GAP_LIMIT
+if 'solver_limits_applied' not in st.session_state:
+    st.session_state.solver_limits_applied = (SOLVER_TIME_LIMIT, SOLVER_GAP_LIMIT)
+if 'solver_backend' not in st.session_state:
+    st.session_state.solver_backend = SOLVER_BACKEND
+if 'league_forecast' not in st.session_state:
+    st.session_state.league_forecast = None
+if 'stochastic_plan' not in st.session_state:
+    st.session_state.stochastic_plan = None
 
 
 def load_csv_data(uploaded_file):
@@ -411,11 +424,11 @@ def display_team_budgets():
     total_committed = sum(b['committed_salary'] for b in team_budgets.values())
     total_penalties = sum(b['penalty'] for b in team_budgets.values())
     total_spent = total_committed + total_penalties
-    total_available = (SALARY * 11) - total_spent
+    total_available = (league_config().salary * league_config().n_teams) - total_spent
 
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Pool", f"${SALARY * 11:.1f}")
+        st.metric("Total Pool", f"${league_config().salary * league_config().n_teams:.1f}")
     with col2:
         st.metric("Total Committed", f"${total_committed:.1f}")
     with col3:
@@ -428,6 +441,8 @@ def remaining_players_interface():
         return
 
     st.subheader("Remaining Players")
+    market_panel(st.session_state.auction)
+    league_forecast_panel(st.session_state.auction)
 
     # Get available players for auction
     available_players = st.session_state.auction.get_available_players()
@@ -468,7 +483,9 @@ def remaining_players_interface():
             # Use the custom styled display function
             display_styled_dataframe(filtered_df,
                                      display_columns,
-                                     show_logos=True)
+                                     show_logos=True,
+                                     page_size=50,
+                                     key="remaining_players")
 
             st.info(
                 f"Showing {len(filtered_df)} available players for auction")
@@ -497,8 +514,8 @@ def remaining_players_interface():
             with col2:
                 selected_team = st.selectbox(
                     "Assign to Team",
-                    options=list(teams_data.keys()),
-                    format_func=lambda x: f"{x} - {teams_data[x]['name']}",
+                    options=list(league_config().teams.keys()),
+                    format_func=lambda x: f"{x} - {league_config().teams[x]['name']}",
                     key="assign_team_select")
 
             with col3:
@@ -515,6 +532,17 @@ def remaining_players_interface():
                                                 step=0.1,
                                                 key="assign_price_input")
 
+            # Reservation price for the nominated player
+            if selected_player is not None and st.button(
+                    "💰 Max Bid", key="max_bid_btn"):
+                result = st.session_state.auction.max_bid(selected_player[0])
+                player_name = selected_player[1].split(' (')[0]
+                if result['max_bid'] is None:
+                    st.warning(f"{player_name} does not fit the optimal BOT team at any price")
+                else:
+                    st.info(f"Pay up to ${result['max_bid']:.1f} for {player_name}")
+                    st.dataframe(result['evaluations'], use_container_width=True, hide_index=True)
+
             if st.button(
                     "Assign Player",
                     key="assign_player_btn") and selected_player is not None:
@@ -528,32 +556,67 @@ def remaining_players_interface():
                         player_idx, selected_team, auction_price)
                     auto_recalculate()
                     st.success(
-                        f"Assigned {selected_player[1].split(' (')[0]} to {teams_data[selected_team]['name']} for ${auction_price}"
+                        f"Assigned {selected_player[1].split(' (')[0]} to {league_config().teams[selected_team]['name']} for ${auction_price}"
                     )
                     st.rerun()
                 else:
                     st.error(
-                        f"Insufficient budget! {teams_data[selected_team]['name']} has ${team_budgets[selected_team]['remaining']:.1f} remaining"
+                        f"Insufficient budget! {league_config().teams[selected_team]['name']} has ${team_budgets[selected_team]['remaining']:.1f} remaining"
                     )
 
     else:
         st.info("No players currently available for auction")
 
+def market_panel(auction):
+    """Live market inflation and per-position scarcity the remaining bids are priced from"""
+    history = auction.market_history
+    if not history:
+        return
+
+    latest = history[-1]
+    previous = history[-2] if len(history) > 1 else latest
+    columns = st.columns(2 + len(POSITIONS))
+    columns[0].metric("Market inflation", f"{latest['inflation']:.2f}x",
+                      delta=f"{latest['inflation'] - previous['inflation']:+.2f}",
+                      help="Money left per unit of opening value of the remaining players, "
+                           "relative to when the auction opened")
+    columns[1].metric("Money left", f"${latest['money']:.1f}",
+                      help=f"{latest['open_slots']} open roster slots, {latest['supply']} draftable players")
+    for column, pos in zip(columns[2:], POSITIONS):
+        column.metric(f"{pos} scarcity", f"{latest[f'scarcity_{pos}']:.2f}x",
+                      help="Open slots per draftable player, relative to when the auction opened")
+
+    if len(history) > 1:
+        with st.expander("📈 Inflation over the auction"):
+            history_df = pd.DataFrame(history)
+            history_df.index.name = 'change'
+            st.line_chart(history_df[['inflation'] + [f'scarcity_{pos}' for pos in POSITIONS]])
+
+
+def league_forecast_panel(auction):
+    """Where every team is predicted to spend its remaining cap, re-solved when the data changes"""
+    forecast = st.session_state.league_forecast
+    if forecast is None or forecast[0] != auction.data_version:
+        # The previous forecast warm-starts the joint model if it is needed
+        result = optimize_league(auction, previous=None if forecast is None else forecast[1])
+        st.session_state.league_forecast = forecast = (auction.data_version, result)
+    result = forecast[1]
+
+    with st.expander("🔮 League forecast"):
+        st.dataframe(summarize_league(auction, result), use_container_width=True)
+        gap = "" if result['gap'] is None else f", within {result['gap']:.2%} of the best possible"
+        st.caption(f"{result['method']}{gap} — {result['candidates']} of {result['free_agents']} "
+                   f"free agents considered, {result['time'] * 1000:.0f} ms")
+
+
 def auto_recalculate():
     """Auto-recalculate when data changes"""
     if st.session_state.auction is not None:
         result = st.session_state.auction.process_data()
         if result:
             st.session_state.players_df = st.session_state.auction.players_df
-            # Auto-run optimization for BOT team
-            try:
-                st.session_state.auction.build_model()
-                solution = st.session_state.auction.solve_model()
-                if solution:
-                    st.session_state.optimal_team = st.session_state.auction.get_bot_optimal_team(
-                    )
-            except:
-                pass  # Silent fail for optimization
+            # Re-optimize the BOT team in the background; a burst of edits costs one solve
+            st.session_state.solver.request(st.session_state.auction)
 
 
 def bot_team_interface():
@@ -564,7 +627,7 @@ def bot_team_interface():
     st.subheader("🤖 Bridlewood AI Team Optimization")
 
     # Current BOT roster
-    bot_roster = st.session_state.auction.get_team_roster('BOT')
+    bot_roster = st.session_state.auction.get_team_roster(league_config().own_team)
 
     st.subheader("Current BOT Roster")
     if not bot_roster.empty:
@@ -645,7 +708,7 @@ def bot_team_interface():
     # Budget & Requirements section moved below
     st.subheader("Budget & Requirements")
     team_budgets = st.session_state.auction.get_team_budgets()
-    bot_budget = team_budgets.get('BOT', {})
+    bot_budget = team_budgets.get(league_config().own_team, {})
 
     if bot_budget:
         col1, col2, col3 = st.columns(3)
@@ -653,17 +716,58 @@ def bot_team_interface():
             st.metric("Remaining Budget",
                       f"${bot_budget.get('remaining', 0):.1f}")
         with col2:
-            st.write(f"**Target:** {FORWARD}F / {DEFENCE}D / {GOALIE}G")
+            st.write(f"**Target:** {league_config().forward}F / {league_config().defence}D / {league_config().goalie}G")
         with col3:
             st.write(
                 f"**Current:** {bot_budget.get('f_count', 0)}F / {bot_budget.get('d_count', 0)}D / {bot_budget.get('g_count', 0)}G"
             )
 
-    # Display optimal team if available
-    if 'optimal_team' in st.session_state and st.session_state.optimal_team is not None:
+    # Display optimal team, refreshed in place while the background solve is running
+    stale = st.session_state.solver is not None and st.session_state.solver.is_stale()
+    st.fragment(run_every=0.5 if stale else None)(optimal_team_panel)(stale)
+
+    stochastic_plan_panel(st.session_state.auction)
+
+
+def optimal_team_panel(was_stale):
+    """Optimal BOT team from the background solver, marked stale until the latest edit is solved"""
+    solver = st.session_state.solver
+    if solver is not None and solver.result is not None and solver.result['optimal_team'] is not None:
+        st.session_state.optimal_team = solver.result['optimal_team']
+    stale = solver is not None and solver.is_stale()
+    if was_stale and not stale:
+        # Solve finished: rerun the page so every tab sees the new data and polling stops
+        st.rerun()
+
+    # Improving rosters of the running solve replace the previous team as they arrive
+    incumbent = solver.incumbent if stale else None
+    if incumbent is not None and incumbent['version'] != solver.requested_version:
+        incumbent = None
+    # Until then the best cached roster that survived the latest changes stands in
+    fallbacks = [roster for roster in solver.fallbacks if roster['version'] == solver.requested_version] \
+        if stale else []
+    fallback = fallbacks[0] if fallbacks and incumbent is None else None
+
+    if incumbent is not None or ('optimal_team' in st.session_state and st.session_state.optimal_team is not None):
         st.subheader("🏆 Optimal BOT Team Configuration")
-
-        optimal_df = st.session_state.optimal_team
+        if incumbent is not None:
+            st.caption(f"⏳ Re-optimizing — best team found so far, within {incumbent['gap']:.1%} of optimal")
+        elif fallback is not None:
+            st.caption(f"⚡ Re-optimizing — showing the best of {len(fallbacks)} cached plans "
+                       f"still open after your latest changes")
+        elif stale:
+            st.caption("⏳ Re-optimizing after your latest changes — showing the previous optimal team")
+        elif solver is not None and solver.result is not None and solver.result['status'] != "optimal" \
+                and solver.result['gap'] is not None:
+            st.caption(f"⏱️ Solver stopped at its {solver.result['status'][:-5]} limit — "
+                       f"team is within {solver.result['gap']:.1%} of optimal")
+
+        if incumbent is not None:
+            optimal_df = incumbent['optimal_team']
+        elif fallback is not None:
+            optimal_df = fallback['optimal_team']
+        else:
+            optimal_df = st.session_state.optimal_team
         if not optimal_df.empty:
             # Sort by position and points
             position_order = {'F': 1, 'D': 2, 'G': 3}
@@ -695,7 +799,75 @@ def bot_team_interface():
             with col3:
                 st.metric("Total Cost", f"${total_cost:.1f}")
             with col4:
-                st.metric("Remaining Budget", f"${SALARY - total_cost:.1f}")
+                st.metric("Remaining Budget", f"${league_config().salary - total_cost:.1f}")
+
+        if stale:
+            fallback_rosters_panel(fallbacks)
+        elif solver is not None and solver.result is not None:
+            fallback_rosters_panel(solver.result.get('rosters', []))
+
+
+def fallback_rosters_panel(rosters):
+    """Next best distinct rosters, each by the players it swaps for the best one"""
+    if len(rosters) < 2:
+        return
+    names = st.session_state.auction.players_df['PLAYER']
+    best = set(rosters[0]['players'])
+    with st.expander(f"🔁 Fallback plans ({len(rosters) - 1})"):
+        st.caption("Ready the moment a target is bought by someone else")
+        st.dataframe(pd.DataFrame([{
+            'PTS': roster['objective'],
+            'DRAFT COST': round(roster['cost'], 1),
+            'ADDS': ", ".join(names.loc[[idx for idx in roster['players'] if idx not in best]]),
+            'DROPS': ", ".join(names.loc[[idx for idx in rosters[0]['players'] if idx not in set(roster['players'])]]),
+        } for roster in rosters[1:]]), use_container_width=True, hide_index=True)
+
+
+def stochastic_plan_panel(auction):
+    """BOT roster planned against sampled prices and points, solved on request since it takes seconds"""
+    with st.expander("🎲 Stochastic plan"):
+        col1, col2 = st.columns(2)
+        with col1:
+            objective = st.selectbox("Objective", options=list(OBJECTIVES), format_func=OBJECTIVES.get,
+                                     key="stochastic_objective")
+        with col2:
+            n_scenarios = st.number_input("Scenarios", min_value=20, max_value=MAX_SCENARIOS,
+                                          value=STOCHASTIC_SCENARIOS, step=20, key="stochastic_scenarios")
+
+        if st.button("Plan against price and points noise", key="stochastic_plan_btn"):
+            with st.spinner("Solving over sampled prices and points..."):
+                st.session_state.stochastic_plan = (auction.data_version,
+                                                    optimize_stochastic(auction, objective, int(n_scenarios)))
+
+        if st.session_state.stochastic_plan is None:
+            return
+        version, result = st.session_state.stochastic_plan
+        if version != auction.data_version:
+            st.caption("⏳ Planned before your latest changes — plan again to refresh")
+        if result['objective'] is None:
+            st.warning("No roster fits the remaining cap over the sampled prices")
+            return
+
+        position_order = {'F': 1, 'D': 2, 'G': 3}
+        team = result['optimal_team'].sort_values(['POS', 'PTS'], ascending=[True, False],
+                                                  key=lambda column: column.map(position_order)
+                                                  if column.name == 'POS' else column)
+        display_columns = ['PLAYER', 'POS', 'PTS', 'SALARY', 'BID', 'TOTAL_COST', 'FCHL TEAM', 'STATUS']
+        st.dataframe(team[display_columns], use_container_width=True, hide_index=True)
+        evaluation = result['evaluation'].rename(columns={
+            'expected_pts': 'PTS', 'cvar_pts': 'WORST-CASE PTS', 'cost': 'DRAFT COST', 'tail_cost': 'WORST-CASE COST',
+            'fit_rate': 'FITS CAP', 'stress_cost': 'STRESS COST',
+        })
+        evaluation.index = evaluation.index.str.capitalize()
+        st.dataframe(evaluation.style.format({'PTS': '{:.0f}', 'WORST-CASE PTS': '{:.0f}', 'DRAFT COST': '${:.1f}',
+                                              'WORST-CASE COST': '${:.1f}', 'FITS CAP': '{:.0%}',
+                                              'STRESS COST': '${:.1f}'}),
+                     use_container_width=True)
+        gap = "" if not result['gap'] else f", within {result['gap']:.1%} of the best over them"
+        st.caption(f"Solved over {result['scenarios']} scenarios{gap}, compared on as many held-out ones — "
+                   f"worst-case columns average the worst {result['alpha']:.0%} of them, stress cost prices the "
+                   f"{STRESS_PLAYERS} priciest bids {STRESS_OVERSHOOT:.0%} high; cap ${result['cap']:.1f}, "
+                   f"{result['time']:.1f} s")
 
 
 def team_preview_interface():
@@ -706,8 +878,8 @@ def team_preview_interface():
     # Team selection
     selected_team = st.selectbox(
         "Select Team to View/Edit",
-        options=list(teams_data.keys()),
-        format_func=lambda x: f"{x} - {teams_data[x]['name']}")
+        options=list(league_config().teams.keys()),
+        format_func=lambda x: f"{x} - {league_config().teams[x]['name']}")
 
     if selected_team:
         team_roster = st.session_state.auction.get_team_roster(selected_team)
@@ -735,7 +907,7 @@ def team_preview_interface():
                 'sort_key', axis=1)
 
             # Apply gradient styling to team name header
-            team_info = teams_data[selected_team]
+            team_info = league_config().teams[selected_team]
             panel_id = team_info.get('id', 1)
             team_styles = {
                 1:
@@ -802,19 +974,8 @@ def team_preview_interface():
             styled_display['GROUP'] = styled_display['GROUP'].apply(
                 format_group_badge)
 
-            # Create base64 encoded logos for NHL teams - insert after NHL TEAM column
-            def get_logo_data_url(team_code):
-                if pd.notna(team_code):
-                    logo_path = get_nhl_logo_path(team_code)
-                    if logo_path and os.path.exists(logo_path):
-                        with open(logo_path, "rb") as f:
-                            import base64
-                            encoded = base64.b64encode(f.read()).decode()
-                            return f"data:image/png;base64,{encoded}"
-                return None
-
-            # Replace NHL TEAM column with Logo column
-            styled_display['NHL TEAM'] = styled_display['NHL TEAM'].apply(get_logo_data_url)
+            # Replace NHL TEAM column with Logo column using the cached data URLs
+            styled_display['NHL TEAM'] = styled_display['NHL TEAM'].map(get_logo_data_url)
 
             # Rename columns for display (7 columns total)
             styled_display.columns = [
@@ -953,7 +1114,7 @@ def team_preview_interface():
 
         else:
             st.info(
-                f"No players currently on {teams_data[selected_team]['name']} roster"
+                f"No players currently on {league_config().teams[selected_team]['name']} roster"
             )
 
 
@@ -968,6 +1129,28 @@ def optimization_interface():
     team_preview_interface()
 
 
+def diagnostics_panel(auction):
+    """Sidebar table of per-phase timings and solver metrics of the latest recalculations"""
+    with st.expander("🩺 Diagnostics"):
+        # Copied, as the background solver may still be timing its phases into the latest record
+        records = auction.get_diagnostics()
+        if not records:
+            st.caption("No recalculations yet")
+            return
+
+        diagnostics_df = pd.json_normalize(records[::-1])
+        diagnostics_df.columns = [col.split('.', 1)[-1] for col in diagnostics_df.columns]
+        latest = records[-1]['phases']
+        if latest:
+            # Phases hold self time, excluding the phases nested in them, so they can be compared
+            slowest = max(latest, key=latest.get)
+            st.caption(f"Slowest phase of the last recalculation: {slowest} ({latest[slowest]:.0f} ms "
+                       f"of {sum(latest.values()):.0f} ms)")
+        st.dataframe(diagnostics_df.drop(columns=['time']).round(1), use_container_width=True)
+        st.download_button("Export JSON lines", auction.export_diagnostics(),
+                           file_name="diagnostics.jsonl", mime="application/jsonl")
+
+
 def main():
     # Set page configuration with hidden sidebar
     st.set_page_config(page_title="2025 BOT Draft Agent",
@@ -978,42 +1161,55 @@ def main():
     # Load custom CSS styling
     load_custom_css()
 
-    # Auto-load the saved CSV file
-    csv_file_path = "players-24.csv"
+    # Auto-load the saved CSV file of the league named in the URL
+    registry = get_league_registry()
+    remove_unused_draft_logs()
+    league_id = st.query_params.get("league", DEFAULT_LEAGUE.name)
 
     try:
         # Load CSV data automatically
         if st.session_state.players_df is None:
-            df = pd.read_csv(csv_file_path)
+            # Resume the league's draft from its log once it has started
+            config = registry.get_config(league_id)
+            auction_log = get_auction_log(league_id, get_draft_id())
+            if auction_log.seq > 0:
+                # A log whose snapshots are gone is replayed from the league's baseline
+                auction = auction_log.restore(config, baseline=registry.get_baseline(league_id)[0])
+                # Replayed sales, and snapshots taken between a sale and its revaluation, need valuing
+                result = auction.process_data()
+                optimal_team = None
+            else:
+                # Forked from the league's processed and solved baseline, built once per process. It is
+                # already valued, so it shares every column with the baseline until the first sale
+                auction = registry.create_auction(league_id)
+                result = True
+                optimal_team = registry.get_baseline(league_id)[1]
 
-            # Data validation and processing
-            df['SALARY'] = df['SALARY'].astype(str).replace('nan', '0.0').astype(float)
-            df['BID'] = df['BID'].astype(str).replace('nan', '0.0').astype(float)
-            df['PTS'] = df['PTS'].astype(str).replace('nan', '0.0').astype(float)
-            df['AGE'] = df['AGE'].astype(str).replace('nan', '0').astype(int)
-            
             # Initialize session state
-            st.session_state.players_df = df
-            st.session_state.baseline_df = df.copy()
-            st.session_state.auction = FantasyAuction(df=df)
+            st.session_state.players_df = auction.players_df
+            st.session_state.baseline_df = registry.get_base_table(registry.leagues[league_id][1])
+            st.session_state.auction = auction
+            st.session_state.solver = BackgroundSolver(config, backend=st.session_state.solver_backend,
+                                                       alternatives=TOP_ROSTERS, **solver_limits())
+            register_solver(st.session_state.solver)
 
-            # Process initial data and auto-optimize
-            result = st.session_state.auction.process_data()
             if result:
+                auction_log.attach(auction)
                 st.session_state.players_df = st.session_state.auction.players_df
-                # Auto-run initial optimization
-                try:
-                    st.session_state.auction.build_model()
-                    solution = st.session_state.auction.solve_model()
-                    if solution:
-                        st.session_state.optimal_team = st.session_state.auction.get_bot_optimal_team(
-                        )
-                except:
-                    pass  # Silent fail for initial optimization
+                if optimal_team is not None:
+                    st.session_state.optimal_team = optimal_team
+                else:
+                    # Auto-run initial optimization
+                    st.session_state.solver.request(auction)
                 st.success("Player data loaded and optimized!")
             else:
                 st.error("Error processing player data")
 
+    except KeyError:
+        st.error(f"Unknown league: {league_id}")
+    except CorruptLogError as e:
+        st.error(f"The saved draft {st.query_params.get('draft')} cannot be resumed: {e}")
+        st.info("Remove the draft from the URL to start a new one")
     except FileNotFoundError:
         st.error("players-24.csv file not found in the project directory")
         st.info(
@@ -1039,11 +1235,42 @@ def main():
         # League info
         st.markdown("---")
         st.subheader("League Settings")
-        st.write(f"**Salary Cap:** ${SALARY}")
-        st.write(f"**Teams:** 11")
-        st.write(f"**Forwards:** {FORWARD}")
-        st.write(f"**Defence:** {DEFENCE}")
-        st.write(f"**Goalies:** {GOALIE}")
+        leagues = list(registry.leagues)
+        selected_league = st.selectbox("League", leagues,
+                                       index=leagues.index(league_id) if league_id in leagues else None,
+                                       help="Switching starts a new draft of that league")
+        if selected_league is not None and selected_league != league_id:
+            switch_league(selected_league)
+        config = league_config()
+        st.write(f"**League:** {config.name}")
+        st.write(f"**Salary Cap:** ${config.salary}")
+        st.write(f"**Teams:** {config.n_teams}")
+        st.write(f"**Forwards:** {config.forward}")
+        st.write(f"**Defence:** {config.defence}")
+        st.write(f"**Goalies:** {config.goalie}")
+
+        # Solver limits for the BOT optimizer
+        st.markdown("---")
+        st.subheader("Solver Settings")
+        backend = st.selectbox("Solver", list(SOLVER_BACKENDS), key="solver_backend",
+                               format_func=SOLVER_BACKEND_LABELS.get,
+                               help="Both find the same optimal team; the knapsack skips building a model")
+        if st.session_state.solver is not None and backend != st.session_state.solver.backend:
+            st.session_state.solver.set_backend(backend)
+        time_limit = st.number_input("Time limit (seconds)", min_value=0.1, step=1.0,
+                                     key="solver_time_limit", disabled=backend != 'scip',
+                                     help="Stop and keep the best team found after this long")
+        gap_limit = st.number_input("Gap target (%)", min_value=0.0, max_value=100.0, step=0.5,
+                                    key="solver_gap_limit", disabled=backend != 'scip',
+                                    help="Stop once the team is proven within this much of optimal")
+        if st.session_state.solver is not None and \
+                (time_limit, gap_limit) != st.session_state.solver_limits_applied:
+            st.session_state.solver.set_limits(**solver_limits())
+            st.session_state.solver_limits_applied = (time_limit, gap_limit)
+
+        # Where the time of recent recalculations went
+        if st.session_state.auction is not None:
+            diagnostics_panel(st.session_state.auction)
 
     # Main content area
     if st.session_state.auction is None:
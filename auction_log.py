@@ -0,0 +1,268 @@
+import glob
+import json
+import os
+import shutil
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from fantasy_auction import FantasyAuction, REPLAY_COLUMNS
+
+"""
+Persistent auction event log
+Every FantasyAuction mutation is appended to events.jsonl, and the players table
+is checkpointed to a Feather snapshot every snapshot_every events, so any point
+of the draft is restored from the nearest snapshot plus a short replay. Each
+draft has its own directory; writers sharing one take their sequence numbers
+from the file under a lock, so events and snapshots never collide.
+"""
+
+EVENTS_FILE = "events.jsonl"
+SNAPSHOT_PATTERN = "snapshot_{:08d}.feather"
+
+# One lock per events file, shared by every AuctionLog of this process writing to it
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+class CorruptLogError(ValueError):
+    """The event log cannot be replayed into a consistent draft"""
+
+
+def remove_unused_drafts(directory, min_age=3600.0):
+    """
+    Delete the draft directories under directory that never recorded an event.
+
+    Only directories untouched for min_age seconds go, so a draft writing its
+    first event meanwhile is left alone. Returns the paths removed.
+    """
+    removed = []
+    if not os.path.isdir(directory):
+        return removed
+    now = time.time()
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        events_path = os.path.join(path, EVENTS_FILE)
+        if not os.path.isdir(path) or now - os.path.getmtime(path) < min_age:
+            continue
+        if not os.path.exists(events_path) or os.path.getsize(events_path) == 0:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
+
+def write_lock(path):
+    """Process-wide lock of one events file"""
+    with _write_locks_guard:
+        return _write_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+def check_sequence(events, after):
+    """Raise CorruptLogError unless the events number on consecutively from after + 1"""
+    for expected, event in enumerate(events, start=after + 1):
+        if event['seq'] != expected:
+            raise CorruptLogError(f"Event seq {event['seq']} where {expected} was expected: "
+                                  f"duplicate or out-of-order events")
+
+# Cells each recorded mutation writes, matching the FantasyAuction mutators
+EVENT_WRITES = {
+    'assign': lambda e: {'FCHL TEAM': e['team'], 'BID': e['price'], 'STATUS': 'START'},
+    'remove': lambda e: {'FCHL TEAM': 'UFA', 'STATUS': 'NO', 'BID': 0.0},
+    'status': lambda e: {'STATUS': e['status']},
+    'salary': lambda e: {'SALARY': e['salary']},
+    'bid': lambda e: {'BID': e['bid']},
+}
+
+
+def replay_events(auction, events):
+    """
+    Apply logged events to auction.
+
+    Cell writes are folded into their final values and written once per
+    column; a reset flushes them first and then runs reset_to_baseline.
+    """
+    pending = {}
+    for event in events:
+        if event['type'] == 'reset':
+            auction.write_players(pending)
+            pending = {}
+            auction.reset_to_baseline()
+        elif event['type'] == 'revalue':
+            for player_index, *values in event['rows']:
+                pending.setdefault(player_index, {}).update(zip(REPLAY_COLUMNS, values))
+        else:
+            pending.setdefault(event['player'], {}).update(EVENT_WRITES[event['type']](event))
+    auction.write_players(pending)
+
+
+class AuctionLog:
+    """Append-only event log and snapshots of one draft's auction, kept in a directory"""
+
+    def __init__(self, directory, snapshot_every=100, fsync=True):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.events_path = os.path.join(directory, EVENTS_FILE)
+        self.lock = write_lock(self.events_path)
+        # Last seq in the file and the file size it was read at
+        self.seq, self.size = 0, 0
+        self.sync_seq()
+        self.file = None
+        # A draft attached before its first event is checkpointed by that event
+        self.snapshot_due = False
+
+    def sync_seq(self):
+        """Advance seq past any events other writers appended since it was last read"""
+        size = os.path.getsize(self.events_path) if os.path.exists(self.events_path) else 0
+        if size != self.size:
+            events = self.read_events(offset=self.size if size > self.size else 0)
+            if events:
+                self.seq = events[-1]['seq']
+            self.size = size
+
+    def attach(self, auction):
+        """
+        Record every later mutation of auction.
+
+        A draft with events is checkpointed at once; a new one writes nothing,
+        not even its directory, until its first event, so drafts that are
+        opened and never used leave nothing behind.
+        """
+        with self.lock:
+            self.sync_seq()
+            if self.seq == 0:
+                self.snapshot_due = True
+            elif self.latest_snapshot() is None or self.latest_snapshot()[0] < self.seq:
+                self.write_snapshot(auction)
+        auction.event_log = self
+
+    def record(self, auction, event_type, fields):
+        """Append one event, then snapshot if the checkpoint interval has been reached"""
+        with self.lock:
+            if self.file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self.file = open(self.events_path, 'a')
+            # The next seq comes from the file, so writers sharing it never repeat one
+            self.sync_seq()
+            self.seq += 1
+            event = {'seq': self.seq, 'time': time.time(), 'type': event_type, **fields}
+            # NumPy scalars such as index labels are stored as plain numbers
+            self.file.write(json.dumps(event, default=lambda value: value.item()) + "\n")
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+            self.size = os.path.getsize(self.events_path)
+            if self.seq % self.snapshot_every == 0 or (self.snapshot_due and self.latest_snapshot() is None):
+                self.write_snapshot(auction)
+            self.snapshot_due = False
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def read_events(self, after=0, upto=None, offset=0):
+        """Events with after < seq <= upto, in order, reading from byte offset onwards"""
+        if not os.path.exists(self.events_path):
+            return []
+        events = []
+        with open(self.events_path, 'r') as file:
+            file.seek(offset)
+            for line in file:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event['seq'] > after and (upto is None or event['seq'] <= upto):
+                    events.append(event)
+        return events
+
+    def write_snapshot(self, auction):
+        """Checkpoint the players table and its derived valuation state at the current seq"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, SNAPSHOT_PATTERN.format(self.seq))
+        auction.players_df.reset_index(names='__index__').to_feather(path + ".tmp")
+        state = {
+            'seq': self.seq,
+            # Where the events after this snapshot start in the log
+            'offset': os.path.getsize(self.events_path) if os.path.exists(self.events_path) else 0,
+            'data_version': auction.data_version,
+            'position_cache': {
+                pos: {
+                    'committed': float(cache['committed']),
+                    'player_count': int(cache['player_count']),
+                    'total_z': float(cache['total_z']),
+                    'draftable': [int(i) for i in cache['draftable']],
+                }
+                for pos, cache in auction.position_cache.items()
+            },
+            # Market the auction opened with, which live bids and inflation are measured against
+            'market_open': None if auction.market_open is None else {
+                'ratio': [float(ratio) for ratio in auction.market_open['ratio']],
+                'value_per_z': float(auction.market_open['value_per_z']),
+                'z_score': [[int(i), float(z)] for i, z in auction.market_open['z_score'].items()],
+            },
+            'market_history': auction.market_history,
+        }
+        with open(path + ".json.tmp", 'w') as file:
+            json.dump(state, file)
+        # Rename last so a crash mid-write never leaves a half-written snapshot behind
+        os.replace(path + ".json.tmp", path + ".json")
+        os.replace(path + ".tmp", path)
+
+    def latest_snapshot(self, upto=None):
+        """(seq, path) of the newest complete snapshot at or before upto"""
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "snapshot_*.feather")):
+            seq = int(os.path.basename(path)[len("snapshot_"):-len(".feather")])
+            if (upto is None or seq <= upto) and os.path.exists(path + ".json"):
+                snapshots.append((seq, path))
+        return max(snapshots) if snapshots else None
+
+    def restore(self, config=None, upto=None, baseline=None):
+        """
+        Rebuild the auction as of event upto (the latest event when None).
+
+        Without a snapshot the whole log is replayed onto a fork of baseline,
+        the processed auction the draft was started from, when one is given.
+        Raises CorruptLogError when events are duplicated, out of order or
+        missing, or when there is neither a snapshot nor a baseline.
+        """
+        snapshot = self.latest_snapshot(upto)
+        if snapshot is None:
+            if baseline is None:
+                raise CorruptLogError(f"No snapshot in {self.directory} to replay the draft from")
+            events = self.read_events(upto=upto)
+            check_sequence(events, 0)
+            auction = baseline.fork()
+            replay_events(auction, events)
+            return auction
+        seq, path = snapshot
+
+        # Arrow hands back read-only buffers, so take one writable copy for the mutators
+        players_df = pd.read_feather(path).set_index('__index__').copy()
+        players_df.index.name = None
+        with open(path + ".json", 'r') as file:
+            state = json.load(file)
+
+        auction = FantasyAuction(df=players_df, config=config)
+        auction.data_version = state['data_version']
+        auction.position_cache = {
+            pos: dict(cache, draftable=pd.Index(cache['draftable'], dtype=players_df.index.dtype))
+            for pos, cache in state['position_cache'].items()
+        }
+        if state.get('market_open') is not None:
+            opening = state['market_open']
+            z_index, z_values = zip(*opening['z_score']) if opening['z_score'] else ((), ())
+            auction.market_open = {
+                'ratio': np.array(opening['ratio']),
+                'value_per_z': opening['value_per_z'],
+                'z_score': pd.Series(z_values, index=pd.Index(z_index, dtype=players_df.index.dtype), dtype=float),
+            }
+        auction.market_history = state.get('market_history', [])
+
+        # Every event past the snapshot's offset is checked, so a stale duplicate is not skipped over
+        events = self.read_events(upto=upto, offset=state['offset'])
+        check_sequence(events, seq)
+        replay_events(auction, events)
+        return auction
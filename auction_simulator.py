@@ -0,0 +1,281 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from fantasy_auction import POSITIONS, KnapsackBackend, get_model_players, get_own_starters
+
+"""
+Monte Carlo auction simulator
+Plays the rest of an auction many times on plain NumPy arrays: opponents
+nominate and bid through pluggable strategies, and BOT bids for the roster
+planned by the PlayerSelection optimizer, re-planning only when a planned
+player is lost.
+"""
+
+# Smallest raise over the runner-up's bid, matching the 0.1 grid of bids
+BID_INCREMENT = 0.1
+
+
+def build_market(auction):
+    """Arrays describing the unsold pool and every team's budget and open roster slots"""
+    config = auction.config
+    df = auction.players_df
+    pool = get_model_players(df)
+    z_score = pool['Z-score'] if 'Z-score' in pool.columns else pd.Series(0.0, index=pool.index)
+
+    teams = list(config.teams)
+    budgets = auction.get_team_budgets()
+    state = auction.get_state()
+    requirements = np.array([config.position_requirements[pos] for pos in POSITIONS])
+    needs = np.maximum(requirements - state.start_counts[[state.team_ids[team] for team in teams]], 0)
+    own_starters = get_own_starters(df, config.own_team)
+
+    return {
+        'index': pool.index.to_numpy(),
+        'pts': pool['PTS'].to_numpy(dtype=float),
+        'pos': pool['POS'].map({pos: i for i, pos in enumerate(POSITIONS)}).to_numpy(dtype=int),
+        'bid': pool['BID'].to_numpy(dtype=float),
+        'z': z_score.to_numpy(dtype=float),
+        'teams': teams,
+        'own': teams.index(config.own_team),
+        'budget': np.array([budgets[team]['remaining'] for team in teams], dtype=float),
+        'needs': needs,
+        'own_pts': float(own_starters['PTS'].sum()),
+        'min_salary': config.min_salary,
+        'config': config,
+    }
+
+
+class DraftState:
+    """Mutable state of one simulated draft, updated in place after every sale"""
+
+    __slots__ = ('budget', 'needs', 'sold', 'owner', 'price')
+
+    def __init__(self, market):
+        self.budget = market['budget'].copy()
+        self.needs = market['needs'].copy()
+        self.sold = np.zeros(len(market['pts']), dtype=bool)
+        self.owner = np.full(len(market['pts']), -1)
+        self.price = np.zeros(len(market['pts']))
+
+    def max_affordable(self, team, min_salary):
+        """Most team can bid while keeping min_salary for each other open slot"""
+        return self.budget[team] - min_salary * (self.needs[team].sum() - 1)
+
+
+class OpponentStrategy:
+    """Nomination and bidding behaviour of a team other than BOT"""
+
+    def nominate(self, market, draft, team, rng):
+        """Highest-bid unsold player at a position team still needs"""
+        candidates = np.flatnonzero(~draft.sold & (draft.needs[team][market['pos']] > 0))
+        if len(candidates) == 0:
+            candidates = np.flatnonzero(~draft.sold)
+        return candidates[np.argmax(market['bid'][candidates])]
+
+    def valuation(self, market, draft, team, player, rng):
+        """Price team is willing to pay before its budget is taken into account"""
+        raise NotImplementedError
+
+
+class ValueStrategy(OpponentStrategy):
+    """Bids around the player's BID with some disagreement on value"""
+
+    def __init__(self, noise=0.15):
+        self.noise = noise
+
+    def valuation(self, market, draft, team, player, rng):
+        return market['bid'][player] * np.exp(rng.normal(0.0, self.noise))
+
+
+class StarsStrategy(OpponentStrategy):
+    """Overpays for high Z-score players and underpays for depth"""
+
+    def __init__(self, premium=0.5, noise=0.1):
+        self.premium = premium
+        self.noise = noise
+
+    def nominate(self, market, draft, team, rng):
+        unsold = np.flatnonzero(~draft.sold)
+        return unsold[np.argmax(market['z'][unsold])]
+
+    def valuation(self, market, draft, team, player, rng):
+        top_z = max(market['z'].max(), 1e-9)
+        factor = 0.8 + self.premium * max(market['z'][player], 0.0) / top_z
+        return market['bid'][player] * factor * np.exp(rng.normal(0.0, self.noise))
+
+
+class BudgetStrategy(OpponentStrategy):
+    """Scales BID by how much money the team has per open slot compared with the league"""
+
+    def __init__(self, noise=0.1):
+        self.noise = noise
+
+    def valuation(self, market, draft, team, player, rng):
+        open_slots = np.maximum(draft.needs.sum(axis=1), 1)
+        per_slot = draft.budget / open_slots
+        active = draft.needs.sum(axis=1) > 0
+        league_per_slot = per_slot[active].mean() if active.any() else per_slot[team]
+        factor = np.clip(per_slot[team] / max(league_per_slot, 1e-9), 0.5, 2.0)
+        return market['bid'][player] * factor * np.exp(rng.normal(0.0, self.noise))
+
+
+STRATEGIES = {
+    'value': ValueStrategy,
+    'stars': StarsStrategy,
+    'budget': BudgetStrategy,
+}
+
+
+def plan_roster(market, draft):
+    """Best BOT roster among the unsold players at their BID, or None if none fits the budget"""
+    own = market['own']
+    candidates = np.flatnonzero(~draft.sold & (market['bid'] > 0))
+    arrays = {
+        'pts': market['pts'][candidates],
+        'cost': market['bid'][candidates],
+        'pos': np.array(POSITIONS, dtype=object)[market['pos'][candidates]],
+        'fixed': np.zeros(len(candidates), dtype=bool),
+    }
+    limits = {'cap': draft.budget[own], 'slots': {pos: int(need) for pos, need in zip(POSITIONS, draft.needs[own])}}
+    # Re-planned after every lost target, so the exact dynamic program saves a model build per plan
+    result = KnapsackBackend().solve(arrays, limits)
+    if result['objective'] is None:
+        return None
+    return {int(candidates[i]) for i in result['players']}
+
+
+def simulate_draft(market, strategy, rng):
+    """Play the rest of the auction once; returns BOT's points, spend and roster"""
+    own = market['own']
+    min_salary = market['min_salary']
+    draft = DraftState(market)
+    n_teams = len(market['teams'])
+    plan = plan_roster(market, draft)
+    solves = 1
+
+    nominator = 0
+    while (draft.needs.sum(axis=1) > 0).any() and not draft.sold.all():
+        # Nominations rotate over the teams that still have open slots
+        while draft.needs[nominator].sum() == 0:
+            nominator = (nominator + 1) % n_teams
+        if nominator == own:
+            # BOT nominates players it does not want, to drain the other budgets
+            unsold = np.flatnonzero(~draft.sold)
+            unwanted = unsold if plan is None else unsold[~np.isin(unsold, list(plan))]
+            if len(unwanted) == 0:
+                unwanted = unsold
+            player = unwanted[np.argmax(market['bid'][unwanted])]
+        else:
+            player = strategy.nominate(market, draft, nominator, rng)
+        nominator = (nominator + 1) % n_teams
+
+        pos = market['pos'][player]
+        bids = np.zeros(n_teams)
+        for team in np.flatnonzero(draft.needs[:, pos] > 0):
+            affordable = draft.max_affordable(team, min_salary)
+            if team == own:
+                if plan is not None and player in plan:
+                    # Worth its expected price plus whatever the plan leaves unspent
+                    plan_cost = market['bid'][list(plan)].sum()
+                    value = market['bid'][player] + draft.budget[own] - plan_cost
+                elif plan is None:
+                    # No affordable plan left: spread the remaining money evenly
+                    value = draft.budget[own] / draft.needs[own].sum()
+                else:
+                    value = 0.0
+            else:
+                value = strategy.valuation(market, draft, team, player, rng)
+            bids[team] = min(value, affordable)
+
+        draft.sold[player] = True
+        order = np.argsort(-bids + rng.random(n_teams) * 1e-9)
+        winner, runner_up = order[0], order[1]
+        if bids[winner] < min_salary:
+            # Nobody wants the player at the minimum salary
+            if plan is not None and player in plan:
+                plan = plan_roster(market, draft)
+                solves += 1
+            continue
+
+        price = round(max(min(bids[winner], bids[runner_up] + BID_INCREMENT), min_salary), 1)
+        draft.owner[player] = winner
+        draft.price[player] = price
+        draft.budget[winner] -= price
+        draft.needs[winner, pos] -= 1
+        if winner != own and plan is not None and player in plan:
+            # A planned player was lost: re-plan with what is left
+            plan = plan_roster(market, draft)
+            solves += 1
+        elif winner == own and plan is not None:
+            plan.discard(int(player))
+
+    bought = np.flatnonzero(draft.owner == own)
+    spend_by_position = {
+        f'spend_{pos}': float(draft.price[bought][market['pos'][bought] == i].sum()) for i, pos in enumerate(POSITIONS)
+    }
+    return {
+        'pts': market['own_pts'] + float(market['pts'][bought].sum()),
+        'spend': float(draft.price[bought].sum()),
+        'remaining': float(draft.budget[own]),
+        'players_bought': len(bought),
+        'open_slots': int(draft.needs[own].sum()),
+        'overpay': float((draft.price[bought] - market['bid'][bought]).sum()),
+        'solves': solves,
+        **spend_by_position,
+        'players': market['index'][bought].tolist(),
+    }
+
+
+# Market shared by every draft simulated in a worker process
+_simulation_market = None
+
+
+def _init_simulation_worker(market):
+    global _simulation_market
+    _simulation_market = market
+
+
+def _simulate_drafts(market, strategy_name, seeds):
+    strategy = STRATEGIES[strategy_name]()
+    results = []
+    for seed in seeds:
+        result = simulate_draft(market, strategy, np.random.default_rng(seed))
+        results.append(dict(result, strategy=strategy_name))
+    return results
+
+
+def _simulate_drafts_in_worker(task):
+    return _simulate_drafts(_simulation_market, *task)
+
+
+def simulate_auctions(auction, strategies=('value', 'stars', 'budget'), n_drafts=1000, seed=0,
+                      max_workers=None, chunk_size=50):
+    """
+    Simulate n_drafts auctions per opponent strategy from the auction's current state.
+
+    Every draft gets its own seed spawned from seed, so results do not depend on
+    the number of workers. Returns one row per simulated draft.
+    """
+    market = build_market(auction)
+    seeds = np.random.SeedSequence(seed).spawn(n_drafts)
+    tasks = [(name, seeds[start:start + chunk_size])
+             for name in strategies for start in range(0, n_drafts, chunk_size)]
+
+    if max_workers == 1:
+        chunks = [_simulate_drafts(market, *task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_simulation_worker,
+                                 initargs=(market,)) as executor:
+            chunks = list(executor.map(_simulate_drafts_in_worker, tasks))
+    return pd.DataFrame([result for chunk in chunks for result in chunk])
+
+
+def summarize_simulations(results):
+    """Distribution of BOT's final points and its spend profile per opponent strategy"""
+    spend_columns = ['spend'] + [f'spend_{pos}' for pos in POSITIONS] + ['remaining', 'overpay']
+    grouped = results.groupby('strategy', sort=False)
+    summary = grouped['pts'].describe(percentiles=[0.05, 0.25, 0.5, 0.75, 0.95])
+    summary[[f'mean_{col}' for col in spend_columns]] = grouped[spend_columns].mean().to_numpy()
+    summary['incomplete_rosters'] = grouped['open_slots'].apply(lambda slots: (slots > 0).mean()).to_numpy()
+    return summary
@@ -0,0 +1,854 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pyscipopt
+from pyscipopt import Model
+
+from auction_log import AuctionLog
+from auction_simulator import simulate_auctions, summarize_simulations
+from fantasy_auction import (DEFAULT_LEAGUE, SOLVER_BACKENDS, BackgroundSolver, FantasyAuction, LeagueConfig, LeagueRegistry, SolverSession, apply_player_schema,
+                             teams_data, SALARY, FORWARD, DEFENCE, GOALIE)
+from league_optimizer import optimize_league, summarize_league
+from stochastic_roster import build_arrays, generate_scenarios, optimize_stochastic
+from table_renderer import (load_logo_data, render_table_html, GROUP_STYLES, DEFAULT_GROUP_STYLE,
+                            POSITION_STYLES, DEFAULT_POSITION_STYLE)
+
+"""
+Benchmarks for the FantasyAuction engine
+Run with: python benchmark.py
+Regression suite: python benchmark.py --suite --output results.json [--compare baseline.json]
+"""
+
+# Columns written on a session's players table copy only that column, so sessions
+# forked from the same league baseline share every column they never change
+pd.set_option("mode.copy_on_write", True)
+
+CSV_PATH = "players-24.csv"
+SUITE_SIZES = (5_000, 50_000, 200_000)
+
+
+def load_players(csv_path=CSV_PATH):
+    """Load the player CSV the way the Streamlit app did for every session before the shared registry"""
+    df = pd.read_csv(csv_path)
+    df['SALARY'] = df['SALARY'].astype(str).replace('nan', '0.0').astype(float)
+    df['BID'] = df['BID'].astype(str).replace('nan', '0.0').astype(float)
+    df['PTS'] = df['PTS'].astype(str).replace('nan', '0.0').astype(float)
+    df['AGE'] = df['AGE'].astype(str).replace('nan', '0').astype(int)
+    return df
+
+
+def make_player_pool(n_players, seed=0):
+    """Generate a synthetic player pool with the same columns as players-24.csv"""
+    rng = np.random.default_rng(seed)
+    team_codes = list(teams_data.keys())
+
+    pos = rng.choice(['F', 'D', 'G'], size=n_players, p=[0.57, 0.32, 0.11])
+    fchl_team = np.where(
+        rng.random(n_players) < 0.12,
+        rng.choice(team_codes, size=n_players),
+        rng.choice(['UFA', 'RFA', 'ENT'], size=n_players, p=[0.96, 0.02, 0.02])
+    )
+    owned = ~np.isin(fchl_team, ['UFA', 'RFA', 'ENT'])
+    status = np.where(owned, rng.choice(['START', 'MINOR'], size=n_players, p=[0.4, 0.6]), None)
+
+    return pd.DataFrame({
+        'PLAYER': [f"Player {i}" for i in range(n_players)],
+        'POS': pos,
+        'GROUP': rng.choice(['3', '2', 'A', 'B', 'C'], size=n_players, p=[0.9, 0.02, 0.04, 0.02, 0.02]),
+        'STATUS': status,
+        'FCHL TEAM': fchl_team,
+        'NHL TEAM': rng.choice(['TOR', 'MTL', 'EDM', 'BOS', 'NYR', 'COL'], size=n_players),
+        'AGE': rng.integers(18, 40, size=n_players),
+        'SALARY': np.round(rng.uniform(0.5, 10.0, size=n_players), 1),
+        'BID': 0.0,
+        'PTS': np.floor(rng.gamma(2.0, 15.0, size=n_players)),
+    })
+
+
+def make_league_pool(n_players, seed=0):
+    """players-24.csv rosters plus synthetic free agents up to n_players, so every pool is a draftable league"""
+    players = load_players()
+    rostered = players[~players['FCHL TEAM'].isin(['UFA', 'RFA', 'ENT'])]
+    free_agents = make_player_pool(max(n_players - len(rostered), 0), seed)
+    free_agents['FCHL TEAM'] = 'UFA'
+    free_agents['STATUS'] = None
+    return pd.concat([rostered, free_agents], ignore_index=True)
+
+
+def legacy_build_model(auction):
+    """Row-by-row model construction kept as the reference for build timings"""
+    df = auction.players_df
+    model = Model("PlayerSelection")
+    filtered_df = df[
+        ((df['FCHL TEAM'].isin(['ENT', 'UFA', 'RFA'])) & (df['BID'] > 0)) |
+        ((df['FCHL TEAM'] == 'BOT') & (df['STATUS'] == 'START'))
+    ]
+    player_vars = {}
+    for i, row in filtered_df.iterrows():
+        player_vars[i] = model.addVar(vtype="B", name=f"{row['PLAYER']}_{row['POS']}")
+    model.setObjective(sum(row['PTS'] * player_vars[i] for i, row in filtered_df.iterrows()), "maximize")
+    model.addCons(sum((row['SALARY'] + row['BID']) * player_vars[i] for i, row in filtered_df.iterrows()) <= SALARY)
+    model.addCons(sum(player_vars[i] for i, row in filtered_df.iterrows() if row['POS'] == 'F') == FORWARD)
+    model.addCons(sum(player_vars[i] for i, row in filtered_df.iterrows() if row['POS'] == 'D') == DEFENCE)
+    model.addCons(sum(player_vars[i] for i, row in filtered_df.iterrows() if row['POS'] == 'G') == GOALIE)
+    for i in filtered_df.index[(filtered_df['FCHL TEAM'] == 'BOT') & (filtered_df['STATUS'] == 'START')]:
+        model.addCons(player_vars[i] == 1)
+    return model
+
+
+def best_time(func, repeat=3):
+    """Return the fastest wall-clock time of several runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def bench_build_model(label, auction):
+    """Compare legacy and vectorized model construction for one auction"""
+    legacy_ms = best_time(lambda: legacy_build_model(auction))
+    vectorized_ms = best_time(auction.build_model)
+    print(f"{label:<28} {len(auction.filtered_df):>7} {legacy_ms:>10.1f} {vectorized_ms:>12.1f} {legacy_ms / vectorized_ms:>8.1f}x")
+
+
+def wide_pool_auction(n_players, seed=0):
+    """Auction where every free agent carries a bid, so all of them enter the model"""
+    df = make_player_pool(n_players, seed)
+    df['SALARY'] = df['SALARY'].where(~df['FCHL TEAM'].isin(['UFA', 'RFA', 'ENT']), 0)
+    df['BID'] = np.round(np.random.default_rng(seed).uniform(0.5, 8.0, size=n_players), 1)
+    return FantasyAuction(df=df)
+
+
+def bench_reoptimize(n_assignments=40, seed=0):
+    """Time rebuild-and-cold-solve against the persistent solver session over a simulated auction"""
+    rng = np.random.default_rng(seed)
+    cold = FantasyAuction(df=load_players())
+    warm = FantasyAuction(df=load_players())
+    warm.solver_session = SolverSession()
+    warm.solver_session.model.hideOutput()
+    team_codes = list(teams_data.keys())
+
+    cold_ms, warm_ms = [], []
+    for step in range(n_assignments):
+        available = warm.get_available_players() if step else None
+        if available is not None and not available.empty:
+            player_index = available.index[rng.integers(len(available))]
+            team_code = team_codes[rng.integers(len(team_codes))]
+            price = float(available.loc[player_index, 'BID'])
+            for auction in (cold, warm):
+                auction.assign_player_to_team(player_index, team_code, price)
+
+        for auction in (cold, warm):
+            auction.process_data()
+
+        start = time.perf_counter()
+        cold.build_model()
+        cold.model.hideOutput()
+        cold.solve_model()
+        cold_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        warm.reoptimize()
+        warm_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"{'reoptimize':<28} {'steps':>7} {'mean ms':>10} {'max ms':>12}")
+    print(f"{'rebuild + cold solve':<28} {n_assignments:>7} {np.mean(cold_ms):>10.1f} {np.max(cold_ms):>12.1f}")
+    print(f"{'solver session':<28} {n_assignments:>7} {np.mean(warm_ms):>10.1f} {np.max(warm_ms):>12.1f}")
+
+
+def bench_process_data(n_assignments=60, seed=0):
+    """Time process_data after each step of a mixed assign/remove/salary-edit sequence"""
+    rng = np.random.default_rng(seed)
+    auction = FantasyAuction(df=load_players())
+    auction.process_data()
+    team_codes = list(teams_data.keys())
+
+    step_ms = []
+    for step in range(n_assignments):
+        available = auction.get_available_players()
+        player_index = available.index[rng.integers(len(available))]
+        if step % 3 == 2:
+            # Salary edits and removals exercise the other mutators
+            roster = auction.players_df.index[auction.players_df['FCHL TEAM'] == 'BOT']
+            player_index = roster[rng.integers(len(roster))]
+            auction.update_player_salary(player_index, float(np.round(rng.uniform(0.5, 5.0), 1)))
+        elif step % 5 == 4:
+            assigned = auction.players_df.index[auction.players_df['STATUS'] == 'START']
+            auction.remove_player_from_team(assigned[rng.integers(len(assigned))])
+        else:
+            team_code = team_codes[rng.integers(len(team_codes))]
+            auction.assign_player_to_team(player_index, team_code, float(available.loc[player_index, 'BID']))
+
+        start = time.perf_counter()
+        auction.process_data()
+        step_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"{'process_data':<28} {'steps':>7} {'mean ms':>10} {'max ms':>12}")
+    print(f"{'after each change':<28} {n_assignments:>7} {np.mean(step_ms):>10.1f} {np.max(step_ms):>12.1f}")
+
+
+def bench_scenarios(n_prices=40):
+    """Time price scenarios for the top available player, sequentially and on a process pool"""
+    auction = FantasyAuction(df=load_players())
+    auction.process_data()
+    player_index = auction.get_available_players().index[0]
+    prices = [round(0.5 * step, 1) for step in range(1, n_prices + 1)]
+
+    print(f"{'solve_scenarios':<28} {'scenarios':>9} {'total ms':>10}")
+    for label, max_workers in (("sequential", 1), ("process pool", None)):
+        start = time.perf_counter()
+        auction.price_scenarios(player_index, prices, max_workers=max_workers)
+        print(f"{label:<28} {n_prices:>9} {(time.perf_counter() - start) * 1000:>10.1f}")
+
+
+def legacy_render_table_html(df, columns, logos):
+    """Row-by-row string concatenation renderer kept as the reference for render timings"""
+    html_table = "<div style='max-height: 400px; overflow-y: auto;'><table style='width: 100%; border-collapse: collapse;'>"
+    html_table += "<thead><tr style='background-color: #f0f2f6; position: sticky; top: 0;'>"
+    for col in columns:
+        html_table += f"<th style='padding: 8px; text-align: left; border-bottom: 2px solid #ddd;'>{col}</th>"
+    html_table += "</tr></thead><tbody>"
+    for idx, row in df[columns].iterrows():
+        html_table += "<tr style='border-bottom: 1px solid #eee;'>"
+        for col in columns:
+            cell_value = str(row[col])
+            if col == 'PLAYER':
+                logo = logos.get(df.loc[idx, 'NHL TEAM'])
+                if logo:
+                    cell_value = f'<img src="{logo["data_url"]}" style="width: 20px; height: 20px; margin-right: 5px; vertical-align: middle; object-fit: contain;">{cell_value}'
+            elif col == 'GROUP':
+                cell_value = f'<span style="padding: 2px 6px; border-radius: 4px; font-size: 0.85em; font-weight: 500; {GROUP_STYLES.get(cell_value, DEFAULT_GROUP_STYLE)}">{cell_value}</span>'
+            elif col == 'POS':
+                cell_value = f'<span style="padding: 2px 6px; border-radius: 4px; font-size: 0.85em; font-weight: 500; {POSITION_STYLES.get(cell_value, DEFAULT_POSITION_STYLE)}">{cell_value}</span>'
+            html_table += f"<td style='padding: 8px; vertical-align: middle;'>{cell_value}</td>"
+        html_table += "</tr>"
+    html_table += "</tbody></table></div>"
+    return html_table
+
+
+def bench_render_table(page_size=50):
+    """Render time and HTML payload for the Remaining Players table"""
+    auction = FantasyAuction(df=load_players())
+    auction.process_data()
+    # Every free agent, so the table is as large as the tab can get
+    df = auction.players_df[auction.players_df['FCHL TEAM'].isin(['UFA', 'RFA', 'ENT'])]
+    columns = ['PLAYER', 'POS', 'PTS', 'GROUP', 'BID']
+    logos = load_logo_data()
+
+    cases = [
+        ("legacy, all rows", lambda: legacy_render_table_html(df, columns, logos)),
+        ("vectorized, all rows", lambda: render_table_html(df, columns, logos=logos, teams=teams_data)),
+        (f"vectorized, {page_size}-row page", lambda: render_table_html(df.iloc[:page_size], columns, logos=logos, teams=teams_data)),
+    ]
+    print(f"{'render_table_html':<28} {'rows':>7} {'ms':>10} {'payload KB':>12}")
+    for label, render in cases:
+        html_table = render()
+        rows = html_table.count("<tr style='border-bottom")
+        print(f"{label:<28} {rows:>7} {best_time(render):>10.1f} {len(html_table) / 1024:>12.1f}")
+
+
+def player_masks(df):
+    """The masks process_data and get_team_budgets evaluate on every recalculation"""
+    free_agent = df['FCHL TEAM'].isin(['RFA', 'UFA', 'ENT'])
+    committed = (df['STATUS'] == 'START') | ((df['STATUS'] == 'MINOR') & (df['GROUP'].isin(['2', '3'])))
+    return free_agent & (df['POS'] == 'F'), committed
+
+
+def bench_schema():
+    """Memory and mask throughput of the plain object table against the typed schema"""
+    print(f"{'player table':<28} {'rows':>7} {'memory KB':>10} {'masks ms':>12}")
+    for label, df in (("players-24.csv", load_players()), ("synthetic", make_player_pool(100_000))):
+        for schema, table in (("object", df), ("typed", apply_player_schema(df))):
+            memory_kb = table.memory_usage(deep=True).sum() / 1024
+            print(f"{label + ', ' + schema:<28} {len(table):>7} {memory_kb:>10.0f} {best_time(lambda: player_masks(table)):>12.2f}")
+
+
+def league_memory_kb(create_auction, n_leagues, sessions_per_league):
+    """Memory allocated by sessions in n_leagues that each start from a valued table and sell a few players"""
+    tracemalloc.start()
+    auctions = []
+    for league in range(n_leagues):
+        for _ in range(sessions_per_league):
+            auction = create_auction(league)
+            draftable = auction.players_df.index[auction.players_df['Draftable'] == 'YES'][:5]
+            for player_index in draftable:
+                auction.assign_player_to_team(player_index, 'BOT', 1.0)
+            auction.process_data()
+            auctions.append(auction)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / 1024
+
+
+def bench_leagues(n_leagues=4, sessions_per_league=5):
+    """Memory of league sessions forked from one registry against parsing the CSV per session"""
+    print(f"{'leagues x sessions':<28} {'sessions':>8} {'parsed KB':>9} {'registry KB':>12} {'ratio':>8} "
+          f"{'baselines KB':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic_path = os.path.join(directory, "synthetic.csv")
+        make_player_pool(20_000).to_csv(synthetic_path, index=False)
+
+        for label, csv_path in ((CSV_PATH, CSV_PATH), ("synthetic (20000)", synthetic_path)):
+            registry = LeagueRegistry()
+            for league in range(n_leagues):
+                registry.add_league(league, LeagueConfig(teams_data, name=f"League {league}"), csv_path)
+
+            def parse_session(league):
+                # Before the registry every session read, cleaned and valued its own copy of the CSV
+                auction = FantasyAuction(df=load_players(csv_path), config=registry.get_config(league))
+                auction.process_data()
+                return auction
+
+            parsed_kb = league_memory_kb(parse_session, n_leagues, sessions_per_league)
+            # Each league's baseline is built once per process, before its first session
+            tracemalloc.start()
+            for league in range(n_leagues):
+                registry.get_baseline(league)
+            baselines_kb = tracemalloc.get_traced_memory()[0] / 1024
+            tracemalloc.stop()
+            registry_kb = league_memory_kb(registry.create_auction, n_leagues, sessions_per_league)
+            n_sessions = n_leagues * sessions_per_league
+            print(f"{label:<28} {n_sessions:>8} {parsed_kb:>9.0f} {registry_kb:>12.0f} {parsed_kb / registry_kb:>7.1f}x "
+                  f"{baselines_kb:>12.0f}")
+
+
+def bench_background_solver(n_edits=10, seed=0):
+    """UI blocking time of a burst of edits solved inline against the debounced background solver"""
+    print(f"{'edit burst':<28} {'edits':>7} {'blocked ms':>10} {'solves':>7} {'ready ms':>9}")
+    for label in ("inline reoptimize", "background solver"):
+        rng = np.random.default_rng(seed)
+        auction = FantasyAuction(df=load_players())
+        auction.process_data()
+        solver = BackgroundSolver(auction.config) if label == "background solver" else None
+
+        blocked = 0.0
+        start = time.perf_counter()
+        for _ in range(n_edits):
+            available = auction.get_available_players()
+            player_index = available.index[rng.integers(len(available))]
+            edit_start = time.perf_counter()
+            auction.assign_player_to_team(player_index, 'GVR', float(available.loc[player_index, 'BID']))
+            auction.process_data()
+            if solver is None:
+                auction.reoptimize()
+            else:
+                solver.request(auction)
+            blocked += time.perf_counter() - edit_start
+
+        if solver is None:
+            solves, objective = n_edits, auction.model.getObjVal()
+        else:
+            solver.wait()
+            solves, objective = solver.solves + solver.interrupted, solver.result['objective']
+            solver.stop()
+        ready_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<28} {n_edits:>7} {blocked * 1000:>10.1f} {solves:>7} {ready_ms:>9.1f}")
+        if solver is None:
+            inline_objective = objective
+        else:
+            assert abs(objective - inline_objective) < 1e-6, (objective, inline_objective)
+
+
+def bench_solver_limits(n_players=5_000):
+    """Time to a usable roster under time and gap limits, against solving to proven optimality"""
+    auction = wide_pool_auction(n_players)
+    # Release the synthetic BOT roster so the whole cap is left to draft with
+    auction.players_df.loc[auction.players_df['FCHL TEAM'] == 'BOT', 'FCHL TEAM'] = 'UFA'
+    auction.process_data()
+    print(f"{'solver limits':<28} {'ms':>7} {'objective':>10} {'gap':>7} {'of optimum':>10} {'incumbents':>10}")
+    optimum = None
+    for label, limits in (("none (optimal)", {}),
+                          ("gap 1%", {'gap_limit': 0.01}),
+                          ("gap 5%", {'gap_limit': 0.05}),
+                          ("time 2 s", {'time_limit': 2.0}),
+                          ("time 0.5 s", {'time_limit': 0.5})):
+        incumbents = []
+        auction.incumbent_callback = incumbents.append
+        auction.configure_solver(**limits)
+        auction.build_model()
+        auction.model.hideOutput()
+        start = time.perf_counter()
+        solution = auction.solve_model()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if solution is None:
+            # The limit struck before SCIP found any roster
+            print(f"{label:<28} {elapsed_ms:>7.1f} {'-':>10} {'-':>7} {'-':>10} {len(incumbents):>10}")
+            continue
+        objective, gap = auction.solve_info['objective'], auction.solve_info['gap']
+        if optimum is None:
+            optimum = objective
+        assert len(auction.get_bot_optimal_team()) == len(incumbents[-1]['players']), label
+        print(f"{label:<28} {elapsed_ms:>7.1f} {objective:>10.1f} {gap:>7.2%} {objective / optimum:>10.2%} {len(incumbents):>10}")
+
+
+def bench_solver_backends(n_sales=10, seed=0):
+    """Solve the same BOT rosters with every solver backend after each sale, checking they agree on the objective"""
+    print(f"{'solver backends':<28} {'rosters':>7} " + " ".join(f"{name + ' ms':>12}" for name in SOLVER_BACKENDS))
+    released = wide_pool_auction(5_000).players_df
+    # Without the synthetic BOT roster the whole cap is left, the hardest case for SCIP
+    released.loc[released['FCHL TEAM'] == 'BOT', 'FCHL TEAM'] = 'UFA'
+    team_codes = list(teams_data.keys())
+    for label, players_df, sales in ((CSV_PATH, load_players(), n_sales),
+                                     ("league pool (50000)", make_league_pool(50_000), n_sales),
+                                     ("all free agents (5000)", released, 2)):
+        rng = np.random.default_rng(seed)
+        auction = FantasyAuction(df=players_df)
+        auction.process_data()
+        timings = {name: [] for name in SOLVER_BACKENDS}
+        for sale in range(sales + 1):
+            objectives = {}
+            for name in SOLVER_BACKENDS:
+                auction.configure_solver(backend=name)
+                start = time.perf_counter()
+                objectives[name] = auction.solve_roster()['objective']
+                timings[name].append((time.perf_counter() - start) * 1000)
+            assert all(objective is not None and abs(objective - objectives['scip']) < 1e-6
+                       for objective in objectives.values()), (label, sale, objectives)
+
+            available = auction.get_available_players()
+            player_index = available.index[rng.integers(min(30, len(available)))]
+            # Every fourth sale goes to BOT, so its cap and open slots change too
+            team_code = auction.config.own_team if sale % 4 == 0 else team_codes[sale % len(team_codes)]
+            auction.assign_player_to_team(player_index, team_code, float(available.loc[player_index, 'BID']))
+            auction.process_data()
+        print(f"{label:<28} {sales + 1:>7} " + " ".join(f"{np.median(timings[name]):>12.1f}" for name in SOLVER_BACKENDS))
+
+
+def bench_fallback_rosters(n_sales=20, seed=0):
+    """Top BOT rosters before each sale and the fallbacks left after it, checking they skip the sold player and fit the cap"""
+    print(f"{'fallback rosters':<28} {'sales':>7} {'top ms':>8} {'check ms':>9} {'ready':>6} {'ready (target)':>15}")
+    team_codes = [team for team in teams_data if team != 'BOT']
+    for label, players_df in ((CSV_PATH, load_players()), ("league pool (50000)", make_league_pool(50_000))):
+        rng = np.random.default_rng(seed)
+        auction = FantasyAuction(df=players_df)
+        auction.process_data()
+        top_ms, check_ms, ready = [], [], {True: 0, False: 0}
+        for sale in range(n_sales):
+            start = time.perf_counter()
+            rosters = auction.get_top_rosters()
+            top_ms.append((time.perf_counter() - start) * 1000)
+
+            # Every other sale takes a player from BOT's best roster, the case the fallbacks are for
+            targeted = sale % 2 == 0
+            available = auction.get_available_players()
+            player_index = rosters[0]['players'][rng.integers(len(rosters[0]['players']))] if targeted \
+                else available.index[rng.integers(min(30, len(available)))]
+            auction.assign_player_to_team(player_index, team_codes[sale % len(team_codes)],
+                                          float(auction.players_df.loc[player_index, 'BID']))
+            auction.process_data()
+
+            start = time.perf_counter()
+            fallbacks = auction.get_fallback_rosters()
+            check_ms.append((time.perf_counter() - start) * 1000)
+            cap = auction.get_roster_limits()['cap']
+            assert all(player_index not in roster['players'] and sum(roster['costs']) <= cap + 1e-6
+                       for roster in fallbacks), (label, sale)
+            ready[targeted] += bool(fallbacks)
+        print(f"{label:<28} {n_sales:>7} {np.median(top_ms):>8.1f} {np.median(check_ms):>9.1f} "
+              f"{f'{ready[False]}/{n_sales // 2}':>6} {f'{ready[True]}/{(n_sales + 1) // 2}':>15}")
+
+
+def bench_stochastic_roster(n_scenarios=200):
+    """Stochastic BOT roster per objective against the deterministic one on held-out scenarios"""
+    print(f"{'stochastic roster':<28} {'objective':>9} {'s':>5} {'gap':>6} {'PTS':>6} {'det PTS':>7} "
+          f"{'fits':>5} {'det fits':>8} {'tail $':>7} {'det tail $':>10}")
+    for label, players_df in ((CSV_PATH, load_players()), ("league pool (50000)", make_league_pool(50_000))):
+        auction = FantasyAuction(df=players_df)
+        auction.process_data()
+        # Draws do not depend on the number of threads
+        arrays = build_arrays(auction)
+        serial, threaded = (generate_scenarios(arrays, n_scenarios, max_workers=workers) for workers in (1, 4))
+        assert all(np.array_equal(serial[key], threaded[key]) for key in serial)
+
+        limits = auction.get_roster_limits()
+        for objective in ('mean', 'cvar'):
+            result = optimize_stochastic(auction, objective, n_scenarios)
+            team = result['optimal_team']
+            free_agents = team[team['STATUS'] != 'START']
+            assert all((free_agents['POS'] == pos).sum() == need for pos, need in limits['slots'].items())
+            assert free_agents['TOTAL_COST'].sum() <= limits['cap'] + 1e-6
+            stochastic, deterministic = result['evaluation'].loc['stochastic'], result['evaluation'].loc['deterministic']
+            print(f"{label:<28} {objective:>9} {result['time']:>5.1f} {result['gap']:>6.1%} "
+                  f"{stochastic['expected_pts']:>6.0f} {deterministic['expected_pts']:>7.0f} "
+                  f"{stochastic['fit_rate']:>5.0%} {deterministic['fit_rate']:>8.0%} "
+                  f"{stochastic['tail_cost']:>7.1f} {deterministic['tail_cost']:>10.1f}")
+
+
+def bench_simulator(n_drafts=10):
+    """Simulated drafts per opponent strategy, checking results do not depend on the worker count"""
+    auction = FantasyAuction(df=load_players())
+    auction.process_data()
+    print(f"{'auction simulator':<28} {'drafts':>7} {'ms/draft':>10} {'solves':>7} {'mean PTS':>9} {'p5 PTS':>7}")
+    start = time.perf_counter()
+    results = simulate_auctions(auction, n_drafts=n_drafts, max_workers=1)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    parallel = simulate_auctions(auction, n_drafts=n_drafts, max_workers=2)
+    assert results.drop(columns='players').equals(parallel.drop(columns='players'))
+
+    summary = summarize_simulations(results)
+    solves = results.groupby('strategy', sort=False)['solves'].mean()
+    for strategy, row in summary.iterrows():
+        print(f"{strategy:<28} {n_drafts:>7} {elapsed_ms / len(results):>10.1f} {solves[strategy]:>7.1f} "
+              f"{row['mean']:>9.1f} {row['5%']:>7.1f}")
+
+
+def bench_league_optimizer(n_sales=20, seed=0):
+    """League-wide forecast after every sale, checking each team's predicted roster fits its cap and open slots"""
+    print(f"{'league optimizer':<28} {'free agents':>11} {'first ms':>9} {'mean ms':>8} {'max ms':>7} {'max gap':>8}")
+    team_codes = list(teams_data.keys())
+    for label, players_df in (("players-24.csv", load_players()), ("league pool (50000)", make_league_pool(50_000)),
+                              ("league pool (200000)", make_league_pool(200_000))):
+        rng = np.random.default_rng(seed)
+        auction = FantasyAuction(df=players_df)
+        auction.process_data()
+        result = optimize_league(auction)
+        first_ms, timings, gaps = result['time'] * 1000, [], [result['gap']]
+        for sale in range(n_sales):
+            available = auction.get_available_players().sort_values('BID', ascending=False)
+            player_index = available.index[rng.integers(min(10, len(available)))]
+            price = round(float(available.loc[player_index, 'BID']) * rng.uniform(0.7, 1.4), 1)
+            auction.assign_player_to_team(player_index, team_codes[sale % len(team_codes)], price)
+            auction.process_data()
+            result = optimize_league(auction, previous=result)
+            summary = summarize_league(auction, result)
+            assert result['complete'] and (summary['predicted_spend'] <= summary['remaining'] + 1e-6).all()
+            timings.append(result['time'] * 1000)
+            gaps.append(result['gap'])
+        print(f"{label:<28} {result['free_agents']:>11} {first_ms:>9.1f} {np.mean(timings):>8.1f} "
+              f"{np.max(timings):>7.1f} {max(gaps):>8.3%}")
+
+
+def bench_session_start(n_sessions=10):
+    """Time n_sessions opening the app: each parsing, valuing and solving alone against forking the registry baseline"""
+    def parse_per_session():
+        auction = FantasyAuction(df=load_players())
+        auction.process_data()
+        return auction.get_bot_optimal_team() if auction.reoptimize() else None
+
+    registry = LeagueRegistry()
+    registry.add_league(DEFAULT_LEAGUE.name, DEFAULT_LEAGUE, CSV_PATH)
+
+    def fork_baseline():
+        # The fork is already valued, as the app leaves it until the first sale
+        registry.create_auction(DEFAULT_LEAGUE.name)
+        return registry.get_baseline(DEFAULT_LEAGUE.name)[1]
+
+    print(f"{'session start':<28} {'sessions':>8} {'first ms':>9} {'mean next ms':>12}")
+    for label, start_session in (("parse + solve per session", parse_per_session), ("registry baseline fork", fork_baseline)):
+        timings = []
+        for _ in range(n_sessions):
+            start = time.perf_counter()
+            optimal_team = start_session()
+            timings.append((time.perf_counter() - start) * 1000)
+        assert len(optimal_team) == FORWARD + DEFENCE + GOALIE
+        print(f"{label:<28} {n_sessions:>8} {timings[0]:>9.1f} {np.mean(timings[1:]):>12.1f}")
+
+
+def record_draft(directory, n_events, snapshot_every, seed=0):
+    """Run n_events logged mutations against players-24.csv, recalculating every 10 like the app"""
+    rng = np.random.default_rng(seed)
+    auction = FantasyAuction(df=load_players())
+    auction.process_data()
+    auction_log = AuctionLog(directory, snapshot_every=snapshot_every, fsync=False)
+    auction_log.attach(auction)
+    team_codes = list(teams_data.keys())
+    free_agents = auction.players_df.index[auction.players_df['FCHL TEAM'].isin(['UFA', 'RFA', 'ENT'])]
+
+    while auction_log.seq < n_events:
+        player_index = free_agents[rng.integers(len(free_agents))]
+        kind = rng.integers(5)
+        if kind == 0:
+            auction.assign_player_to_team(player_index, team_codes[rng.integers(len(team_codes))],
+                                          float(np.round(rng.uniform(0.5, 5.0), 1)))
+        elif kind == 1:
+            auction.remove_player_from_team(player_index)
+        elif kind == 2:
+            auction.update_player_status(player_index, 'MINOR')
+        elif kind == 3:
+            auction.update_player_salary(player_index, float(np.round(rng.uniform(0.5, 5.0), 1)))
+        else:
+            auction.update_player_bid(player_index, float(np.round(rng.uniform(0.5, 5.0), 1)))
+        if auction_log.seq % 10 == 0:
+            auction.process_data()
+    auction_log.close()
+    auction.event_log = None
+    return auction, auction_log
+
+
+def bench_event_log(n_events=1_000):
+    """Restore a draft from its event log against reloading the CSV, checking it matches the live auction"""
+    print(f"{'event log':<28} {'events':>7} {'restore ms':>10} {'process ms':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, snapshot_every in (("replay from start", 10 * n_events), ("snapshot + tail", 100)):
+            live, auction_log = record_draft(os.path.join(directory, str(snapshot_every)), n_events, snapshot_every)
+            restored = auction_log.restore()
+            live.process_data()
+            restored.process_data()
+            pd.testing.assert_frame_equal(live.players_df, restored.players_df, check_categorical=False)
+
+            replayed = len(auction_log.read_events(after=auction_log.latest_snapshot()[0]))
+            restore_ms = best_time(auction_log.restore)
+            process_ms = best_time(lambda: auction_log.restore().process_data()) - restore_ms
+            print(f"{label:<28} {replayed:>7} {restore_ms:>10.1f} {process_ms:>12.1f}")
+
+        def reload_csv():
+            return FantasyAuction(df=load_players())
+
+        reload_ms = best_time(reload_csv)
+        process_ms = best_time(lambda: reload_csv().process_data()) - reload_ms
+        print(f"{'CSV reload, draft lost':<28} {0:>7} {reload_ms:>10.1f} {process_ms:>12.1f}")
+
+
+def time_runs(func, repeat, setup=None):
+    """Wall-clock milliseconds of repeat calls of func, each after an untimed setup()"""
+    timings = []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(state)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def suite_result(pool, n_players, operation, timings, **extra):
+    """One machine-readable benchmark result"""
+    return {
+        'pool': pool,
+        'players': n_players,
+        'operation': operation,
+        'repeat': len(timings),
+        'best_ms': round(min(timings), 3),
+        'median_ms': round(float(np.median(timings)), 3),
+        **extra,
+    }
+
+
+def simulate_auction(auction, n_steps, seed=0):
+    """Sell n_steps players to the other teams at their bids, recalculating and re-solving after each sale"""
+    rng = np.random.default_rng(seed)
+    team_codes = [code for code in auction.config.teams if code != auction.config.own_team]
+    auction.solver_session = SolverSession(auction.config)
+    auction.solver_session.model.hideOutput()
+    step_ms = []
+    for step in range(n_steps):
+        start = time.perf_counter()
+        available = auction.get_available_players()
+        player_index = available.index[rng.integers(min(len(available), 50))]
+        auction.assign_player_to_team(player_index, team_codes[step % len(team_codes)],
+                                      float(available.loc[player_index, 'BID']))
+        auction.process_data()
+        auction.get_team_budgets()
+        auction.reoptimize()
+        step_ms.append((time.perf_counter() - start) * 1000)
+    return step_ms
+
+
+def bench_pool(pool, players_df, repeat=3, n_steps=20):
+    """Suite results of the engine's hot operations on one player pool"""
+    n_players = len(players_df)
+    results = []
+
+    def fresh_auction(state=None):
+        return FantasyAuction(df=players_df)
+
+    def processed_auction(state=None):
+        auction = fresh_auction()
+        auction.process_data()
+        return auction
+
+    results.append(suite_result(pool, n_players, 'load', time_runs(fresh_auction, repeat)))
+    results.append(suite_result(pool, n_players, 'process_data (full)',
+                                time_runs(lambda auction: auction.process_data(), repeat, fresh_auction)))
+
+    rng = np.random.default_rng(0)
+    auction = processed_auction()
+    free_agents = auction.get_available_players().index
+
+    def edit_one(state=None):
+        player_index = free_agents[rng.integers(len(free_agents))]
+        auction.update_player_bid(player_index, float(auction.players_df.loc[player_index, 'BID']) + 0.1)
+        return auction
+
+    results.append(suite_result(pool, n_players, 'process_data (one edit)',
+                                time_runs(lambda auction: auction.process_data(), repeat, edit_one)))
+    results.append(suite_result(pool, n_players, 'revalue_market (one edit)',
+                                time_runs(lambda auction: auction.revalue_market(), repeat, edit_one)))
+    results.append(suite_result(pool, n_players, 'z-scores (all positions)',
+                                time_runs(lambda state: auction.calculate_z_scores(), repeat)))
+
+    solved = {}
+
+    def build_and_solve(auction):
+        auction.build_model()
+        auction.model.hideOutput()
+        solution = auction.solve_model()
+        solved['model_players'] = len(auction.filtered_df)
+        solved['objective'] = None if solution is None else auction.model.getObjVal()
+
+    results.append(suite_result(pool, n_players, 'build_model + solve_model',
+                                time_runs(build_and_solve, repeat, processed_auction), **solved))
+    results.append(suite_result(pool, n_players, 'solve_roster (knapsack)',
+                                time_runs(lambda state: auction.solve_roster(), repeat)))
+
+    results.append(suite_result(pool, n_players, 'get_team_budgets',
+                                time_runs(lambda state: auction.get_team_budgets(), repeat)))
+    results.append(suite_result(pool, n_players, 'get_available_players',
+                                time_runs(lambda state: auction.get_available_players(), repeat)))
+
+    step_ms = simulate_auction(processed_auction(), n_steps)
+    results.append(suite_result(pool, n_players, f'simulated auction ({n_steps} sales)', [sum(step_ms)],
+                                step_mean_ms=round(float(np.mean(step_ms)), 3),
+                                step_max_ms=round(float(np.max(step_ms)), 3)))
+    return results
+
+
+def suite_metadata():
+    """Environment the suite ran in, stored alongside its results"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyscipopt': pyscipopt.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare_results(results, baseline, threshold, min_delta_ms=1.0):
+    """
+    Print median changes against a baseline run; returns the regressed operations.
+
+    An operation regresses when its median is both more than threshold times
+    and at least min_delta_ms slower than the baseline's, so sub-millisecond
+    timings jittering by a large ratio are not flagged.
+    """
+    previous = {(result['pool'], result['operation']): result for result in baseline['results']}
+    regressions = []
+    print(f"{'pool':<16} {'operation':<30} {'baseline ms':>11} {'ms':>10} {'change':>8}")
+    for result in results:
+        key = (result['pool'], result['operation'])
+        if key not in previous:
+            continue
+        ratio = result['median_ms'] / max(previous[key]['median_ms'], 1e-9)
+        regressed = ratio > threshold and result['median_ms'] - previous[key]['median_ms'] >= min_delta_ms
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{result['pool']:<16} {result['operation']:<30} {previous[key]['median_ms']:>11.1f} "
+              f"{result['median_ms']:>10.1f} {ratio:>7.2f}x{flag}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def run_suite(sizes=SUITE_SIZES, repeat=3, n_steps=20, output=None, compare=None, threshold=1.25,
+              min_delta_ms=1.0):
+    """Run the regression suite on players-24.csv and generated pools; returns the process exit code"""
+    pools = [(CSV_PATH, load_players())] + [(f"generated {n}", make_league_pool(n)) for n in sizes]
+    results = []
+    print(f"{'pool':<16} {'players':>8} {'operation':<30} {'best ms':>10} {'median ms':>10}")
+    for pool, players_df in pools:
+        for result in bench_pool(pool, players_df, repeat, n_steps):
+            print(f"{pool:<16} {result['players']:>8} {result['operation']:<30} "
+                  f"{result['best_ms']:>10.1f} {result['median_ms']:>10.1f}")
+            results.append(result)
+
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump({'metadata': suite_metadata(), 'results': results}, file, indent=2)
+    if compare is not None:
+        with open(compare, 'r') as file:
+            baseline = json.load(file)
+        print()
+        if compare_results(results, baseline, threshold, min_delta_ms):
+            return 1
+    return 0
+
+
+def main():
+    print(f"{'build_model':<28} {'players':>7} {'legacy ms':>10} {'vectorized ms':>12} {'speedup':>8}")
+
+    auction = FantasyAuction(df=load_players())
+    auction.process_data()
+    bench_build_model(CSV_PATH, auction)
+
+    for n_players in (2_000, 10_000):
+        bench_build_model(f"all free agents ({n_players})", wide_pool_auction(n_players))
+
+    print()
+    bench_reoptimize()
+
+    print()
+    bench_process_data()
+
+    print()
+    bench_background_solver()
+
+    print()
+    bench_solver_limits()
+
+    print()
+    bench_solver_backends()
+
+    print()
+    bench_fallback_rosters()
+
+    print()
+    bench_stochastic_roster()
+
+    print()
+    bench_scenarios()
+
+    print()
+    bench_simulator()
+
+    print()
+    bench_league_optimizer()
+
+    print()
+    bench_render_table()
+
+    print()
+    bench_schema()
+
+    print()
+    bench_leagues()
+
+    print()
+    bench_session_start()
+
+    print()
+    bench_event_log()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--suite', action='store_true', help="run the machine-readable regression suite")
+    parser.add_argument('--sizes', type=lambda value: [int(n) for n in value.split(',')], default=SUITE_SIZES,
+                        help="comma-separated generated pool sizes")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=20, help="sales in the simulated auction")
+    parser.add_argument('--output', help="write results as JSON to this path")
+    parser.add_argument('--compare', help="JSON results of an earlier run to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.25, help="median slowdown counted as a regression")
+    parser.add_argument('--min-delta', type=float, default=1.0,
+                        help="smallest median slowdown in ms counted as a regression")
+    args = parser.parse_args()
+    if args.suite:
+        sys.exit(run_suite(args.sizes, args.repeat, args.steps, args.output, args.compare, args.threshold,
+                           args.min_delta))
+    main()
@@ -1,21 +1,25 @@
+import copy
+import functools
+import hashlib
 import time
+import threading
 import pandas as pd 
 import json
+import os
 import numpy as np
-from pyscipopt import Model
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from decimal import Decimal
+from pyscipopt import Eventhdlr, Model, SCIP_EVENTTYPE, quicksum
+
+from roster_knapsack import COST_GRID, solve_knapsack
 
 """
 Fantasy Hockey Auction Management System
 Adapted for Streamlit web interface
 """
 
-# Load teams from the JSON file
-with open('teams.json', 'r') as file:
-    teams_data = json.load(file)
-
-# Extract penalties from the teams data
-PENALTIES = {team: data['penalty'] for team, data in teams_data.items()}
-
 # Constants
 SALARY = 56.8
 MIN_SALARY = 0.5
@@ -24,13 +28,1137 @@ FORWARD = 14
 DEFENCE = 7
 GOALIE = 3
 
+
+class LeagueConfig:
+    """Teams, salary cap and roster requirements of one league"""
+
+    def __init__(self, teams, salary=SALARY, min_salary=MIN_SALARY, forward=FORWARD, defence=DEFENCE,
+                 goalie=GOALIE, own_team='BOT', name='FCHL'):
+        self.name = name
+        self.teams = teams
+        self.salary = salary
+        self.min_salary = min_salary
+        self.forward = forward
+        self.defence = defence
+        self.goalie = goalie
+        # Team the optimizer builds a roster for
+        self.own_team = own_team
+
+    @classmethod
+    def from_json(cls, path, **kwargs):
+        """Load the teams of a league from a teams.json style file"""
+        with open(path, 'r') as file:
+            return cls(json.load(file), **kwargs)
+
+    @property
+    def n_teams(self):
+        return len(self.teams)
+
+    @property
+    def penalties(self):
+        return {team: data['penalty'] for team, data in self.teams.items()}
+
+    @property
+    def position_requirements(self):
+        """Number of players the own team must select at each position"""
+        return {'F': self.forward, 'D': self.defence, 'G': self.goalie}
+
+
+# League served when no config is passed in, loaded from the JSON file
+DEFAULT_LEAGUE = LeagueConfig.from_json('teams.json')
+teams_data = DEFAULT_LEAGUE.teams
+
+# Columns process_data writes that later recalculations do not always rewrite
+REPLAY_COLUMNS = ['STATUS', 'SALARY', 'BID', 'Z-score']
+
+# Position order used by the array-backed state and the simulator
+POSITIONS = ['F', 'D', 'G']
+
+# Recalculation diagnostics records kept per auction
+DIAGNOSTICS_HISTORY = 50
+
+# Guards diagnostics records, which background solvers time their phases into
+DIAGNOSTICS_LOCK = threading.Lock()
+# Per thread, the time spent in phases nested inside each phase still running
+_phase_stack = threading.local()
+
+# Distinct BOT rosters kept ready as fallback plans
+TOP_ROSTERS = 5
+
+# Seconds a background solver's worker waits for a request before exiting
+BACKGROUND_IDLE_TIMEOUT = 300.0
+
+# Known values of the coded string columns; values found in the data are appended
+PLAYER_CATEGORIES = {
+    'POS': ['F', 'D', 'G'],
+    'GROUP': ['3', '2', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'T', 'RFA1', 'RFA2'],
+    'STATUS': ['START', 'MINOR', 'NO', 'AUCTION', 'UFA', 'RFA', 'ENT'],
+    'FCHL TEAM': list(teams_data) + ['UFA', 'RFA', 'ENT'],
+    'NHL TEAM': [],
+    'Draftable': ['NO', 'YES'],
+}
+
+
+def apply_player_schema(df):
+    """
+    Return a typed copy of a players table.
+
+    Coded string columns become categoricals, so masks such as
+    isin(['RFA', 'UFA', 'ENT']) compare integer codes, and AGE/PTS shrink to
+    int16 when they hold whole numbers. SALARY and BID stay float64: the cap
+    constraint is tight at 56.8 and float32 rounding on the 0.1 grid would
+    change which rosters are feasible.
+    """
+    dtypes = {}
+    for column, known in PLAYER_CATEGORIES.items():
+        if column in df.columns:
+            found = [value for value in df[column].dropna().unique() if value not in known]
+            dtypes[column] = pd.CategoricalDtype(known + sorted(found, key=str))
+    for column in ('AGE', 'PTS'):
+        if column in df.columns and pd.api.types.is_numeric_dtype(df[column]):
+            values = df[column].fillna(0)
+            if (values == values.round()).all() and values.abs().max() < np.iinfo(np.int16).max:
+                dtypes[column] = np.int16
+                df = df.assign(**{column: values})
+    return df.astype(dtypes)
+
+
+def load_players_csv(csv_path):
+    """Read a players CSV, filling missing numbers with 0, and return it typed"""
+    df = pd.read_csv(csv_path)
+    for column in ('SALARY', 'BID', 'PTS'):
+        df[column] = pd.to_numeric(df[column]).fillna(0.0).astype(float)
+    df['AGE'] = pd.to_numeric(df['AGE']).fillna(0).astype(int)
+    return apply_player_schema(df)
+
+
+def file_hash(path):
+    """SHA-256 of a file's content, so cached parses follow edits to the file"""
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def write_changed(df, column, rows, values):
+    """
+    Write values into a numeric column at row positions rows, only where they differ.
+
+    Columns with no changed cell are not written at all, so a forked table
+    keeps sharing them with its baseline under copy-on-write. Returns the
+    index of the rows written.
+    """
+    current = df[column].to_numpy(dtype=float)[rows]
+    changed = ~((current == values) | (np.isnan(current) & np.isnan(values)))
+    changed_index = df.index[rows[changed]]
+    if len(changed_index):
+        df.loc[changed_index, column] = values[changed]
+    return changed_index
+
+
+def get_model_players(players_df):
+    """Players the PlayerSelection model chooses from: free agents with a bid"""
+    return players_df[players_df['FCHL TEAM'].isin(['ENT', 'UFA', 'RFA']) & (players_df['BID'] > 0)]
+
+
+def get_own_starters(players_df, own_team='BOT'):
+    """own_team's START players, the part of its roster already in place"""
+    return players_df[(players_df['FCHL TEAM'] == own_team) & (players_df['STATUS'] == 'START')]
+
+
+def get_model_arrays(filtered_df):
+    """Extract the columns used by the PlayerSelection model as NumPy arrays"""
+    return {
+        'pts': filtered_df['PTS'].to_numpy(dtype=float),
+        'cost': (filtered_df['SALARY'] + filtered_df['BID']).to_numpy(dtype=float),
+        'pos': filtered_df['POS'].to_numpy(dtype=object),
+        # Only scenarios force players in; the roster in place is not part of the model
+        'fixed': np.zeros(len(filtered_df), dtype=bool),
+    }
+
+
+def add_model_variables(model, arrays, names=None):
+    """Add one binary variable per player and set the points objective"""
+    if names is None:
+        names = [f"x_{i}" for i in range(len(arrays['pts']))]
+    variables = [model.addVar(vtype="B", name=name) for name in names]
+
+    # Fixed players are pinned through their lower bound instead of an extra constraint
+    for i in np.flatnonzero(arrays['fixed']):
+        model.chgVarLb(variables[i], 1)
+
+    model.setObjective(
+        quicksum(pts * var for pts, var in zip(arrays['pts'].tolist(), variables)),
+        "maximize"
+    )
+    return variables
+
+
+def add_model_constraints(model, variables, arrays, limits):
+    """
+    Add the remaining cap and open slot constraints, returning them keyed by name.
+
+    limits are what the roster in place leaves, as from
+    FantasyAuction.get_roster_limits. Its points enter the objective as a
+    constant, so objective values are still the whole roster's points.
+    """
+    constraints = {}
+
+    # Sum of the "Bid" values must be under what is left of the salary cap
+    constraints['cap'] = model.addCons(
+        quicksum(cost * var for cost, var in zip(arrays['cost'].tolist(), variables)) <= limits['cap'],
+        name="cap"
+    )
+
+    # Must fill the F, D and G slots still open
+    for pos, required in limits['slots'].items():
+        constraints[pos] = model.addCons(
+            quicksum(variables[i] for i in np.flatnonzero(arrays['pos'] == pos)) == required,
+            name=f"count_{pos}"
+        )
+
+    if limits.get('points'):
+        model.addObjoffset(limits['points'])
+    return constraints
+
+
+def enumerate_rosters(arrays, limits, k, min_changes=1, solver_limits=None, exclude=(), stop=None):
+    """
+    Up to k best distinct rosters, best first: positions into the arrays, their costs and the objective.
+
+    Each roster found is cut off with a no-good constraint that also rules
+    out every roster sharing all but fewer than min_changes of its players,
+    and the model is solved again. exclude lists rosters already known, cut
+    off before the first solve; stop is checked between solves to give up early.
+    The time limit of solver_limits bounds the whole enumeration: each solve
+    gets what is left of it, and the enumeration ends with the first solve
+    that runs out.
+    """
+    solver_limits = dict(solver_limits or {})
+    time_limit = solver_limits.pop('time_limit', None)
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    model = Model("PlayerSelection")
+    model.hideOutput()
+    set_solver_limits(model, **solver_limits)
+    variables = add_model_variables(model, arrays)
+    add_model_constraints(model, variables, arrays, limits)
+
+    def cut_off(players):
+        model.addCons(quicksum(variables[i] for i in players) <= len(players) - min_changes)
+
+    for players in exclude:
+        cut_off(players)
+    rosters = []
+    while len(rosters) < k and not (stop is not None and stop()):
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            model.setParam('limits/time', remaining)
+        # Releases the GIL so a background enumeration leaves the app responsive
+        model.optimizeNogil()
+        if not has_usable_solution(model):
+            break
+        solution = model.getBestSol()
+        players = [i for i, var in enumerate(variables) if model.getSolVal(solution, var) > 0.5]
+        rosters.append({
+            'objective': model.getSolObjVal(solution),
+            'cost': float(arrays['cost'][players].sum()),
+            'players': players,
+            'costs': arrays['cost'][players].tolist(),
+        })
+        if model.getStatus() == "timelimit":
+            break
+        model.freeTransform()
+        cut_off(players)
+    return rosters
+
+
+def feasible_rosters(rosters, players_df, limits, own_team='BOT'):
+    """
+    The rosters that can still be completed in players_df, best first.
+
+    A roster survives while each of its players is still a free agent with a
+    bid or has become an own_team starter, and the free agents left fill
+    exactly the slots still open within the remaining cap at the prices the
+    roster was planned at. Bids re-valued since are left to the next solve.
+    """
+    starters = set(get_own_starters(players_df, own_team).index)
+    feasible = []
+    for roster in rosters:
+        players = players_df.loc[roster['players']]
+        left = ~players.index.isin(starters)
+        free = players[left]
+        if not (free['FCHL TEAM'].isin(['ENT', 'UFA', 'RFA']) & (free['BID'] > 0)).all():
+            continue
+        costs = np.asarray(roster['costs'])[left]
+        counts = free['POS'].value_counts()
+        if costs.sum() > limits['cap'] + 1e-6 or \
+                any(counts.get(pos, 0) != need for pos, need in limits['slots'].items()):
+            continue
+        feasible.append({
+            'objective': limits['points'] + float(free['PTS'].sum()),
+            'cost': float(costs.sum()),
+            'players': free.index.tolist(),
+            'costs': costs.tolist(),
+        })
+    return sorted(feasible, key=lambda roster: -roster['objective'])
+
+
+# Read-only player arrays and roster limits shared by every scenario solved in a worker process
+_scenario_arrays = None
+_scenario_limits = None
+
+
+def _init_scenario_worker(arrays, limits):
+    global _scenario_arrays, _scenario_limits
+    _scenario_arrays = arrays
+    _scenario_limits = limits
+
+
+def solve_scenario(arrays, override, limits):
+    """
+    Solve PlayerSelection for one what-if override on top of the base arrays.
+
+    override may contain 'prices' ({player index: price paid}), 'force_in'
+    and 'force_out' (lists of player indices).
+    """
+    position = {idx: i for i, idx in enumerate(arrays['index'].tolist())}
+    cost = arrays['cost'].copy()
+    fixed = arrays['fixed'].copy()
+    available = arrays['available'].copy()
+
+    for idx, price in override.get('prices', {}).items():
+        cost[position[idx]] = arrays['salary'][position[idx]] + price
+        available[position[idx]] = True
+    for idx in override.get('force_in', []):
+        fixed[position[idx]] = True
+        available[position[idx]] = True
+    for idx in override.get('force_out', []):
+        fixed[position[idx]] = False
+        available[position[idx]] = False
+
+    scenario_arrays = dict(arrays, cost=cost, fixed=fixed)
+    model = Model("PlayerSelection")
+    model.hideOutput()
+    variables = add_model_variables(model, scenario_arrays)
+    for i in np.flatnonzero(~available):
+        model.chgVarUb(variables[i], 0)
+    add_model_constraints(model, variables, scenario_arrays, limits)
+    model.optimize()
+
+    status = model.getStatus()
+    if model.getNSols() == 0:
+        return {'override': override, 'status': status, 'objective': None, 'total_cost': None, 'players': []}
+
+    solution = model.getBestSol()
+    selected = [i for i, var in enumerate(variables) if model.getSolVal(solution, var) > 0.5]
+    return {
+        'override': override,
+        'status': status,
+        'objective': model.getSolObjVal(solution),
+        'total_cost': float(cost[selected].sum()),
+        'players': arrays['index'][selected].tolist(),
+    }
+
+
+def _solve_scenario_in_worker(override):
+    return solve_scenario(_scenario_arrays, override, _scenario_limits)
+
+
+def get_selected_players(model, solution, player_vars):
+    """Index of the players set to 1 in solution"""
+    return [idx for idx, var in player_vars.items() if model.getSolVal(solution, var) > 0.5]
+
+
+def get_optimal_team(players_df, selected):
+    """Table of the selected players, in players_df order"""
+    optimal_players = []
+    for i, row in players_df[players_df.index.isin(selected)].iterrows():
+        optimal_players.append({
+            'PLAYER': row['PLAYER'],
+            'POS': row['POS'],
+            'PTS': row['PTS'],
+            'SALARY': row['SALARY'],
+            'BID': row['BID'],
+            'TOTAL_COST': row['SALARY'] + row['BID'],
+            'FCHL TEAM': row['FCHL TEAM'],
+            'STATUS': row['STATUS'],
+            'GROUP': row['GROUP']
+        })
+
+    return pd.DataFrame(optimal_players)
+
+
+def set_solver_limits(model, time_limit=None, gap_limit=None, threads=None):
+    """
+    Limit a solve to time_limit seconds and stop once within gap_limit of optimal.
+
+    None keeps SCIP's defaults (no time limit, proven optimum). threads caps the
+    threads SCIP may use, so sessions sharing a container do not oversubscribe it.
+    """
+    model.setParam('limits/time', 1e20 if time_limit is None else time_limit)
+    model.setParam('limits/gap', 0.0 if gap_limit is None else gap_limit)
+    if threads is not None:
+        model.setParam('lp/threads', threads)
+        model.setParam('parallel/maxnthreads', threads)
+
+
+def get_solve_info(model):
+    """Status, objective, bound and gap of the last solve"""
+    has_solution = model.getNSols() > 0
+    return {
+        'status': model.getStatus(),
+        'objective': model.getObjVal() if has_solution else None,
+        'dual_bound': model.getDualbound(),
+        'gap': model.getGap() if has_solution else None,
+        'time': model.getSolvingTime(),
+    }
+
+
+def has_usable_solution(model):
+    """Optimal, or stopped by a time or gap limit with an incumbent to return"""
+    status = model.getStatus()
+    return status == "optimal" or (status in ("timelimit", "gaplimit") and model.getNSols() > 0)
+
+
+class ScipBackend:
+    """Builds and solves the PlayerSelection MIP; takes any costs and honours the solver limits"""
+
+    def solve(self, arrays, limits, solver_limits=None):
+        model = Model("PlayerSelection")
+        model.hideOutput()
+        set_solver_limits(model, **(solver_limits or {}))
+        variables = add_model_variables(model, arrays)
+        add_model_constraints(model, variables, arrays, limits)
+        model.optimize()
+
+        status = model.getStatus()
+        if not has_usable_solution(model):
+            return {'status': status, 'objective': None, 'gap': None, 'players': []}
+        solution = model.getBestSol()
+        return {
+            'status': status,
+            'objective': model.getSolObjVal(solution),
+            'gap': model.getGap(),
+            'players': [i for i, var in enumerate(variables) if model.getSolVal(solution, var) > 0.5],
+        }
+
+
+class KnapsackBackend:
+    """
+    Solves the roster exactly with the dynamic program of roster_knapsack, without building a model.
+
+    Always proves optimality, so the solver limits do not apply. Costs off
+    the COST_GRID are handed to SCIP instead.
+    """
+
+    def solve(self, arrays, limits, solver_limits=None):
+        steps = arrays['cost'] / COST_GRID
+        if not np.allclose(steps, np.round(steps), rtol=0, atol=1e-6):
+            return ScipBackend().solve(arrays, limits, solver_limits)
+
+        pos = pd.Categorical(arrays['pos'], categories=POSITIONS).codes
+        slots = [limits['slots'].get(p, 0) for p in POSITIONS]
+        capacity = int(np.floor(limits['cap'] / COST_GRID + 1e-6))
+        selected = solve_knapsack(arrays['pts'], np.round(steps).astype(int), pos, slots, capacity)
+        if selected is None:
+            return {'status': 'infeasible', 'objective': None, 'gap': None, 'players': []}
+        return {
+            'status': 'optimal',
+            'objective': float(arrays['pts'][selected].sum()) + limits.get('points', 0.0),
+            'gap': 0.0,
+            'players': selected.tolist(),
+        }
+
+
+# Interchangeable solvers of the BOT roster, selected by name
+SOLVER_BACKENDS = {
+    'scip': ScipBackend,
+    'knapsack': KnapsackBackend,
+}
+
+
+def solve_roster(players_df, limits, backend='scip', solver_limits=None, own_team='BOT', record=None):
+    """
+    Optimal own_team roster from players_df under limits, with one of SOLVER_BACKENDS.
+
+    Returns the backend's status, objective and gap, the free agents picked
+    and the optimal team table including own_team's starters; the phases are
+    timed into record.
+    """
+    with time_phase(record, 'build_model'):
+        filtered_df = get_model_players(players_df)
+        arrays = get_model_arrays(filtered_df)
+    with time_phase(record, 'optimize'):
+        result = SOLVER_BACKENDS[backend]().solve(arrays, limits, solver_limits)
+    result['players'] = filtered_df.index[result['players']].tolist()
+    result['optimal_team'] = None
+    if result['objective'] is not None:
+        with time_phase(record, 'get_bot_optimal_team'):
+            starters = get_own_starters(players_df, own_team).index.tolist()
+            result['optimal_team'] = get_optimal_team(players_df, starters + result['players'])
+    return result
+
+
+def new_recalc_record(data_version):
+    """Empty diagnostics record of one recalculation"""
+    return {'time': time.time(), 'data_version': data_version, 'status': None, 'phases': {}, 'model': {}}
+
+
+@contextmanager
+def time_phase(record, phase):
+    """
+    Add the self time of the block to record['phases'][phase], in milliseconds.
+
+    Time spent in phases nested inside the block, such as calculate_z_scores
+    inside process_data, is counted to those phases only, so the phases of a
+    record add up to its wall time.
+    """
+    if not hasattr(_phase_stack, 'nested_ms'):
+        _phase_stack.nested_ms = []
+    stack = _phase_stack.nested_ms
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        nested_ms = stack.pop()
+        if stack:
+            stack[-1] += elapsed_ms
+        if record is not None:
+            with DIAGNOSTICS_LOCK:
+                record['phases'][phase] = record['phases'].get(phase, 0.0) + elapsed_ms - nested_ms
+
+
+def timed_phase(phase, begins_recalc=False):
+    """Time a FantasyAuction method as a phase of its current recalculation record"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if begins_recalc or self.recalc is None:
+                self.begin_recalc()
+            with time_phase(self.recalc, phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_model_stats(model):
+    """Size of the model and the search effort of its last solve"""
+    has_solution = model.getNSols() > 0
+    return {
+        'variables': model.getNVars(transformed=False),
+        'constraints': model.getNConss(transformed=False),
+        'nodes': model.getNTotalNodes(),
+        'lp_iterations': model.getNLPIterations(),
+        'primal_bound': model.getPrimalbound() if has_solution else None,
+        'dual_bound': model.getDualbound(),
+        'gap': model.getGap() if has_solution else None,
+    }
+
+
+class IncumbentReporter(Eventhdlr):
+    """Passes every improving solution found during a solve to callback"""
+
+    def __init__(self, player_vars, callback=None):
+        self.player_vars = player_vars
+        self.callback = callback
+
+    def eventinit(self):
+        self.model.catchEvent(SCIP_EVENTTYPE.BESTSOLFOUND, self)
+
+    def eventexit(self):
+        self.model.dropEvent(SCIP_EVENTTYPE.BESTSOLFOUND, self)
+
+    def eventexec(self, event):
+        if self.callback is None:
+            return
+        solution = self.model.getBestSol()
+        self.callback({
+            'objective': self.model.getSolObjVal(solution),
+            'dual_bound': self.model.getDualbound(),
+            'gap': self.model.getGap(),
+            'time': self.model.getSolvingTime(),
+            'players': get_selected_players(self.model, solution, self.player_vars),
+        })
+
+
+def add_incumbent_reporter(model, player_vars, callback=None):
+    """Attach an IncumbentReporter to model and return it"""
+    reporter = IncumbentReporter(player_vars, callback)
+    model.includeEventhdlr(reporter, "incumbents", "Report improving solutions")
+    return reporter
+
+
+class SolverSession:
+    """
+    Persistent PlayerSelection model that is updated in place between solves.
+
+    Each player keeps the same SCIP variable for the lifetime of the session.
+    Players that leave the pool are disabled through their upper bound, and
+    only coefficients and constraint sides that actually changed are
+    rewritten before a re-solve. The previous optimal roster is handed to
+    SCIP as a starting solution.
+    """
+
+    def __init__(self, config=DEFAULT_LEAGUE):
+        self.config = config
+        self.model = Model("PlayerSelection")
+        self.model.hideOutput()
+        self.model.setObjective(0, "maximize")
+        # Roster limits the constraint sides and objective offset were last set to
+        self.limits = {'cap': 0.0, 'slots': dict.fromkeys(POSITIONS, 0), 'points': 0.0}
+        self.constraints = add_model_constraints(
+            self.model, [], {'cost': np.empty(0), 'pos': np.empty(0, dtype=object)}, self.limits
+        )
+        self.player_vars = {}
+        # Per-player (pts, cost, pos, active) currently loaded in the model
+        self.coefficients = {}
+        self.last_solution = {}
+        self.filtered_df = None
+        self.players_df = None
+        # Index of the own team's START players, listed with every optimal roster
+        self.starters = []
+        self.reporter = add_incumbent_reporter(self.model, self.player_vars)
+
+    def sync(self, players_df, limits):
+        """Bring the model in line with players_df and the roster limits, touching only changed players"""
+        self.model.freeTransform()
+        self.set_limits(limits)
+
+        self.players_df = players_df
+        self.starters = get_own_starters(players_df, self.config.own_team).index.tolist()
+        self.filtered_df = get_model_players(players_df)
+        arrays = get_model_arrays(self.filtered_df)
+        names = (self.filtered_df['PLAYER'] + '_' + self.filtered_df['POS'].astype(str)).tolist()
+
+        active = set()
+        for idx, name, pts, cost, pos in zip(
+            self.filtered_df.index, names, arrays['pts'].tolist(), arrays['cost'].tolist(), arrays['pos'].tolist()
+        ):
+            active.add(idx)
+            current = (pts, cost, pos, True)
+            previous = self.coefficients.get(idx)
+            if previous == current:
+                continue
+
+            var = self.player_vars.get(idx)
+            if var is None:
+                var = self.model.addVar(vtype="B", name=name)
+                self.player_vars[idx] = var
+                self.model.addCoefLinear(self.constraints['cap'], var, cost)
+                self.model.addCoefLinear(self.constraints[pos], var, 1)
+                self.model.setObjective(pts * var, "maximize", clear=False)
+            else:
+                old_pts, old_cost, old_pos, _ = previous
+                if old_pts != pts:
+                    self.model.setObjective(pts * var, "maximize", clear=False)
+                if old_cost != cost:
+                    self.model.chgCoefLinear(self.constraints['cap'], var, cost)
+                if old_pos != pos:
+                    self.model.delCoefLinear(self.constraints[old_pos], var)
+                    self.model.addCoefLinear(self.constraints[pos], var, 1)
+
+            self.model.chgVarUb(var, 1)
+            self.coefficients[idx] = current
+
+        # Players that left the pool keep their variable but can no longer be selected
+        for idx, previous in self.coefficients.items():
+            if previous[3] and idx not in active:
+                self.model.chgVarUb(self.player_vars[idx], 0)
+                self.coefficients[idx] = previous[:3] + (False,)
+
+        self.add_warm_start(active)
+
+    def set_limits(self, limits):
+        """Move the cap and slot constraint sides and the objective offset to new roster limits"""
+        if limits['cap'] != self.limits['cap']:
+            self.model.chgRhs(self.constraints['cap'], limits['cap'])
+        for pos, required in limits['slots'].items():
+            constraint = self.constraints[pos]
+            # Move the side that keeps lhs <= rhs first
+            if required > self.limits['slots'][pos]:
+                self.model.chgRhs(constraint, required)
+                self.model.chgLhs(constraint, required)
+            elif required < self.limits['slots'][pos]:
+                self.model.chgLhs(constraint, required)
+                self.model.chgRhs(constraint, required)
+        if limits['points'] != self.limits['points']:
+            self.model.addObjoffset(limits['points'] - self.model.getObjoffset())
+        self.limits = limits
+
+    def add_warm_start(self, active):
+        """Offer the previous optimal roster to SCIP as a starting solution if it is still feasible"""
+        roster = [idx for idx, value in self.last_solution.items() if value]
+        if not roster or any(idx not in active for idx in roster):
+            return
+
+        cost = sum(self.coefficients[idx][1] for idx in roster)
+        counts = pd.Series([self.coefficients[idx][2] for idx in roster]).value_counts()
+        if (cost > self.limits['cap'] + 1e-6 or
+                any(counts.get(pos, 0) != required for pos, required in self.limits['slots'].items())):
+            return
+
+        solution = self.model.createSol()
+        for idx in roster:
+            self.model.setSolVal(solution, self.player_vars[idx], 1.0)
+        self.model.addSol(solution)
+
+    def remember_solution(self, solution):
+        """Store the roster of the latest solve for the next warm start"""
+        self.last_solution = {
+            idx: round(self.model.getSolVal(solution, self.player_vars[idx]))
+            for idx in self.filtered_df.index
+        }
+
+    def get_roster(self, selected):
+        """Table of the own team's starters plus the selected players, in players table order"""
+        return get_optimal_team(self.players_df, self.starters + selected)
+
+
+class BackgroundSolver:
+    """
+    Re-solves the BOT roster on a worker thread owned by one session.
+
+    request() hands the worker a copy-on-write snapshot of the players table and
+    returns at once. Requests arriving less than debounce seconds apart start a
+    single solve of the latest one, and a solve overtaken by a newer request is
+    interrupted. result holds the last finished roster and the data version it
+    was solved for, and incumbent the best roster of the solve in progress.
+    With the 'scip' backend the worker keeps a persistent SolverSession;
+    other backends solve each snapshot from scratch. With alternatives above
+    one, each result also carries that many best distinct rosters, and every
+    request serves the ones still feasible as fallbacks until its solve ends.
+    The worker starts with the first request and exits after idle_timeout
+    seconds without one, so idle or abandoned sessions hold no thread.
+    """
+
+    def __init__(self, config=DEFAULT_LEAGUE, debounce=0.3, time_limit=None, gap_limit=None, threads=None,
+                 backend='scip', alternatives=0, idle_timeout=BACKGROUND_IDLE_TIMEOUT):
+        self.debounce = debounce
+        self.idle_timeout = idle_timeout
+        self.backend = backend
+        self.alternatives = alternatives
+        self.session = SolverSession(config)
+        self.session.reporter.callback = self.report_incumbent
+        set_solver_limits(self.session.model, time_limit, gap_limit, threads)
+        # Limits of the solves without the persistent model: other backends and the alternative rosters
+        self.solver_limits = {'time_limit': time_limit, 'gap_limit': gap_limit, 'threads': threads}
+        self.condition = threading.Condition()
+        # (data version, players table, roster limits, diagnostics record) waiting to be solved
+        self.pending = None
+        self.last_request = 0.0
+        self.requested_version = None
+        self.solving = False
+        self.stopped = False
+        self.result = None
+        # Best roster found so far by the running solve, for display while it finishes
+        self.incumbent = None
+        # Rosters of the last result still feasible for the latest request, best first
+        self.fallbacks = []
+        self.solving_version = None
+        self.solves = 0
+        self.interrupted = 0
+        # Limits waiting to be applied before the next solve
+        self.limits = None
+        # Worker thread, None while idle
+        self.thread = None
+
+    def request(self, auction):
+        """Queue a solve of the auction's current table, interrupting any outdated solve"""
+        players_df, limits = auction.players_df.copy(deep=False), auction.get_roster_limits()
+        with self.condition:
+            # The solve's phases are timed into the auction's current diagnostics record
+            self.pending = (auction.data_version, players_df, limits, auction.recalc)
+            self.requested_version = auction.data_version
+            self.last_request = time.monotonic()
+            self.interrupt()
+            if self.thread is None and not self.stopped:
+                self.thread = threading.Thread(target=self.run, name="bot-solver", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+            rosters = [] if self.result is None else self.result.get('rosters', [])
+
+        fallbacks = feasible_rosters(rosters, players_df, limits, self.session.config.own_team)
+        if fallbacks:
+            starters = get_own_starters(players_df, self.session.config.own_team).index.tolist()
+            fallbacks[0]['optimal_team'] = get_optimal_team(players_df, starters + fallbacks[0]['players'])
+        with self.condition:
+            self.fallbacks = [dict(roster, version=auction.data_version) for roster in fallbacks]
+
+    def set_limits(self, time_limit=None, gap_limit=None, threads=None):
+        """Apply new solver limits from the next solve on"""
+        with self.condition:
+            self.interrupt()
+            self.limits = (time_limit, gap_limit, threads)
+            self.solver_limits = {'time_limit': time_limit, 'gap_limit': gap_limit, 'threads': threads}
+            self.condition.notify_all()
+
+    def set_backend(self, backend):
+        """Solve with another of SOLVER_BACKENDS from the next solve on"""
+        with self.condition:
+            self.interrupt()
+            self.backend = backend
+            self.condition.notify_all()
+
+    def report_incumbent(self, incumbent):
+        """Called from the solve with every improving roster"""
+        team = self.session.get_roster(incumbent['players'])
+        with self.condition:
+            self.incumbent = dict(incumbent, version=self.solving_version, optimal_team=team)
+
+    def interrupt(self):
+        """Ask SCIP to stop the running solve; called with the condition held"""
+        if self.solving:
+            try:
+                self.session.model.interruptSolve()
+            except Exception:
+                pass  # The solve is already finishing and its result will be discarded
+
+    def is_stale(self):
+        """Whether the latest request has not been solved yet"""
+        with self.condition:
+            return self.requested_version is not None and (
+                self.result is None or self.result['version'] != self.requested_version
+            )
+
+    def wait(self, timeout=None):
+        """Block until the latest request is solved; returns False on timeout"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.is_stale(), timeout)
+
+    def stop(self, timeout=None):
+        """Stop the worker for good, interrupting its solve, and wait up to timeout seconds for it to exit"""
+        with self.condition:
+            self.stopped = True
+            self.interrupt()
+            self.condition.notify_all()
+            thread = self.thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def run(self):
+        while True:
+            with self.condition:
+                if not self.condition.wait_for(lambda: self.pending is not None or self.stopped, self.idle_timeout):
+                    # Idle: the next request starts a new worker
+                    self.thread = None
+                    return
+                # Let a burst of edits settle so it costs one solve
+                while not self.stopped and time.monotonic() < self.last_request + self.debounce:
+                    self.condition.wait(self.last_request + self.debounce - time.monotonic())
+                if self.stopped:
+                    return
+                version, players_df, limits, record = self.pending
+                self.pending = None
+
+            try:
+                result = self.solve(version, players_df, limits, record)
+            except Exception as e:
+                print(f"An unexpected error occurred during background optimization: {e}")
+                result = {'version': version, 'status': 'error', 'objective': None, 'optimal_team': None}
+            if record is not None:
+                with DIAGNOSTICS_LOCK:
+                    record['status'] = 'interrupted' if result is None else result['status']
+
+            with self.condition:
+                if result is None:
+                    self.interrupted += 1
+                else:
+                    self.solves += 1
+                    self.result = result
+                self.condition.notify_all()
+
+    def solve(self, version, players_df, limits, record=None):
+        """Solve one snapshot and its alternative rosters; None when a newer request made it outdated"""
+        result = self.solve_optimum(version, players_df, limits, record)
+        if result is not None and result['objective'] is not None and self.alternatives > 1:
+            with time_phase(record, 'top_rosters'):
+                result['rosters'] = self.solve_alternatives(players_df, limits, result)
+        return result
+
+    def solve_alternatives(self, players_df, limits, result):
+        """The optimal roster of result and the next best distinct ones, cut short by a newer request or the time limit"""
+        filtered_df = get_model_players(players_df)
+        arrays = get_model_arrays(filtered_df)
+        best = filtered_df.index.get_indexer(result['players'])
+        rosters = enumerate_rosters(arrays, limits, self.alternatives - 1, solver_limits=self.solver_limits,
+                                    exclude=[best.tolist()],
+                                    stop=lambda: self.pending is not None or self.stopped)
+        return [{
+            'objective': result['objective'],
+            'cost': float(arrays['cost'][best].sum()),
+            'players': result['players'],
+            'costs': arrays['cost'][best].tolist(),
+        }] + [dict(roster, players=filtered_df.index[roster['players']].tolist()) for roster in rosters]
+
+    def solve_optimum(self, version, players_df, limits, record=None):
+        """Solve one snapshot for its optimal roster; None when a newer request made it outdated"""
+        if self.backend != 'scip':
+            result = solve_roster(players_df, limits, self.backend, self.solver_limits,
+                                  own_team=self.session.config.own_team, record=record)
+            return dict(result, version=version)
+
+        with time_phase(record, 'build_model'):
+            self.session.sync(players_df, limits)
+        with self.condition:
+            if self.pending is not None:
+                return None
+            if self.limits is not None:
+                set_solver_limits(self.session.model, *self.limits)
+                self.limits = None
+            self.solving = True
+            self.solving_version = version
+            self.incumbent = None
+        with time_phase(record, 'optimize'):
+            self.session.model.optimizeNogil()
+
+        with self.condition:
+            self.solving = False
+            status = self.session.model.getStatus()
+            if self.pending is not None:
+                return None
+            if status == "userinterrupt":
+                # Cut short by an interrupt that arrived as the solve began: run it again
+                self.pending = (version, players_df, limits, record)
+                return None
+
+        model = self.session.model
+        if record is not None:
+            stats = get_model_stats(model)
+            with DIAGNOSTICS_LOCK:
+                record['model'] = stats
+        result = {'version': version, 'status': status, 'objective': None, 'optimal_team': None, 'gap': None,
+                  'players': []}
+        if has_usable_solution(model):
+            solution = model.getBestSol()
+            self.session.remember_solution(solution)
+            result['objective'] = model.getSolObjVal(solution)
+            result['gap'] = model.getGap()
+            result['players'] = get_selected_players(model, solution, self.session.player_vars)
+            with time_phase(record, 'get_bot_optimal_team'):
+                result['optimal_team'] = self.session.get_roster(result['players'])
+        return result
+
+
+def category_ids(column, ids, rows):
+    """ids of the column's values at the given row positions, -1 where a value has none"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Look the categories up once and index by code (-1, a missing value, picks the extra -1)
+        lookup = np.array([ids.get(category, -1) for category in column.cat.categories] + [-1])
+        return lookup[column.cat.codes.to_numpy()[rows]]
+    return column.iloc[rows].astype(object).map(ids).fillna(-1).to_numpy(dtype=int)
+
+
+class AuctionState:
+    """
+    Array-backed copy of the auction state the mutators and budget queries use.
+
+    Owner team, status, bid, salary, Z-score and draftable flag are NumPy arrays by row,
+    and every league team's committed salary, auction spending and position
+    counts are running totals, so a mutation or a budget query costs the same
+    whatever the pool size. Changed cells are queued in pending, and rows whose
+    bid was re-priced flagged in stale_bids, and both are written into the
+    players table, one assignment per column, when the table is next read.
+    """
+
+    __slots__ = ('index', 'teams', 'team_ids', 'owner', 'status', 'pos', 'cap_group', 'bid', 'salary',
+                 'z_score', 'draftable', 'committed', 'spending', 'counts', 'start_counts', 'minor_counts', 'pending',
+                 'stale_bids')
+
+    def __init__(self, players_df, teams):
+        self.index = players_df.index
+        self.teams = list(teams)
+        self.team_ids = {team: i for i, team in enumerate(self.teams)}
+        n_players, n_teams = len(players_df), len(self.teams)
+        self.owner = np.full(n_players, -1)
+        self.status = np.empty(n_players, dtype=object)
+        self.pos = np.full(n_players, -1)
+        self.cap_group = np.zeros(n_players, dtype=bool)
+        self.bid = np.zeros(n_players)
+        self.salary = np.zeros(n_players)
+        self.z_score = np.zeros(n_players)
+        self.draftable = np.zeros(n_players, dtype=bool)
+        self.committed = np.zeros(n_teams)
+        self.spending = np.zeros(n_teams)
+        self.counts = np.zeros((n_teams, len(POSITIONS)), dtype=int)
+        self.start_counts = np.zeros((n_teams, len(POSITIONS)), dtype=int)
+        self.minor_counts = np.zeros((n_teams, len(POSITIONS)), dtype=int)
+        # {player index: {column: value}} not yet written to the players table
+        self.pending = {}
+        # Rows whose re-priced bid is not yet written, allocated on the first re-pricing
+        self.stale_bids = None
+
+        rows = np.arange(n_players)
+        self.read(players_df, rows)
+        self.add_totals(rows, 1)
+
+    def read(self, players_df, rows):
+        """Load the tracked columns of the given row positions from players_df"""
+        self.owner[rows] = category_ids(players_df['FCHL TEAM'], self.team_ids, rows)
+        self.status[rows] = players_df['STATUS'].iloc[rows].to_numpy(dtype=object)
+        self.pos[rows] = category_ids(players_df['POS'], {pos: i for i, pos in enumerate(POSITIONS)}, rows)
+        self.cap_group[rows] = players_df['GROUP'].isin(['2', '3']).to_numpy()[rows]
+        self.bid[rows] = players_df['BID'].to_numpy(dtype=float)[rows]
+        self.salary[rows] = players_df['SALARY'].to_numpy(dtype=float)[rows]
+        if 'Z-score' in players_df.columns:
+            self.z_score[rows] = players_df['Z-score'].fillna(0).to_numpy(dtype=float)[rows]
+        if 'Draftable' in players_df.columns:
+            self.draftable[rows] = (players_df['Draftable'] == 'YES').to_numpy()[rows]
+
+    def add_totals(self, rows, sign):
+        """Add (sign 1) or remove (sign -1) the rows' contribution to their team's totals"""
+        rows = rows[self.owner[rows] >= 0]
+        team, pos, status = self.owner[rows], self.pos[rows], self.status[rows]
+        start = status == 'START'
+        minor = status == 'MINOR'
+        # START players and MINOR players in GROUP 2 or 3 count against the cap
+        counted = start | (minor & self.cap_group[rows])
+        np.add.at(self.committed, team, sign * np.where(counted, self.salary[rows], 0.0))
+        np.add.at(self.spending, team, sign * self.bid[rows])
+        has_pos = pos >= 0
+        np.add.at(self.counts, (team[has_pos], pos[has_pos]), sign)
+        np.add.at(self.start_counts, (team[has_pos & start], pos[has_pos & start]), sign)
+        np.add.at(self.minor_counts, (team[has_pos & minor], pos[has_pos & minor]), sign)
+
+    def set(self, player_index, values):
+        """Change one player's cells, keeping the team totals current and queueing the write"""
+        rows = np.array([self.index.get_loc(player_index)])
+        row = rows[0]
+        self.add_totals(rows, -1)
+        for column, value in values.items():
+            if column == 'FCHL TEAM':
+                self.owner[row] = self.team_ids.get(value, -1)
+            elif column == 'STATUS':
+                self.status[row] = value
+            elif column == 'BID':
+                self.bid[row] = value
+            elif column == 'SALARY':
+                self.salary[row] = value
+            elif column == 'Draftable':
+                self.draftable[row] = value == 'YES'
+        self.add_totals(rows, 1)
+        self.pending.setdefault(player_index, {}).update(values)
+
+    def set_bids(self, rows, bids):
+        """Re-price players no league team owns; their bids are not part of any team's totals"""
+        self.bid[rows] = bids
+        if self.stale_bids is None:
+            self.stale_bids = np.zeros(len(self.index), dtype=bool)
+        self.stale_bids[rows] = True
+
+    def refresh(self, players_df, player_indices):
+        """Re-read players that were changed in the table directly, such as by process_data"""
+        rows = self.index.get_indexer(player_indices)
+        self.add_totals(rows, -1)
+        self.read(players_df, rows)
+        self.add_totals(rows, 1)
+
+
 class FantasyAuction:
-    def __init__(self, csv_path=None, df=None):
+    def __init__(self, csv_path=None, df=None, config=None):
         self.csv_path = csv_path
+        self.config = DEFAULT_LEAGUE if config is None else config
+        # Array-backed state of the current table, built on first use
+        self.state = None
         if df is not None:
-            self.players_df = df.copy()
+            self.players_df = apply_player_schema(df)
         else:
-            self.players_df = self.load_data()
+            self.players_df = apply_player_schema(self.load_data())
+        self.solver_session = None
+        # Committed salary, draftable players and their Z total per position, from the last process_data
+        self.position_cache = {}
+        # Bumped on every change so derived results can be cached
+        self.data_version = 0
+        # AuctionLog every mutation is appended to, if any
+        self.event_log = None
+        # Time limit (seconds), relative gap limit and thread cap for PlayerSelection solves
+        self.solver_limits = {'time_limit': None, 'gap_limit': None, 'threads': None}
+        # Name of the SOLVER_BACKENDS entry solve_roster uses
+        self.solver_backend = 'knapsack'
+        # Best distinct BOT rosters and the data version and settings they were solved for
+        self.top_rosters = None
+        # Called with every improving incumbent during a solve
+        self.incumbent_callback = None
+        self.solve_info = None
+        # Ring buffer of per-phase timings and model metrics, newest last
+        self.diagnostics = deque(maxlen=DIAGNOSTICS_HISTORY)
+        self.recalc = None
+        # Market state the auction opened with, and one record per change of the live market
+        self.market_open = None
+        self.market_history = []
+
+    @property
+    def players_df(self):
+        """Players table, with the mutations still queued in the state kernel written in"""
+        state = self.state
+        if state is not None and (state.pending or state.stale_bids is not None):
+            pending, state.pending = state.pending, {}
+            stale_bids, state.stale_bids = state.stale_bids, None
+            self.write_columns(pending)
+            if stale_bids is not None:
+                # The bid array holds the latest bid of rows queued in pending as well
+                rows = np.flatnonzero(stale_bids)
+                write_changed(self._players_df, 'BID', rows, state.bid[rows])
+        return self._players_df
+
+    @players_df.setter
+    def players_df(self, players_df):
+        self._players_df = players_df
+        self.state = None
+
+    def get_state(self):
+        """Array-backed state of the current table"""
+        if self.state is None:
+            self.state = AuctionState(self._players_df, self.config.teams)
+        return self.state
+
+    def fork(self):
+        """
+        New auction on this one's table and valuation state.
+
+        With pandas copy-on-write enabled, as the app and the benchmarks do, the
+        new table is a view that copies each column only when first written, so
+        forks share every column they never change; otherwise it is a full copy.
+        """
+        players_df = self.players_df
+        if not pd.get_option("mode.copy_on_write"):
+            players_df = players_df.copy()
+        auction = FantasyAuction(df=players_df, config=self.config)
+        auction.position_cache = {pos: dict(cache) for pos, cache in self.position_cache.items()}
+        auction.data_version = self.data_version
+        auction.solver_limits = dict(self.solver_limits)
+        auction.solver_backend = self.solver_backend
+        auction.market_open = self.market_open
+        auction.market_history = list(self.market_history)
+        return auction
+
+    def begin_recalc(self):
+        """Start a new diagnostics record that later phases are timed into"""
+        self.recalc = new_recalc_record(self.data_version)
+        self.diagnostics.append(self.recalc)
+        return self.recalc
+
+    def get_diagnostics(self):
+        """Copies of the diagnostics records, oldest first, safe to read while a background solve times into them"""
+        with DIAGNOSTICS_LOCK:
+            return copy.deepcopy(list(self.diagnostics))
+
+    def export_diagnostics(self, path=None):
+        """Diagnostics records as JSON lines, also appended to path if given"""
+        lines = "".join(json.dumps(record) + "\n" for record in self.get_diagnostics())
+        if path is not None:
+            with open(path, 'a') as file:
+                file.write(lines)
+        return lines
+
+    def configure_solver(self, time_limit=None, gap_limit=None, threads=None, backend=None):
+        """Set the time, gap and thread limits used by later solves, and the backend of solve_roster"""
+        self.solver_limits = {'time_limit': time_limit, 'gap_limit': gap_limit, 'threads': threads}
+        if backend is not None:
+            if backend not in SOLVER_BACKENDS:
+                raise ValueError(f"Unknown solver backend: {backend}")
+            self.solver_backend = backend
 
     def load_data(self):
         if self.csv_path is None:
@@ -47,124 +1175,385 @@ class FantasyAuction:
             print(f"Error reading the CSV file: {e}")
             return pd.DataFrame()
 
+    @timed_phase('process_data', begins_recalc=True)
     def process_data(self):
         if self.players_df is None or self.players_df.empty:
             print("Error: No data loaded.")
             return None
-    
-        # Initialize the Draftable column to NO
-        self.players_df['Draftable'] = "NO"  
+
+        df = self.players_df
+        # Only the rows the cleaning changes are written; they are also re-read by the
+        # state kernel and logged for exact replay
+        missing_status = df.index[df['STATUS'].isna().to_numpy()]
+        free_agents = df.index[df['FCHL TEAM'].isin(['RFA', 'UFA', 'ENT'])]
+        paid_free_agents = free_agents[df.loc[free_agents, 'SALARY'].to_numpy() != 0]
+        cleaned = missing_status.append(paid_free_agents)
+
         # Fill missing values in the 'STATUS' column with 'NO'
-        self.players_df['STATUS'] = self.players_df['STATUS'].fillna('NO')
+        if len(missing_status):
+            df.loc[missing_status, 'STATUS'] = 'NO'
         # Set the salary of players with 'FCHL TEAM' as 'RFA', 'UFA', or 'ENT' to 0
-        self.players_df.loc[self.players_df['FCHL TEAM'].isin(['RFA', 'UFA', 'ENT']), 'SALARY'] = 0
-
-        total_pool = SALARY * TEAMS
-        # Calculate the sum of the salaries of players with 'STATUS' as 'START' or 'MINOR' and 'GROUP' as 2 or 3
-        committed_salary = self.players_df[
-            (self.players_df['STATUS'] == 'START') |
-            ((self.players_df['STATUS'] == 'MINOR') & (self.players_df['GROUP'].isin(['2', '3'])))
-        ]['SALARY'].sum()
+        if len(paid_free_agents):
+            df.loc[paid_free_agents, 'SALARY'] = 0
+
+        total_pool = self.config.salary * self.config.n_teams
+        previous_draftable = self.draftable_index()
+        previous_bids = df['BID'].to_numpy().copy()
+        player_count, total_z = self.calculate_z_scores()
+        # Sum of the salaries of players with 'STATUS' as 'START' or 'MINOR' and 'GROUP' as 2 or 3
+        committed_salary = sum(self.position_cache[pos]['committed'] for pos in sorted(self.position_cache))
         # Calculate the sum of the penalties
-        total_penalties = sum(PENALTIES.values())   
+        total_penalties = sum(self.config.penalties.values())   
         # Add the sum of the penalties to committed_salary
         committed_salary += total_penalties     
         available_to_spend = total_pool - committed_salary
-        player_count, total_z = self.calculate_z_scores()
         total_bid_sum, restrict, dollar_per_z = self.update_bids(player_count, total_z, available_to_spend)
+        if self.event_log is not None:
+            # Players leaving the draftable pool keep their last bid and Z-score, which
+            # depend on when recalculation ran, so they are logged for exact replay too
+            changed = cleaned.append(previous_draftable.difference(self.draftable_index())).unique()
+            if len(changed):
+                values = self.players_df.loc[changed, REPLAY_COLUMNS].astype(object)
+                self.record_event('revalue', rows=[list(row) for row in values.itertuples()])
+        if self.state is not None:
+            # Only the cleaned rows, the draftable pool and re-rounded bids were rewritten
+            rounded = df.index[df['BID'].to_numpy() != previous_bids]
+            self.state.refresh(self._players_df,
+                               cleaned.append(previous_draftable).append(self.draftable_index())
+                               .append(rounded).unique())
+        self.revalue_market()
+        self.data_version += 1
+        self.recalc['data_version'] = self.data_version
         return total_pool, committed_salary, available_to_spend, player_count, total_z, total_bid_sum, restrict, dollar_per_z
 
-    def calculate_z_scores(self):
-        grouped_players = self.players_df.groupby('POS')
+    def record_event(self, event_type, **fields):
+        """Append a mutation to the event log so the draft can be restored later"""
+        if self.event_log is not None:
+            self.event_log.record(self, event_type, fields)
 
-        F_baseline = FORWARD * TEAMS
-        D_baseline = DEFENCE * TEAMS
-        G_baseline = GOALIE * TEAMS
+    def draftable_index(self):
+        """Index of every player currently priced from their Z-score"""
+        return self.players_df.index[:0].append([cache['draftable'] for cache in self.position_cache.values()])
 
-        player_count = 0  # Initialize the counter
-        total_z = 0 
-
-        # Loop over each player group to perform calculations
-        for pos, group in grouped_players:
-            # Sort the group by points in descending order, and filter out 'MINOR' players
-            group = group[group['STATUS'] != 'MINOR'].sort_values('PTS', ascending=False)
-
-            if pos == 'F':
-                baseline = F_baseline
-            elif pos == 'D':
-                baseline = D_baseline
-            elif pos == 'G':
-                baseline = G_baseline
-            else:
-                continue
+    @timed_phase('calculate_z_scores')
+    def calculate_z_scores(self):
+        """
+        Value every position group and rebuild position_cache.
 
-            # Slice the DataFrame first, then apply the boolean condition
-            below_baseline_slice = group.iloc[baseline:]
-            below_baseline_start_players = below_baseline_slice[below_baseline_slice['STATUS'] == 'START']
-            count_below_baseline_start = below_baseline_start_players.shape[0]
+        Every group is ranked and valued in one pass over the POS, PTS, STATUS
+        and FCHL TEAM arrays: players are sorted once by (POS, PTS), ranked
+        within their position by a groupby cumcount, and the Z-score
+        statistics come from built-in group-wise transforms over the
+        draftable players only.
+        """
+        df = self.players_df
+        self.position_cache = {}
 
-            # Adjust the baseline
-            adjusted_baseline = baseline - count_below_baseline_start
-            
-            # Select the top players using the adjusted baseline
-            top_players = group.head(adjusted_baseline)
+        # Work on the few columns involved, positionally, rather than slicing the whole table
+        pos_column = df['POS']
+        categories = list(pos_column.cat.categories)
+        row_codes = pos_column.cat.codes.to_numpy()
+        # Categorical comparisons work on the codes, so no object arrays are materialized
+        start = (df['STATUS'] == 'START').to_numpy()
+        minor = (df['STATUS'] == 'MINOR').to_numpy()
 
-            # Filter out players with 'FCHL TEAM' as 'ENT', 'RFA', or 'UFA'
-            filtered_top_players = top_players[top_players['FCHL TEAM'].isin(['ENT', 'RFA', 'UFA'])]
+        # Salary committed per position: 'START' players and 'MINOR' players in 'GROUP' 2 or 3
+        counted = np.flatnonzero(start | (minor & df['GROUP'].isin(['2', '3']).to_numpy()))
+        committed = df['SALARY'].iloc[counted].groupby(pos_column.iloc[counted], observed=True).sum()
 
-            # Use .loc to update the Draftable column in self.players_df for filtered_top_players
-            draftable_indices = filtered_top_players.index
-            self.players_df.loc[draftable_indices, 'Draftable'] = "YES"
+        # Rank the non-MINOR players of each position by points, best first; players tied
+        # on points keep their table order
+        eligible = pd.DataFrame({'code': row_codes, 'pts': df['PTS'].to_numpy()}).iloc[np.flatnonzero(~minor)]
+        eligible = eligible.sort_values(['code', 'pts'], ascending=[True, False], kind='stable')
+        ranked = eligible.index.to_numpy()
+        codes = eligible['code'].to_numpy()
+        rank = eligible.groupby('code').cumcount().to_numpy()
+        group_size = np.bincount(codes, minlength=len(categories))
 
-            # Update the counter with the number of rows in filtered_top_players
-            player_count += len(filtered_top_players)
+        # The baseline is the number of starters the league rosters at the position,
+        # less the START players ranked below it; other positions have no draftable players
+        requirements = self.config.position_requirements
+        baseline = np.array([requirements.get(pos, 0) * self.config.n_teams for pos in categories], dtype=int)
+        valued = np.array([pos in requirements for pos in categories], dtype=bool)
+        below = (rank >= baseline[codes]) & start[ranked]
+        adjusted = baseline - np.bincount(codes[below], minlength=len(categories))
+        # A negative head(n) keeps all but the last n players, as the per-group slicing did
+        limit = np.where(adjusted >= 0, adjusted, np.maximum(group_size + adjusted, 0))
+        top = valued[codes] & (rank < limit[codes])
 
-            # Calculate Z-scores for filtered top players
-            points = filtered_top_players['PTS']
-            if len(points) > 0:
-                mean_pts = points.mean()
-                stdev_pts = points.std()
+        # Draftable players are the top players still in the free agent pool
+        free_agent = df['FCHL TEAM'].isin(['ENT', 'RFA', 'UFA']).to_numpy()
+        is_draftable = top & free_agent[ranked]
+        draftable_rows = ranked[is_draftable]
+        draftable_index = df.index[draftable_rows]
+        draftable = np.zeros(len(df), dtype=bool)
+        draftable[draftable_rows] = True
+        if 'Draftable' in df.columns and isinstance(df['Draftable'].dtype, pd.CategoricalDtype):
+            # Only players entering or leaving the pool are written
+            flipped = np.flatnonzero((df['Draftable'] == "YES").to_numpy() != draftable)
+            if len(flipped):
+                df.loc[df.index[flipped], 'Draftable'] = np.where(draftable[flipped], "YES", "NO")
+        else:
+            df['Draftable'] = pd.Categorical(
+                np.where(draftable, "YES", "NO"), categories=PLAYER_CATEGORIES['Draftable']
+            )
 
-                if stdev_pts == 0 or pd.isna(stdev_pts):
-                    stdev_pts = 1  # Avoid division by zero
+        # Z-scores of the draftable players within their position, shifted so the minimum is 0
+        draftable_pts = df['PTS'].iloc[draftable_rows]
+        draftable_pos = pos_column.iloc[draftable_rows]
+        by_pos = draftable_pts.groupby(draftable_pos, observed=True)
+        stdev = by_pos.transform('std')
+        stdev = stdev.where((stdev != 0) & stdev.notna(), 1)  # Avoid division by zero
+        z_scores = (draftable_pts - by_pos.transform('mean')) / stdev
+        z_scores -= z_scores.groupby(draftable_pos, observed=True).transform('min')
+        if len(z_scores):
+            if 'Z-score' in df.columns:
+                write_changed(df, 'Z-score', draftable_rows, z_scores.round(2).to_numpy())
+            else:
+                df.loc[draftable_index, 'Z-score'] = z_scores.round(2)
+        total_z = z_scores.groupby(draftable_pos, observed=True).sum()
 
-                # Calculate and assign Z-scores directly in the DataFrame
-                z_scores = (points - mean_pts) / stdev_pts
-                z_scores -= z_scores.min()  # Standardize Z-scores so the minimum is 0
+        draftable_codes = codes[is_draftable]
+        for code in np.unique(row_codes):
+            pos = categories[code]
+            self.position_cache[pos] = {
+                'committed': committed.get(pos, 0.0),
+                'player_count': int((draftable_codes == code).sum()),
+                'total_z': total_z.get(pos, 0),
+                'draftable': draftable_index[draftable_codes == code],
+            }
 
-                self.players_df.loc[draftable_indices, 'Z-score'] = z_scores.round(2)
-                total_z += z_scores.sum()
+        player_count = 0  # Initialize the counter
+        total_z = 0 
+        for pos in sorted(self.position_cache):
+            player_count += self.position_cache[pos]['player_count']
+            total_z += self.position_cache[pos]['total_z']
 
         return player_count, total_z
     
+    @timed_phase('build_model')
     def build_model(self):
         self.model = Model("PlayerSelection")
-        self.player_vars = {}
-
-        # Filter players based on specific criteria and remove players with Bid = 0
-        self.filtered_df = self.players_df[
-            ((self.players_df['FCHL TEAM'].isin(['ENT', 'UFA', 'RFA'])) & (self.players_df['BID'] > 0)) |
-            ((self.players_df['FCHL TEAM'] == 'BOT') & (self.players_df['STATUS'] == 'START'))
-        ]
 
-        for i, row in self.filtered_df.iterrows():
-            player_name = row['PLAYER']
-            player_position = row['POS']
-            self.player_vars[i] = self.model.addVar(vtype="B", name=f"{player_name}_{player_position}")
+        self.filtered_df = get_model_players(self.players_df)
+        self.model_arrays = get_model_arrays(self.filtered_df)
+        self.roster_limits = self.get_roster_limits()
 
-        self.model.setObjective(
-            sum(row['PTS'] * self.player_vars[i] for i, row in self.filtered_df.iterrows()),
-            "maximize"
-        )
+        names = (self.filtered_df['PLAYER'] + '_' + self.filtered_df['POS'].astype(str)).tolist()
+        variables = add_model_variables(self.model, self.model_arrays, names)
+        self.player_vars = dict(zip(self.filtered_df.index, variables))
 
         self.add_constraints(self.player_vars)
+        add_incumbent_reporter(self.model, self.player_vars, self.incumbent_callback)
+        set_solver_limits(self.model, **self.solver_limits)
+
+    def reoptimize(self):
+        """Re-solve the BOT model in the persistent solver session instead of rebuilding it"""
+        if self.solver_session is None:
+            self.solver_session = SolverSession(self.config)
+
+        session = self.solver_session
+        if self.recalc is None:
+            self.begin_recalc()
+        with time_phase(self.recalc, 'build_model'):
+            session.sync(self.players_df, self.get_roster_limits())
+        session.reporter.callback = self.incumbent_callback
+        set_solver_limits(session.model, **self.solver_limits)
+        self.model = session.model
+        self.player_vars = session.player_vars
+        self.filtered_df = session.filtered_df
+
+        solution = self.solve_model()
+        if solution is not None:
+            session.remember_solution(solution)
+        return solution
+
+    def solve_roster(self):
+        """BOT's optimal roster from the configured solver backend, without keeping a model"""
+        if self.recalc is None:
+            self.begin_recalc()
+        result = solve_roster(self.players_df, self.get_roster_limits(), self.solver_backend, self.solver_limits,
+                              self.config.own_team, self.recalc)
+        self.recalc['status'] = result['status']
+        return result
+
+    def get_top_rosters(self, k=TOP_ROSTERS, min_changes=1):
+        """
+        BOT's k best distinct rosters, best first, solved once per data version.
+
+        Each has its objective and its free agents with the costs they were
+        planned at; min_changes is how many players every roster must differ
+        by from each better one.
+        """
+        settings = (k, min_changes)
+        if self.top_rosters is None or (self.top_rosters['version'], self.top_rosters['settings']) != \
+                (self.data_version, settings):
+            if self.recalc is None:
+                self.begin_recalc()
+            with time_phase(self.recalc, 'top_rosters'):
+                filtered_df = get_model_players(self.players_df)
+                rosters = enumerate_rosters(get_model_arrays(filtered_df), self.get_roster_limits(), k, min_changes,
+                                            self.solver_limits)
+            for roster in rosters:
+                roster['players'] = filtered_df.index[roster['players']].tolist()
+            self.top_rosters = {'version': self.data_version, 'settings': settings, 'rosters': rosters}
+        return self.top_rosters['rosters']
+
+    def get_fallback_rosters(self):
+        """The last top rosters that can still be completed after the changes since, without solving"""
+        if self.top_rosters is None:
+            return []
+        return feasible_rosters(self.top_rosters['rosters'], self.players_df, self.get_roster_limits(),
+                                self.config.own_team)
+
+    def get_roster_team(self, roster):
+        """Team table of a top or fallback roster, BOT's starters included"""
+        starters = get_own_starters(self.players_df, self.config.own_team).index.tolist()
+        return get_optimal_team(self.players_df, starters + roster['players'])
+
+    def get_scenario_arrays(self, overrides=()):
+        """Model arrays for the current pool plus any players named in the overrides"""
+        referenced = set()
+        for override in overrides:
+            referenced.update(override.get('prices', {}))
+            referenced.update(override.get('force_in', []))
+            # Forcing out a player already off the market, such as a rostered one, leaves them unavailable
+            referenced.update(override.get('force_out', []))
+
+        filtered_df = get_model_players(self.players_df)
+        extra = [idx for idx in referenced if idx not in filtered_df.index]
+        scenario_df = pd.concat([filtered_df, self.players_df.loc[extra]])
+
+        arrays = get_model_arrays(scenario_df)
+        arrays['index'] = scenario_df.index.to_numpy()
+        arrays['salary'] = scenario_df['SALARY'].to_numpy(dtype=float)
+        # Players outside the pool can only be picked in scenarios that price or force them in
+        arrays['available'] = np.arange(len(scenario_df)) < len(filtered_df)
+        return arrays
+
+    def solve_scenarios(self, overrides, max_workers=None):
+        """
+        Solve the BOT roster for many what-if overrides in parallel.
+
+        Each worker process receives one read-only copy of the player arrays
+        and builds its own SCIP model per scenario. Returns one result dict per
+        override, in the same order.
+        """
+        arrays = self.get_scenario_arrays(overrides)
+        limits = self.get_roster_limits()
+        if max_workers == 1 or len(overrides) <= 1:
+            return [solve_scenario(arrays, override, limits) for override in overrides]
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_scenario_worker,
+                                 initargs=(arrays, limits)) as executor:
+            return list(executor.map(_solve_scenario_in_worker, overrides))
+
+    def price_scenarios(self, player_index, prices, max_workers=None):
+        """Optimal BOT roster if the player is bought at each of the candidate prices"""
+        overrides = [{'prices': {player_index: price}, 'force_in': [player_index]} for price in prices]
+        return self.solve_scenarios(overrides, max_workers)
+
+    def max_bid(self, player_index, step=0.1, max_price=None):
+        """
+        Highest price at which the player still belongs in BOT's optimal roster.
+
+        One model is built with the player's cap coefficient as the only thing
+        that changes between solves; prices are bisected on a grid of step.
+        The player belongs at a price when forcing them in scores at least as
+        well as the best roster without them. Prices keep as many decimals as
+        step has. Raises ValueError for a player already on BOT's roster,
+        whose salary the cap has counted.
+        """
+        if self.players_df.at[player_index, 'FCHL TEAM'] == self.config.own_team:
+            raise ValueError(f"Player {player_index} is already on {self.config.own_team}'s roster")
+        decimals = max(-Decimal(str(step)).normalize().as_tuple().exponent, 0)
+        limits = self.get_roster_limits()
+        if max_price is None:
+            # No price above what is left of the cap can fit
+            max_price = max(limits['cap'], 0.0)
+        arrays = self.get_scenario_arrays([{'force_in': [player_index]}])
+        i = arrays['index'].tolist().index(player_index)
+        salary = arrays['salary'][i]
+
+        model = Model("PlayerSelection")
+        model.hideOutput()
+        variables = add_model_variables(model, arrays)
+        for j in np.flatnonzero(~arrays['available']):
+            if j != i:
+                model.chgVarUb(variables[j], 0)
+        constraints = add_model_constraints(model, variables, arrays, limits)
+        var = variables[i]
+
+        def solve():
+            model.optimize()
+            objective = model.getObjVal() if model.getNSols() > 0 else None
+            model.freeTransform()
+            return objective
+
+        # Best roster without the player is the bar every price has to clear
+        model.chgVarLb(var, 0)
+        model.chgVarUb(var, 0)
+        objective_without = solve()
+
+        model.chgVarUb(var, 1)
+        model.chgVarLb(var, 1)
+        evaluations = {}
+
+        def evaluate(k):
+            if k not in evaluations:
+                price = round(k * step, decimals)
+                model.chgCoefLinear(constraints['cap'], var, salary + price)
+                evaluations[k] = solve()
+            objective = evaluations[k]
+            return objective is not None and (objective_without is None or objective >= objective_without - 1e-6)
+
+        # Bisect for the last grid price where the player is still worth buying
+        lo, hi = 0, int(np.floor(max_price / step + 1e-9))
+        max_bid = None
+        if evaluate(lo):
+            if evaluate(hi):
+                lo = hi
+            else:
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if evaluate(mid):
+                        lo = mid
+                    else:
+                        hi = mid
+            max_bid = round(lo * step, decimals)
+
+        evaluations_df = pd.DataFrame([
+            {
+                'PRICE': round(k * step, decimals),
+                'OBJECTIVE': objective,
+                'LOSS': None if objective is None or objective_without is None else objective_without - objective,
+            }
+            for k, objective in sorted(evaluations.items())
+        ])
+        return {
+            'player_index': player_index,
+            'max_bid': max_bid,
+            'objective_without': objective_without,
+            'evaluations': evaluations_df,
+        }
 
     def solve_model(self):
+        if self.recalc is None:
+            self.begin_recalc()
         try:
-            self.model.optimize()
-            status = self.model.getStatus()
+            with time_phase(self.recalc, 'optimize'):
+                self.model.optimize()
+            self.solve_info = get_solve_info(self.model)
+            status = self.solve_info['status']
+            self.recalc['status'] = status
+            self.recalc['model'] = get_model_stats(self.model)
             if status == "optimal":
                 return self.get_solution()
+            elif has_usable_solution(self.model):
+                # Stopped by a limit: hand back the best roster found so far
+                print(f"Warning: Optimization hit the {status[:-5]} limit. "
+                      f"Returning the best solution found, gap {self.solve_info['gap']:.2%}.")
+                return self.get_solution()
             elif status == "timelimit":
                 print("Warning: Optimization hit the time limit.")
             else:
@@ -177,108 +1566,166 @@ class FantasyAuction:
             print(f"An unexpected error occurred during optimization: {e}")
             return None
 
+    @timed_phase('add_constraints')
     def add_constraints(self, player_vars):
         if self.filtered_df.empty:
             print("Error: No players to consider in the optimization.")
             return
 
-        # Identify players that must be included in the team
-        must_include_players = self.filtered_df.index[
-            (self.filtered_df['FCHL TEAM'] == 'BOT') & (self.filtered_df['STATUS'] == 'START')
-        ]
-
-        # Constraint 1: Sum of the "Bid" values must be under 56.8
-        self.model.addCons(
-            sum((row['SALARY'] + row['BID']) * player_vars[i] for i, row in self.filtered_df.iterrows()) <= SALARY
-        )
-
-        # Constraint 3: Must have X Players with F in their Pos Column
-        self.model.addCons(
-            sum(player_vars[i] for i, row in self.filtered_df.iterrows() if row['POS'] == 'F') == FORWARD
+        self.model_constraints = add_model_constraints(
+            self.model, list(player_vars.values()), self.model_arrays, self.roster_limits
         )
 
-        # Constraint 4: Must have X Players with D in their Pos Column
-        self.model.addCons(
-            sum(player_vars[i] for i, row in self.filtered_df.iterrows() if row['POS'] == 'D') == DEFENCE
-        )
-
-        # Constraint 5: Must have X Players with G in their Pos Column
-        self.model.addCons(
-            sum(player_vars[i] for i, row in self.filtered_df.iterrows() if row['POS'] == 'G') == GOALIE
-        )
-
-        # Constraint: Must include players from BOT team with status "start"
-        for i in must_include_players:
-            self.model.addCons(player_vars[i] == 1)
-
     def get_solution(self):
         best_solution = self.model.getBestSol()
         return best_solution
 
+    @timed_phase('update_bids')
     def update_bids(self, player_count, total_z, available_to_spend):
+        """Price draftable players from their Z-scores"""
         if total_z == 0:
             return 0, 0, 0
             
-        restrict = player_count * MIN_SALARY
+        restrict = player_count * self.config.min_salary
         dollar_per_z = (available_to_spend - restrict) / total_z
 
         # Initialize Z-score column if it doesn't exist
         if 'Z-score' not in self.players_df.columns:
             self.players_df['Z-score'] = 0
 
-        # Update bids for draftable players
-        mask = self.players_df['Draftable'] == 'YES'
-        self.players_df.loc[mask, 'BID'] = (self.players_df.loc[mask, 'Z-score'] * dollar_per_z) + MIN_SALARY
-        self.players_df['BID'] = self.players_df['BID'].round(1)
+        # Update bids for draftable players, writing only the bids that change
+        df = self.players_df
+        draftable = df.index.get_indexer(self.draftable_index())
+        bids = df['BID'].to_numpy(dtype=float).copy()
+        bids[draftable] = df['Z-score'].to_numpy(dtype=float)[draftable] * dollar_per_z + self.config.min_salary
+        write_changed(df, 'BID', np.arange(len(df)), bids.round(1))
 
         total_bid_sum = self.players_df['BID'].sum()
         return total_bid_sum, restrict, dollar_per_z
 
+    @timed_phase('revalue_market')
+    def revalue_market(self):
+        """
+        Re-price the unsold draftable players from the live market.
+
+        The money still available is what the teams with open roster slots
+        have left, spread over the remaining Z supply like in update_bids.
+        Each position's Z is weighted by its scarcity, the change since the
+        auction opened in open slots league-wide per unsold draftable player,
+        so the bids still add up to the money available and the opening bids
+        are the ones update_bids set. Only reads the state kernel's running
+        totals, so it is cheap enough to run after every sale. Returns the
+        market record, which replaces the last one of market_history while no
+        money or roster slot has changed hands since.
+        """
+        state = self.get_state()
+        teams = [state.team_ids[team] for team in self.config.teams]
+        requirements = np.array([self.config.position_requirements[pos] for pos in POSITIONS])
+        open_slots = np.maximum(requirements - state.start_counts[teams], 0)
+        penalties = np.array([team_info['penalty'] for team_info in self.config.teams.values()])
+        remaining = self.config.salary - state.committed[teams] - state.spending[teams] - penalties
+        # Money of teams whose rosters are full is out of the market
+        money = float(remaining[open_slots.sum(axis=1) > 0].sum())
+
+        draftable = state.draftable & (state.pos >= 0)
+        rows = np.flatnonzero(draftable & (state.owner < 0))
+        sold = np.flatnonzero(draftable & (state.owner >= 0))
+        pos, z_score = state.pos[rows], state.z_score[rows]
+        supply = np.bincount(pos, minlength=len(POSITIONS))
+        # Z totals of the last valuation, less the players sold since
+        sold_z = np.bincount(state.pos[sold], weights=state.z_score[sold], minlength=len(POSITIONS))
+        supply_z = {p: self.position_cache[p]['total_z'] - sold_z[i] if p in self.position_cache else 0.0
+                    for i, p in enumerate(POSITIONS)}
+        demand = open_slots.sum(axis=0)
+        ratio = np.divide(demand, supply, out=np.ones(len(POSITIONS)), where=supply > 0)
+
+        opening = self.market_open
+        if opening is None:
+            opening = {'ratio': ratio, 'z_score': pd.Series(z_score, index=state.index[rows])}
+        scarcity = np.divide(ratio, opening['ratio'], out=np.ones(len(POSITIONS)), where=opening['ratio'] > 0)
+
+        # Summed in position_cache order, like the totals update_bids prices from
+        weighted_z = sum(scarcity[POSITIONS.index(p)] * supply_z[p] for p in sorted(supply_z))
+        restrict = len(rows) * self.config.min_salary
+        dollar_per_z = max(money - restrict, 0.0) / weighted_z if weighted_z > 0 else 0.0
+        if len(rows):
+            bids = np.round(z_score * (dollar_per_z * scarcity[pos]) + self.config.min_salary, 1)
+            changed = bids != state.bid[rows]
+            if changed.any():
+                state.set_bids(rows[changed], bids[changed])
+                self.data_version += 1
+
+        # Inflation is the money left per opening Z of the remaining players, relative to
+        # the auction's opening; Z-scores are re-standardized on the remaining pool every
+        # valuation, so players are measured by their opening Z where they had one
+        opening_z = opening['z_score'].reindex(state.index[rows]).fillna(pd.Series(z_score, index=state.index[rows]))
+        value_per_z = max(money - restrict, 0.0) / float(opening_z.sum()) if opening_z.sum() > 0 else 0.0
+        if self.market_open is None:
+            opening['value_per_z'] = value_per_z
+            self.market_open = opening
+        record = {
+            'time': time.time(),
+            'data_version': self.data_version,
+            'money': round(money, 2),
+            'open_slots': int(demand.sum()),
+            'supply': len(rows),
+            'supply_z': round(float(sum(supply_z.values())), 2),
+            'dollar_per_z': float(dollar_per_z),
+            'inflation': value_per_z / opening['value_per_z'] if opening['value_per_z'] > 0 else 1.0,
+            **{f'scarcity_{p}': float(scarcity[i]) for i, p in enumerate(POSITIONS)},
+        }
+        if self.market_history and all(record[key] == self.market_history[-1][key]
+                                       for key in ('money', 'open_slots', 'supply')):
+            self.market_history[-1] = record
+        else:
+            self.market_history.append(record)
+        return record
+
     def get_team_budgets(self):
         """Calculate current budget status for each team"""
+        # Running totals of the state kernel, so this does not scan the players table
+        state = self.get_state()
         team_budgets = {}
-        
-        for team_code, team_info in teams_data.items():
-            team_name = team_info['name']
+        for team_code, team_info in self.config.teams.items():
+            team = state.team_ids[team_code]
             penalty = team_info['penalty']
-            
-            # Get players for this team
-            team_players = self.players_df[self.players_df['FCHL TEAM'] == team_code]
-            
-            # Calculate committed salary (existing contracts)
-            # Group A-G MINOR players don't count against salary cap
-            committed_salary = team_players[
-                (team_players['STATUS'] == 'START') | 
-                ((team_players['STATUS'] == 'MINOR') & (team_players['GROUP'].isin(['2', '3'])))
-            ]['SALARY'].sum()
-            
-            # Calculate auction spending (new acquisitions)
-            auction_spending = team_players[
-                team_players['FCHL TEAM'] == team_code
-            ]['BID'].sum()
-            
-            total_spent = committed_salary + auction_spending + penalty
-            remaining = SALARY - total_spent
-            
-            # Count players by position
-            f_count = len(team_players[team_players['POS'] == 'F'])
-            d_count = len(team_players[team_players['POS'] == 'D'])
-            g_count = len(team_players[team_players['POS'] == 'G'])
-            
+            total_spent = state.committed[team] + state.spending[team] + penalty
+
             team_budgets[team_code] = {
-                'name': team_name,
-                'committed_salary': committed_salary,
-                'auction_spending': auction_spending,
+                'name': team_info['name'],
+                'committed_salary': float(state.committed[team]),
+                'auction_spending': float(state.spending[team]),
                 'penalty': penalty,
-                'total_spent': total_spent,
-                'remaining': remaining,
-                'f_count': f_count,
-                'd_count': d_count,
-                'g_count': g_count
+                'total_spent': float(total_spent),
+                'remaining': float(self.config.salary - total_spent),
+                'f_count': int(state.counts[team, 0]),
+                'd_count': int(state.counts[team, 1]),
+                'g_count': int(state.counts[team, 2])
             }
-            
+
         return team_budgets
 
+    def get_roster_limits(self, team_code=None):
+        """
+        What a team's START players leave for the auction to fill, BOT's by default.
+
+        cap is the team's remaining budget from get_team_budgets, net of
+        committed salary (MINOR players in GROUP 2 or 3 included), auction
+        spending and penalty; slots are the START slots still open at each
+        position, and points those the START players already score.
+        """
+        team_code = self.config.own_team if team_code is None else team_code
+        state = self.get_state()
+        team = state.team_ids[team_code]
+        requirements = self.config.position_requirements
+        return {
+            'cap': float(self.config.salary - state.committed[team] - state.spending[team]
+                         - self.config.teams[team_code]['penalty']),
+            'slots': {pos: max(requirements[pos] - int(state.start_counts[team, i]), 0)
+                      for i, pos in enumerate(POSITIONS)},
+            'points': float(get_own_starters(self.players_df, team_code)['PTS'].sum()),
+        }
+
     def get_team_roster(self, team_code):
         """Get detailed roster for a specific team"""
         team_players = self.players_df[self.players_df['FCHL TEAM'] == team_code].copy()
@@ -294,6 +1741,7 @@ class FantasyAuction:
         
         return team_players
 
+    @timed_phase('get_bot_optimal_team')
     def get_bot_optimal_team(self):
         """Get the optimal team construction for BOT (Bridlewood AI)"""
         if not hasattr(self, 'model') or not hasattr(self, 'player_vars'):
@@ -303,43 +1751,60 @@ class FantasyAuction:
             solution = self.get_solution()
             if solution is None:
                 return None
-                
-            optimal_players = []
-            for i, row in self.filtered_df.iterrows():
-                if self.model.getSolVal(solution, self.player_vars[i]) > 0.5:
-                    optimal_players.append({
-                        'PLAYER': row['PLAYER'],
-                        'POS': row['POS'],
-                        'PTS': row['PTS'],
-                        'SALARY': row['SALARY'],
-                        'BID': row['BID'],
-                        'TOTAL_COST': row['SALARY'] + row['BID'],
-                        'FCHL TEAM': row['FCHL TEAM'],
-                        'STATUS': row['STATUS'],
-                        'GROUP': row['GROUP']
-                    })
-            
-            return pd.DataFrame(optimal_players)
+            starters = get_own_starters(self.players_df, self.config.own_team).index.tolist()
+            return get_optimal_team(
+                self.players_df, starters + get_selected_players(self.model, solution, self.player_vars)
+            )
         except:
             return None
 
+    def write_players(self, values_by_player):
+        """Apply {player index: {column: value}} through the state kernel, marking the table changed"""
+        state = self.get_state()
+        for player_index, values in values_by_player.items():
+            state.set(player_index, values)
+        if values_by_player:
+            self.data_version += 1
+
+    def write_columns(self, values_by_player):
+        """Write {player index: {column: value}} into the players table with one assignment per column"""
+        columns = {}
+        for player_index, values in values_by_player.items():
+            for column, value in values.items():
+                columns.setdefault(column, {})[player_index] = value
+
+        df = self._players_df
+        for column, values in columns.items():
+            dtype = df[column].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                new = {value for value in values.values() if not pd.isna(value)} - set(dtype.categories)
+                if new:
+                    df[column] = df[column].cat.add_categories(sorted(new))
+            df.loc[list(values), column] = list(values.values())
+
     def update_player_status(self, player_index, new_status):
         """Update a player's status"""
-        self.players_df.loc[player_index, 'STATUS'] = new_status
+        self.get_state().set(player_index, {'STATUS': new_status})
+        self.data_version += 1
+        self.record_event('status', player=player_index, status=new_status)
 
     def update_player_salary(self, player_index, new_salary):
         """Update a player's salary"""
-        self.players_df.loc[player_index, 'SALARY'] = new_salary
+        self.get_state().set(player_index, {'SALARY': new_salary})
+        self.data_version += 1
+        self.record_event('salary', player=player_index, salary=new_salary)
 
     def update_player_bid(self, player_index, new_bid):
         """Update a player's bid"""
-        self.players_df.loc[player_index, 'BID'] = new_bid
+        self.get_state().set(player_index, {'BID': new_bid})
+        self.data_version += 1
+        self.record_event('bid', player=player_index, bid=new_bid)
 
     def remove_player_from_team(self, player_index):
         """Remove a player from their current team and return to auction pool"""
-        self.players_df.loc[player_index, 'FCHL TEAM'] = 'UFA'
-        self.players_df.loc[player_index, 'STATUS'] = 'NO'
-        self.players_df.loc[player_index, 'BID'] = 0.0
+        self.get_state().set(player_index, {'FCHL TEAM': 'UFA', 'STATUS': 'NO', 'BID': 0.0})
+        self.data_version += 1
+        self.record_event('remove', player=player_index)
 
     def get_available_players(self):
         """Get players available for auction (UFA, RFA, ENT)"""
@@ -362,6 +1827,17 @@ class FantasyAuction:
 
     def get_team_composition(self, team_code):
         """Get detailed team composition with START/MINOR breakdown"""
+        state = self.get_state()
+        if team_code in state.team_ids:
+            team = state.team_ids[team_code]
+            composition = {}
+            for i, pos in enumerate(POSITIONS):
+                composition[f'total_{pos.lower()}'] = int(state.counts[team, i])
+                composition[f'start_{pos.lower()}'] = int(state.start_counts[team, i])
+                composition[f'minor_{pos.lower()}'] = int(state.minor_counts[team, i])
+            return composition
+
+        # Codes outside the league, such as UFA, are counted from the table
         team_players = self.players_df[self.players_df['FCHL TEAM'] == team_code]
         
         if team_players.empty:
@@ -382,9 +1858,9 @@ class FantasyAuction:
 
     def assign_player_to_team(self, player_index, team_code, auction_price):
         """Assign a player to a team with auction price"""
-        self.players_df.loc[player_index, 'FCHL TEAM'] = team_code
-        self.players_df.loc[player_index, 'BID'] = auction_price
-        self.players_df.loc[player_index, 'STATUS'] = 'START'
+        self.get_state().set(player_index, {'FCHL TEAM': team_code, 'BID': auction_price, 'STATUS': 'START'})
+        self.data_version += 1
+        self.record_event('assign', player=player_index, team=team_code, price=auction_price)
 
     def reset_to_baseline(self):
         """Reset all auction assignments to baseline state"""
@@ -396,3 +1872,84 @@ class FantasyAuction:
         
         # Reset any other auction-related changes
         self.players_df.loc[self.players_df['FCHL TEAM'].isin(['RFA', 'UFA', 'ENT']), 'BID'] = 0
+        self.state = None
+        self.market_open = None
+        self.market_history = []
+        self.top_rosters = None
+        self.data_version += 1
+        self.record_event('reset')
+
+
+class LeagueRegistry:
+    """
+    Independent auctions for many leagues served from one process.
+
+    Each players CSV is parsed and typed once per file content and kept
+    read-only. Each league's first process_data and BOT solve are also done
+    once, and every auction starts as a copy-on-write fork of that baseline,
+    so a league only pays memory for the columns its own assignments rewrite.
+    """
+
+    def __init__(self):
+        self.leagues = {}
+        # Keyed by file content hash
+        self.base_tables = {}
+        # Keyed by (league id, file content hash): processed auction and its optimal BOT team
+        self.baselines = {}
+        self.lock = threading.Lock()
+
+    def add_league(self, league_id, config, csv_path):
+        """Register a league and the players CSV its auctions start from"""
+        self.leagues[league_id] = (config, csv_path)
+
+    def add_leagues_from_json(self, path):
+        """
+        Register the leagues of a JSON file of {league id: settings}.
+
+        Each league's settings name its "teams" JSON and "players" CSV, relative
+        to the file, and any other LeagueConfig argument such as salary or
+        forward. The league id is its name unless one is given.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        with open(path, 'r') as file:
+            leagues = json.load(file)
+        for league_id, settings in leagues.items():
+            settings = dict(settings)
+            teams_path = os.path.join(directory, settings.pop('teams'))
+            csv_path = os.path.join(directory, settings.pop('players'))
+            settings.setdefault('name', league_id)
+            self.add_league(league_id, LeagueConfig.from_json(teams_path, **settings), csv_path)
+
+    def get_config(self, league_id):
+        return self.leagues[league_id][0]
+
+    def get_base_table(self, csv_path):
+        """Shared typed players table for the current content of csv_path, parsed on first use"""
+        content_hash = file_hash(csv_path)
+        with self.lock:
+            if content_hash not in self.base_tables:
+                self.base_tables[content_hash] = load_players_csv(csv_path)
+            return self.base_tables[content_hash]
+
+    def get_baseline(self, league_id):
+        """
+        Processed baseline auction of the league and its optimal BOT team (None if unsolved).
+
+        Built once per file content; sessions opening at the same time wait for
+        the first build instead of each repeating it.
+        """
+        config, csv_path = self.leagues[league_id]
+        key = (league_id, file_hash(csv_path))
+        with self.lock:
+            if key not in self.baselines:
+                if key[1] not in self.base_tables:
+                    self.base_tables[key[1]] = load_players_csv(csv_path)
+                auction = FantasyAuction(df=self.base_tables[key[1]], config=config)
+                auction.process_data()
+                optimal_team = auction.solve_roster()['optimal_team']
+                self.baselines[key] = (auction, optimal_team)
+            return self.baselines[key]
+
+    def create_auction(self, league_id):
+        """New auction for the league, forked from its processed baseline"""
+        return self.get_baseline(league_id)[0].fork()
@@ -0,0 +1,257 @@
+import time
+import numpy as np
+import pandas as pd
+from pyscipopt import Model, quicksum
+
+from fantasy_auction import POSITIONS, has_usable_solution, set_solver_limits
+from roster_knapsack import prune_dominated
+
+"""
+League-wide roster optimizer
+Predicts where every team's remaining money goes by giving each free agent to
+at most one team, subject to each team's remaining cap and open F/D/G slots.
+Every team values a player by the same points and pays the same price, so
+the total depends only on which players are taken: a pooled master problem
+picks them with the league's money and slots, and the pick is then packed
+into the teams. The joint team-by-player MIP is solved only when the
+packed pick is not close enough to the pooled bound.
+"""
+
+# Relative gap to the pooled bound at which a packed pick is accepted
+LEAGUE_GAP_LIMIT = 0.005
+# Seconds the joint MIP may search when the packed pick is not close enough
+LEAGUE_TIME_LIMIT = 2.0
+
+
+def build_league(auction):
+    """Arrays describing the free agents and every team's remaining cap and open roster slots"""
+    config = auction.config
+    df = auction.players_df
+    pool = df[df['FCHL TEAM'].isin(['ENT', 'UFA', 'RFA'])]
+
+    teams = list(config.teams)
+    budgets = auction.get_team_budgets()
+    state = auction.get_state()
+    requirements = np.array([config.position_requirements[pos] for pos in POSITIONS])
+    needs = np.maximum(requirements - state.start_counts[[state.team_ids[team] for team in teams]], 0)
+    budget = np.array([budgets[team]['remaining'] for team in teams], dtype=float)
+
+    # A team that cannot pay the minimum salary for every open slot only fills what it can afford,
+    # dropping forwards first since they are the deepest position
+    affordable = np.floor(np.maximum(budget, 0) / config.min_salary + 1e-9).astype(int)
+    for team in np.flatnonzero(needs.sum(axis=1) > affordable):
+        for i in range(len(POSITIONS)):
+            needs[team, i] -= min(needs[team, i], needs[team].sum() - affordable[team])
+
+    pos = pool['POS'].map({pos: i for i, pos in enumerate(POSITIONS)}).to_numpy(dtype=int)
+    return {
+        'index': pool.index.to_numpy(),
+        'pts': pool['PTS'].to_numpy(dtype=float),
+        # Players without a bid go for the minimum salary
+        'cost': np.maximum(pool['BID'].to_numpy(dtype=float), config.min_salary),
+        'pos': pos,
+        'teams': teams,
+        'budget': budget,
+        'needs': needs,
+        # Positions where the pool has a player for every open slot, so teams must fill them
+        'fillable': np.bincount(pos, minlength=len(POSITIONS)) >= needs.sum(axis=0),
+        'min_salary': config.min_salary,
+    }
+
+
+def fill_constraint(model, count, need, fillable):
+    """count == need at positions the pool can fill league-wide, else count <= need"""
+    return model.addCons(count == need if fillable else count <= need)
+
+
+def solve_pooled(league, candidates):
+    """
+    Players the league takes when all teams' money and slots are pooled, or None if nothing fits.
+
+    Any split of the players into teams is also a pooled pick, so its points
+    bound those of every league assignment.
+    """
+    pts, cost, pos = league['pts'][candidates], league['cost'][candidates], league['pos'][candidates]
+    bidding = league['needs'].sum(axis=1) > 0
+
+    model = Model("LeaguePool")
+    model.hideOutput()
+    variables = [model.addVar(vtype="B") for _ in candidates]
+    model.setObjective(quicksum(p * var for p, var in zip(pts.tolist(), variables)), "maximize")
+    model.addCons(quicksum(c * var for c, var in zip(cost.tolist(), variables)) <= league['budget'][bidding].sum())
+    for i in range(len(POSITIONS)):
+        count = quicksum(variables[j] for j in np.flatnonzero(pos == i))
+        fill_constraint(model, count, league['needs'][:, i].sum(), league['fillable'][i])
+    model.optimize()
+    if model.getNSols() == 0:
+        return None
+
+    solution = model.getBestSol()
+    return candidates[[j for j, var in enumerate(variables) if model.getSolVal(solution, var) > 0.5]]
+
+
+def pack_players(league, selected, candidates):
+    """
+    Split the pooled pick into teams; returns {player: team} and whether every required slot was filled.
+
+    Players go most expensive first to the team with an open slot at their
+    position that keeps the most money per open slot, always leaving the
+    minimum salary for its other slots. Players that no longer fit anywhere
+    are dropped, and the slots left open are refilled with the best remaining
+    candidates that fit.
+    """
+    budget = league['budget'].copy()
+    slots = league['needs'].copy()
+    cost, pos, min_salary = league['cost'], league['pos'], league['min_salary']
+    assignment = {}
+
+    def place(player):
+        spare = budget - cost[player] - min_salary * (slots.sum(axis=1) - 1)
+        eligible = np.flatnonzero((slots[:, pos[player]] > 0) & (spare >= -1e-9))
+        if len(eligible) == 0:
+            return
+        team = eligible[np.argmax(spare[eligible] / slots[eligible].sum(axis=1))]
+        assignment[int(player)] = int(team)
+        budget[team] -= cost[player]
+        slots[team, pos[player]] -= 1
+
+    for player in selected[np.argsort(-cost[selected], kind='stable')]:
+        place(player)
+    for player in candidates[np.argsort(-league['pts'][candidates], kind='stable')]:
+        if not slots.any():
+            break
+        if player not in assignment and slots[:, pos[player]].any():
+            place(player)
+    return assignment, not slots[:, league['fillable']].any()
+
+
+def solve_joint(league, candidates, starts=(), bound=None, limits=None):
+    """
+    Team-by-player MIP over the candidates; returns ({player: team}, model).
+
+    starts are {player: team} assignments offered to SCIP as starting
+    solutions, and bound caps the objective, such as at the pooled points.
+    """
+    pts, cost, pos = league['pts'][candidates], league['cost'][candidates], league['pos'][candidates]
+    needs, budget = league['needs'], league['budget']
+
+    model = Model("LeagueAssignment")
+    model.hideOutput()
+    set_solver_limits(model, **(limits or {}))
+    # Only teams with an open slot at the player's position get a variable
+    variables = {(j, team): model.addVar(vtype="B")
+                 for j in range(len(candidates)) for team in np.flatnonzero(needs[:, pos[j]] > 0).tolist()}
+    by_player = [[] for _ in candidates]
+    by_team = [[] for _ in league['teams']]
+    for (j, team), var in variables.items():
+        by_player[j].append(var)
+        by_team[team].append((j, var))
+
+    objective = quicksum(pts[j] * var for (j, _), var in variables.items())
+    model.setObjective(objective, "maximize")
+    if bound is not None:
+        model.addCons(objective <= bound)
+    for player_vars in by_player:
+        if player_vars:
+            model.addCons(quicksum(player_vars) <= 1)
+    for team, team_vars in enumerate(by_team):
+        if not team_vars:
+            continue
+        model.addCons(quicksum(cost[j] * var for j, var in team_vars) <= budget[team])
+        for i in range(len(POSITIONS)):
+            count = quicksum(var for j, var in team_vars if pos[j] == i)
+            fill_constraint(model, count, needs[team, i], league['fillable'][i])
+
+    position = {player: j for j, player in enumerate(candidates.tolist())}
+    for start in starts:
+        solution = model.createSol()
+        for player, team in start.items():
+            var = variables.get((position.get(player), team))
+            if var is not None:
+                model.setSolVal(solution, var, 1.0)
+        model.addSol(solution)
+
+    model.optimize()
+    if not has_usable_solution(model):
+        return None, model
+    solution = model.getBestSol()
+    return {int(candidates[j]): team for (j, team), var in variables.items()
+            if model.getSolVal(solution, var) > 0.5}, model
+
+
+def optimize_league(auction, previous=None, gap_limit=LEAGUE_GAP_LIMIT, time_limit=LEAGUE_TIME_LIMIT):
+    """
+    Predicted rosters of every team from the auction's current state.
+
+    The packed pooled pick is kept when it is within gap_limit of the pooled
+    bound; otherwise the joint MIP searches for up to time_limit seconds,
+    starting from it and from previous, an earlier result. Returns the
+    assignment, one row per player taken, with its gap to the bound.
+    """
+    start_time = time.perf_counter()
+    league = build_league(auction)
+    candidates = np.flatnonzero(
+        prune_dominated(league['pts'], league['cost'], league['pos'], league['needs'].sum(axis=0))
+    )
+
+    selected = solve_pooled(league, candidates)
+    bound = None if selected is None else float(league['pts'][selected].sum())
+    assignment, filled = ({}, False) if selected is None else pack_players(league, selected, candidates)
+    objective = float(league['pts'][list(assignment)].sum())
+    method = 'pooled pick + packing'
+
+    if not filled or bound is None or bound - objective > gap_limit * abs(bound):
+        starts = [assignment] if filled else []
+        if previous is not None:
+            # Players sold since then have no row any more and drop out of the start
+            row = {player: i for i, player in enumerate(league['index'].tolist())}
+            starts.append({row[player]: team for player, team in zip(previous['assignment']['player'].tolist(),
+                                                                     previous['assignment']['team_id'].tolist())
+                           if player in row})
+        joint, model = solve_joint(league, candidates, starts, bound,
+                                   {'time_limit': time_limit, 'gap_limit': gap_limit})
+        if joint is not None and float(league['pts'][list(joint)].sum()) >= objective:
+            assignment, filled = joint, True
+            objective = float(league['pts'][list(joint)].sum())
+            method = f"joint MIP ({model.getStatus()})"
+            if bound is None:
+                bound = model.getDualbound()
+
+    players = np.array(list(assignment), dtype=int)
+    teams = np.array(list(assignment.values()), dtype=int)
+    table = pd.DataFrame({
+        'player': league['index'][players],
+        'team_id': teams,
+        'team': np.array(league['teams'], dtype=object)[teams],
+        'POS': np.array(POSITIONS, dtype=object)[league['pos'][players]],
+        'PTS': league['pts'][players],
+        'price': league['cost'][players],
+    })
+    return {
+        'assignment': table,
+        'objective': objective,
+        'bound': bound,
+        'gap': None if not bound else (bound - objective) / abs(bound),
+        'complete': filled,
+        'method': method,
+        'free_agents': len(league['index']),
+        'candidates': len(candidates),
+        'time': time.perf_counter() - start_time,
+    }
+
+
+def summarize_league(auction, result):
+    """Per team: remaining cap, predicted spend and points, and players taken by position"""
+    budgets = auction.get_team_budgets()
+    assignment = result['assignment']
+    rows = []
+    for team in auction.config.teams:
+        taken = assignment[assignment['team'] == team]
+        rows.append({
+            'team': team,
+            'remaining': budgets[team]['remaining'],
+            'predicted_spend': round(float(taken['price'].sum()), 1),
+            'predicted_pts': float(taken['PTS'].sum()),
+            **{pos: int((taken['POS'] == pos).sum()) for pos in POSITIONS},
+        })
+    return pd.DataFrame(rows).set_index('team')
@@ -0,0 +1,128 @@
+import numpy as np
+
+"""
+Exact roster knapsack
+Picks the most points from exactly slots[p] players at every position p
+under a cap, with costs on a fixed grid. Positions only share the cap, so
+each one is a small dynamic program over player count and cost in grid
+steps, vectorized over the cap, and the positions are then combined cost
+by cost. No model is built, so a solve costs a few NumPy passes.
+"""
+
+# Step of the cost grid: bids and salaries are rounded to 0.1
+COST_GRID = 0.1
+
+
+def prune_dominated(pts, cost, pos, demand):
+    """
+    Mask of the players worth keeping in the model.
+
+    A player that at least demand[pos] others beat on points without costing
+    more is never needed: whichever roster takes them could take one of those
+    players instead, since not all of them can be taken.
+    """
+    keep = np.zeros(len(pts), dtype=bool)
+    for i in range(len(demand)):
+        rows = np.flatnonzero(pos == i)
+        if demand[i] == 0 or len(rows) == 0:
+            continue
+        # The demand[i] best players at the lowest cost dominate every player with fewer points,
+        # so only the players from there up need counting
+        cheapest = np.sort(pts[rows[cost[rows] == cost[rows].min()]])[::-1]
+        if len(cheapest) >= demand[i]:
+            rows = rows[pts[rows] >= cheapest[demand[i] - 1]]
+        # Best first; among equal points the cheaper player dominates
+        rows = rows[np.lexsort((cost[rows], -pts[rows]))]
+        costs = cost[rows]
+        # Dominating players are the earlier ones costing no more, counted through a sorted list
+        ranks = np.searchsorted(np.unique(costs), costs)
+        counts = np.zeros(len(np.unique(costs)) + 1, dtype=int)
+        for j, rank in enumerate(ranks.tolist()):
+            k, dominating = rank + 1, 0
+            while k > 0:
+                dominating += counts[k]
+                k -= k & -k
+            if dominating < demand[i]:
+                keep[rows[j]] = True
+            k = rank + 1
+            while k < len(counts):
+                counts[k] += 1
+                k += k & -k
+    return keep
+
+
+def best_by_cost(pts, cost, need, capacity):
+    """
+    Most points of exactly need players costing exactly c grid steps, for every c up to capacity.
+
+    Returns the points by cost, -inf where no roster costs exactly c, and
+    which states took each player, for reading a roster back.
+    """
+    best = np.full((need + 1, capacity + 1), -np.inf)
+    best[0, 0] = 0.0
+    took = np.zeros((len(pts), need + 1, capacity + 1), dtype=bool)
+    for i, (points, steps) in enumerate(zip(pts.tolist(), cost.tolist())):
+        if steps > capacity:
+            continue
+        # Rosters with one player fewer, as they stood before this player
+        taken = best[:-1, :capacity + 1 - steps] + points
+        better = taken > best[1:, steps:]
+        best[1:, steps:][better] = taken[better]
+        took[i, 1:, steps:] = better
+    return best[need], took
+
+
+def read_back(took, cost, need, spent):
+    """Players of the need-player roster best_by_cost priced at spent grid steps"""
+    players = []
+    for i in range(len(cost) - 1, -1, -1):
+        if need == 0:
+            break
+        if took[i, need, spent]:
+            players.append(i)
+            need -= 1
+            spent -= cost[i]
+    return players
+
+
+def solve_knapsack(pts, cost, pos, slots, capacity):
+    """
+    Row positions of the best roster's players, or None when no roster fits.
+
+    cost is in whole grid steps, pos each player's index into slots (-1 for
+    none) and capacity the cap in grid steps. Among rosters with the most
+    points the cheapest is returned.
+    """
+    if capacity < 0:
+        return None
+    keep = prune_dominated(pts, cost, pos, slots)
+
+    # Most points of the positions so far by exact total cost
+    total = np.full(capacity + 1, -np.inf)
+    total[0] = 0.0
+    parts = []
+    for i, need in enumerate(slots):
+        if need == 0:
+            continue
+        rows = np.flatnonzero(keep & (pos == i))
+        best, took = best_by_cost(pts[rows], cost[rows], need, capacity)
+        combined = np.full(capacity + 1, -np.inf)
+        # Cost spent on this position in the best combination at each total
+        split = np.zeros(capacity + 1, dtype=int)
+        for steps in np.flatnonzero(np.isfinite(best)).tolist():
+            candidate = total[:capacity + 1 - steps] + best[steps]
+            better = candidate > combined[steps:]
+            combined[steps:][better] = candidate[better]
+            split[steps:][better] = steps
+        total = combined
+        parts.append((rows, took, split, need))
+
+    if not np.isfinite(total).any():
+        return None
+    spent = int(np.argmax(total))
+    selected = []
+    for rows, took, split, need in reversed(parts):
+        steps = int(split[spent])
+        selected.extend(rows[read_back(took, cost[rows], need, steps)].tolist())
+        spent -= steps
+    return np.sort(np.array(selected, dtype=int))
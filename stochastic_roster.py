@@ -0,0 +1,273 @@
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from pyscipopt import Model, quicksum
+
+from fantasy_auction import (POSITIONS, KnapsackBackend, add_model_constraints, add_model_variables, get_model_arrays,
+                             get_model_players, get_optimal_team, get_own_starters, has_usable_solution,
+                             set_solver_limits)
+from roster_knapsack import COST_GRID, prune_dominated
+
+"""
+Stochastic BOT roster
+Plans BOT's roster against sampled prices and points instead of taking BID
+and PTS as certain. The part of each bid above the minimum salary, the part
+the Z-score model prices, is scaled by a market-wide and a per-player
+lognormal factor, and projected points by a per-player one, all with mean
+one. The roster must fit the remaining cap on average over its worst
+scenarios (a CVaR constraint), and maximizes either expected points or the
+average of its worst scenarios' points. A knapsack roster with risk-loaded
+costs gives a good start in milliseconds, which the scenario MIP then
+improves on within a time limit.
+"""
+
+# Scenarios drawn by default, and the most a solve takes on
+STOCHASTIC_SCENARIOS = 200
+MAX_SCENARIOS = 500
+# Share of the worst scenarios the CVaR tails average over
+CVAR_ALPHA = 0.2
+# Relative spread of a player's bid above the minimum salary, of the market-wide price level and of projected points
+PRICE_SD = 0.2
+MARKET_SD = 0.1
+POINTS_SD = 0.15
+# Seconds the scenario MIP may improve on the start, and the gap at which it stops
+STOCHASTIC_TIME_LIMIT = 2.0
+STOCHASTIC_GAP_LIMIT = 0.005
+# Scenarios drawn per seed, so the draws do not depend on the number of workers
+SCENARIO_CHUNK = 25
+# A candidate is out-ranked on points at no higher price by fewer than this many times the open slots
+CANDIDATE_DEPTH = 3
+# Stress test: the roster's priciest bids coming in this much high
+STRESS_PLAYERS = 2
+STRESS_OVERSHOOT = 0.2
+
+OBJECTIVES = {'mean': "Expected points", 'cvar': "Worst-case points (CVaR)"}
+
+
+def build_arrays(auction):
+    """Model arrays of the free agents that may enter a stochastic roster"""
+    pool = get_model_players(auction.players_df)
+    arrays = get_model_arrays(pool)
+    pos = pd.Categorical(arrays['pos'], categories=POSITIONS).codes
+    slots = auction.get_roster_limits()['slots']
+    # Noise does not keep one player dominating another, so a deeper pool than the knapsack's is kept
+    keep = prune_dominated(arrays['pts'], arrays['cost'], pos,
+                           [CANDIDATE_DEPTH * slots.get(p, 0) for p in POSITIONS])
+    pool = pool[keep]
+    arrays = {key: values[keep] for key, values in arrays.items()}
+    arrays['index'] = pool.index.to_numpy()
+    arrays['bid'] = pool['BID'].to_numpy(dtype=float)
+    # The Z-priced part of each bid, which the price noise scales
+    arrays['premium'] = np.maximum(arrays['bid'] - auction.config.min_salary, 0.0)
+    return arrays
+
+
+def draw_scenarios(arrays, seed, size, price_sd=PRICE_SD, market_sd=MARKET_SD, points_sd=POINTS_SD):
+    """size scenarios of every player's cost and points, each row one scenario"""
+    rng = np.random.default_rng(seed)
+    n = len(arrays['pts'])
+    # Lognormal factors with mean one
+    market = rng.normal(-market_sd ** 2 / 2, market_sd, (size, 1))
+    price = rng.normal(-price_sd ** 2 / 2, price_sd, (size, n))
+    points = rng.normal(-points_sd ** 2 / 2, points_sd, (size, n))
+    return {
+        'cost': arrays['cost'] - arrays['premium'] + arrays['premium'] * np.exp(market + price),
+        'pts': arrays['pts'] * np.exp(points),
+    }
+
+
+def generate_scenarios(arrays, n_scenarios, seed=0, max_workers=None, **noise):
+    """
+    n_scenarios scenarios of costs and points, drawn in chunks across threads.
+
+    Every chunk of SCENARIO_CHUNK has its own seed spawned from seed, so the
+    draws do not depend on the number of workers; NumPy fills the arrays
+    without holding the GIL.
+    """
+    sizes = [min(SCENARIO_CHUNK, n_scenarios - start) for start in range(0, n_scenarios, SCENARIO_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if max_workers == 1 or len(sizes) <= 1:
+        chunks = [draw_scenarios(arrays, chunk_seed, size, **noise) for chunk_seed, size in zip(seeds, sizes)]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chunks = list(executor.map(lambda task: draw_scenarios(arrays, *task, **noise), zip(seeds, sizes)))
+    n = len(arrays['pts'])
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) if chunks else np.empty((0, n))
+            for key in ('cost', 'pts')}
+
+
+def tail_size(n_scenarios, alpha):
+    """Scenarios in a CVaR tail"""
+    return max(int(np.ceil(alpha * n_scenarios)), 1)
+
+
+def upper_tail(values, alpha):
+    """Average of the largest alpha share of values along the first axis"""
+    k = tail_size(len(values), alpha)
+    return np.sort(values, axis=0)[len(values) - k:].mean(axis=0)
+
+
+def robust_start(arrays, limits, scenarios, alpha, steps=8):
+    """
+    Knapsack roster meeting the CVaR cap constraint, or None.
+
+    Costs are loaded by lambda times each player's own tail excess over their
+    listed price; lambda is bisected for the smallest loading whose roster
+    fits the cap over the worst scenarios.
+    """
+    excess = np.maximum(upper_tail(scenarios['cost'], alpha) - arrays['cost'], 0.0)
+
+    def attempt(loading):
+        # Rounded up onto the grid the knapsack solves on
+        loaded = np.ceil((arrays['cost'] + loading * excess) / COST_GRID - 1e-6) * COST_GRID
+        result = KnapsackBackend().solve(dict(arrays, cost=loaded), limits)
+        if result['objective'] is None:
+            return None
+        players = result['players']
+        fits = upper_tail(scenarios['cost'][:, players].sum(axis=1), alpha) <= limits['cap'] + 1e-6
+        return players if fits else None
+
+    best = attempt(0.0)
+    if best is not None:
+        return best
+    low, high = 0.0, 1.0
+    while (best := attempt(high)) is None:
+        if high >= 64:
+            return None
+        low, high = high, high * 2
+    for _ in range(steps):
+        middle = (low + high) / 2
+        players = attempt(middle)
+        if players is None:
+            low = middle
+        else:
+            high, best = middle, players
+    return best
+
+
+def solve_stochastic(arrays, limits, scenarios, objective='mean', alpha=CVAR_ALPHA, solver_limits=None, start=None):
+    """
+    Best roster over the scenarios; returns the status, objective, gap and player positions.
+
+    The roster fits the cap at the listed prices and on average over its
+    worst alpha share of price scenarios. objective 'mean' maximizes expected
+    points, the listed PTS since the noise has mean one; 'cvar' the average
+    points of the worst alpha share of scenarios. start is a roster offered
+    to SCIP as its first solution.
+    """
+    cost, pts = scenarios['cost'], scenarios['pts']
+    k = tail_size(len(cost), alpha)
+
+    model = Model("StochasticSelection")
+    model.hideOutput()
+    set_solver_limits(model, **(solver_limits or {}))
+    variables = add_model_variables(model, arrays)
+
+    # Rockafellar-Uryasev: with weight 1/k the best threshold is the k-th worst scenario,
+    # so each tail is the average of exactly its k worst scenarios
+    threshold = model.addVar(lb=None, name="cost_var")
+    excess = [model.addVar(lb=0.0, name=f"cost_excess_{s}") for s in range(len(cost))]
+    model.addCons(threshold + quicksum(excess) / k <= limits['cap'], name="cap_cvar")
+    for s, row in enumerate(cost.tolist()):
+        model.addCons(excess[s] >= quicksum(c * var for c, var in zip(row, variables)) - threshold)
+
+    if objective == 'cvar':
+        level = model.addVar(lb=None, name="pts_var")
+        shortfall = [model.addVar(lb=0.0, name=f"pts_shortfall_{s}") for s in range(len(pts))]
+        for s, row in enumerate(pts.tolist()):
+            model.addCons(shortfall[s] >= level - quicksum(p * var for p, var in zip(row, variables)))
+        model.setObjective(level - quicksum(shortfall) / k, "maximize")
+    # After the objective is set, which clears the offset the starters' points go into
+    add_model_constraints(model, variables, arrays, limits)
+
+    if start is not None:
+        solution = model.createPartialSol()
+        chosen = set(start)
+        for i, var in enumerate(variables):
+            model.setSolVal(solution, var, 1.0 if i in chosen else 0.0)
+        model.addSol(solution)
+    model.optimize()
+
+    status = model.getStatus()
+    if not has_usable_solution(model):
+        return {'status': status, 'objective': None, 'gap': None, 'players': []}
+    solution = model.getBestSol()
+    return {
+        'status': status,
+        'objective': model.getSolObjVal(solution),
+        'gap': model.getGap(),
+        'players': [i for i, var in enumerate(variables) if model.getSolVal(solution, var) > 0.5],
+    }
+
+
+def evaluate_rosters(rosters, arrays, limits, scenarios, alpha=CVAR_ALPHA):
+    """
+    How each named roster of player positions holds up over the scenarios, one row per roster.
+
+    fit_rate is the share of scenarios it fits the cap in, tail_cost its
+    average cost over the worst alpha share, and stress_cost its listed cost
+    with its STRESS_PLAYERS priciest bids STRESS_OVERSHOOT high.
+    """
+    rows = []
+    for name, players in rosters.items():
+        cost = scenarios['cost'][:, players].sum(axis=1)
+        pts = scenarios['pts'][:, players].sum(axis=1) + limits['points']
+        priciest = np.sort(arrays['bid'][players])[::-1][:STRESS_PLAYERS]
+        rows.append({
+            'roster': name,
+            'expected_pts': float(arrays['pts'][players].sum()) + limits['points'],
+            'cvar_pts': float(-upper_tail(-pts, alpha)),
+            'cost': float(arrays['cost'][players].sum()),
+            'tail_cost': float(upper_tail(cost, alpha)),
+            'fit_rate': float((cost <= limits['cap'] + 1e-6).mean()),
+            'stress_cost': float(arrays['cost'][players].sum() + STRESS_OVERSHOOT * priciest.sum()),
+        })
+    return pd.DataFrame(rows).set_index('roster')
+
+
+def optimize_stochastic(auction, objective='mean', n_scenarios=STOCHASTIC_SCENARIOS, alpha=CVAR_ALPHA, seed=0,
+                        max_workers=None, time_limit=STOCHASTIC_TIME_LIMIT, gap_limit=STOCHASTIC_GAP_LIMIT, **noise):
+    """
+    BOT's stochastic roster from the auction's current state.
+
+    n_scenarios, capped at MAX_SCENARIOS, are solved over and as many more
+    are held out to compare the roster with the deterministic optimum, since
+    a roster fitted to its scenarios looks better on them than it is.
+    Returns the roster, its team table, the comparison and the solve's
+    status and gap.
+    """
+    start_time = time.perf_counter()
+    limits = auction.get_roster_limits()
+    arrays = build_arrays(auction)
+    n_scenarios = min(n_scenarios, MAX_SCENARIOS)
+    drawn = generate_scenarios(arrays, 2 * n_scenarios, seed, max_workers, **noise)
+    fitted = {key: values[:n_scenarios] for key, values in drawn.items()}
+    held_out = {key: values[n_scenarios:] for key, values in drawn.items()}
+
+    start = robust_start(arrays, limits, fitted, alpha)
+    result = solve_stochastic(arrays, limits, fitted, objective, alpha,
+                              {'time_limit': time_limit, 'gap_limit': gap_limit}, start)
+    nominal = KnapsackBackend().solve(arrays, limits)
+
+    rosters = {}
+    if result['objective'] is not None:
+        rosters['stochastic'] = result['players']
+    if nominal['objective'] is not None:
+        rosters['deterministic'] = nominal['players']
+    starters = get_own_starters(auction.players_df, auction.config.own_team).index.tolist()
+    players = arrays['index'][result['players']].tolist()
+    return {
+        'status': result['status'],
+        'objective': result['objective'],
+        'gap': result['gap'],
+        'players': players,
+        'optimal_team': None if result['objective'] is None else get_optimal_team(auction.players_df,
+                                                                                  starters + players),
+        'evaluation': evaluate_rosters(rosters, arrays, limits, held_out, alpha) if rosters else None,
+        'cap': limits['cap'],
+        'scenarios': n_scenarios,
+        'alpha': alpha,
+        'candidates': len(arrays['pts']),
+        'time': time.perf_counter() - start_time,
+    }
@@ -0,0 +1,135 @@
+import base64
+import glob
+import os
+import re
+from functools import reduce
+
+"""
+HTML table rendering for the Streamlit interface
+Cells are built column-wise and joined once; repeated styles and logos are
+emitted a single time as CSS classes instead of inline on every row.
+"""
+
+LOGO_DIRECTORY = "assets/nhl_logos"
+
+BADGE_STYLE = "padding: 2px 6px; border-radius: 4px; font-size: 0.85em; font-weight: 500;"
+CELL_STYLE = "padding: 8px; vertical-align: middle;"
+
+GROUP_STYLES = {
+    '3': 'background-color: rgba(69, 90, 100, 0.1); color: #455a64; border: 1px solid rgba(69, 90, 100, 0.3);',
+    '2': 'background-color: rgba(67, 160, 71, 0.1); color: #43a047; border: 1px solid rgba(67, 160, 71, 0.3);',
+    'A': 'background-color: rgba(41, 182, 246, 0.1); color: #29b6f6; border: 1px solid rgba(41, 182, 246, 0.3);',
+    'B': 'background-color: rgba(3, 169, 244, 0.1); color: #03a9f4; border: 1px solid rgba(3, 169, 244, 0.3);',
+    'C': 'background-color: rgba(3, 155, 229, 0.1); color: #039be5; border: 1px solid rgba(3, 155, 229, 0.3);',
+    'D': 'background-color: rgba(2, 136, 209, 0.1); color: #0288d1; border: 1px solid rgba(2, 136, 209, 0.3);',
+    'E': 'background-color: rgba(2, 119, 189, 0.1); color: #0277bd; border: 1px solid rgba(2, 119, 189, 0.3);',
+    'F': 'background-color: rgba(1, 87, 155, 0.1); color: #01579b; border: 1px solid rgba(1, 87, 155, 0.3);',
+    'G': 'background-color: rgba(1, 87, 155, 0.1); color: #01579b; border: 1px solid rgba(1, 87, 155, 0.3);',
+    'T': 'background-color: rgba(240, 98, 146, 0.1); color: #f06292; border: 1px solid rgba(240, 98, 146, 0.3);'
+}
+DEFAULT_GROUP_STYLE = 'background-color: #f0f0f0; color: #666;'
+
+POSITION_STYLES = {
+    'F': 'background-color: #188ae2; color: #fff; border: 1px solid #188ae2;',
+    'D': 'background-color: #5b69bc; color: #fff; border: 1px solid #5b69bc;',
+    'G': 'background-color: #3b3e47; color: #fff; border: 1px solid #3b3e47;'
+}
+DEFAULT_POSITION_STYLE = 'background-color: #b2b2b2; color: #fff;'
+
+TEAM_PANEL_STYLES = {
+    1: 'background: linear-gradient(to right, #ea217b, #ff7e31); color: #fff;',
+    2: 'background: linear-gradient(to right, #000, #464646); color: #fff;',
+    3: 'background: linear-gradient(to right, #F4DD2E, #E02B15); color: #000;',
+    4: 'background: linear-gradient(to right, #26535f, #ed8e37); color: #fff;',
+    5: 'background: linear-gradient(to right, #0D4499, #E7CD38); color: #fff;',
+    6: 'background: linear-gradient(to right, #003876, #001f43); color: #fff;',
+    7: 'background: linear-gradient(to right, #012169, #FC4C02); color: #fff;',
+    8: 'background: linear-gradient(to right, #000, #d10000); color: #fff;',
+    9: 'background: linear-gradient(to right, #164846, #80C042); color: #fff;',
+    10: 'background: linear-gradient(to right, #172b1d, #8eaf38); color: #fff;',
+    11: 'background: linear-gradient(to right, #BD2F2E, #815061); color: #fff;'
+}
+DEFAULT_TEAM_STYLE = 'background-color: #f0f0f0; color: #666;'
+
+
+def load_logo_data(directory=LOGO_DIRECTORY):
+    """Read and base64-encode every PNG logo in the directory"""
+    logos = {}
+    for logo_path in glob.glob(os.path.join(directory, "*.png")):
+        team_code = os.path.splitext(os.path.basename(logo_path))[0]
+        try:
+            with open(logo_path, "rb") as f:
+                encoded = base64.b64encode(f.read()).decode()
+        except OSError:
+            continue
+        logos[team_code] = {
+            'base64': encoded,
+            'data_url': f"data:image/png;base64,{encoded}"
+        }
+    return logos
+
+
+def css_class(prefix, value):
+    """Class name for a styled cell value, stable across tables on the same page"""
+    return f"{prefix}-{re.sub(r'[^A-Za-z0-9_-]', '_', str(value))}"
+
+
+def badge_column(values, prefix, styles, default_style, rules):
+    """Wrap every value in a badge span, registering one CSS rule per distinct value"""
+    classes = {}
+    for value in values.unique():
+        classes[value] = css_class(prefix, value)
+        rules[classes[value]] = f"{BADGE_STYLE} {styles.get(value, default_style)}"
+    return '<span class="' + values.map(classes) + '">' + values + '</span>'
+
+
+def render_table_html(df, columns, logos=None, teams=None, show_logos=True):
+    """Render df[columns] as a styled HTML table in a single pass"""
+    rules = {'ft-cell': CELL_STYLE}
+    cells = []
+
+    for col in columns:
+        values = df[col].astype(str)
+
+        # Add NHL logo for player column
+        if col == 'PLAYER' and show_logos and logos and 'NHL TEAM' in df.columns:
+            nhl_teams = df['NHL TEAM'].astype(str)
+            has_logo = nhl_teams.isin(list(logos))
+            for team_code in nhl_teams[has_logo].unique():
+                rules[css_class('ft-logo', team_code)] = (
+                    "display: inline-block; width: 20px; height: 20px; margin-right: 5px; vertical-align: middle; "
+                    "background: url(" + logos[team_code]['data_url'] + ") center / contain no-repeat;"
+                )
+            logo_spans = ('<span class="' + nhl_teams.map(lambda code: css_class('ft-logo', code)) + '"></span>')
+            values = logo_spans.where(has_logo, '') + values
+
+        # Style group column
+        elif col == 'GROUP':
+            values = badge_column(values, 'ft-group', GROUP_STYLES, DEFAULT_GROUP_STYLE, rules)
+
+        # Style position column
+        elif col == 'POS':
+            values = badge_column(values, 'ft-pos', POSITION_STYLES, DEFAULT_POSITION_STYLE, rules)
+
+        # Style team column, leaving free-agent codes as plain text
+        elif col == 'FCHL TEAM' and teams:
+            is_team = values.isin(list(teams))
+            team_styles = {code: TEAM_PANEL_STYLES.get(info.get('id', 1), DEFAULT_TEAM_STYLE)
+                           for code, info in teams.items()}
+            values = values.mask(is_team, badge_column(values[is_team], 'ft-team', team_styles, DEFAULT_TEAM_STYLE, rules))
+
+        cells.append("<td class='ft-cell'>" + values + "</td>")
+
+    header = "".join(
+        f"<th style='padding: 8px; text-align: left; border-bottom: 2px solid #ddd;'>{col}</th>" for col in columns
+    )
+    rows = reduce(lambda left, right: left + right, cells) if cells else []
+    style = "".join(f".{name} {{ {rule} }}" for name, rule in rules.items())
+
+    return "".join([
+        f"<style>{style}</style>",
+        "<div style='max-height: 400px; overflow-y: auto;'><table style='width: 100%; border-collapse: collapse;'>",
+        f"<thead><tr style='background-color: #f0f2f6; position: sticky; top: 0;'>{header}</tr></thead><tbody>",
+        "".join("<tr style='border-bottom: 1px solid #eee;'>" + row + "</tr>" for row in rows),
+        "</tbody></table></div>",
+    ])
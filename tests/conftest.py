@@ -0,0 +1,24 @@
+import os
+import pandas as pd
+import pytest
+
+from fantasy_auction import FantasyAuction, load_players_csv
+
+# As in the app, so forks share their baseline's columns
+pd.set_option("mode.copy_on_write", True)
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "players-24.csv")
+
+
+@pytest.fixture(scope="session")
+def players_table():
+    """Typed players-24.csv, shared read-only by every test"""
+    return load_players_csv(CSV_PATH)
+
+
+@pytest.fixture
+def auction(players_table):
+    """Processed auction on players-24.csv"""
+    auction = FantasyAuction(df=players_table)
+    auction.process_data()
+    return auction
@@ -0,0 +1,104 @@
+import json
+import os
+import pandas as pd
+import pytest
+
+from auction_log import EVENTS_FILE, AuctionLog, CorruptLogError, remove_unused_drafts
+
+
+def sell(auction, count, start=0):
+    """Sell count of the best available players, cycling through the teams"""
+    teams = list(auction.config.teams)
+    for i in range(count):
+        player = auction.get_available_players().index[0]
+        auction.assign_player_to_team(player, teams[(start + i) % len(teams)], 1.0)
+        auction.process_data()
+
+
+def test_writers_sharing_a_log_never_repeat_a_seq(auction, tmp_path):
+    first, second = auction.fork(), auction.fork()
+    AuctionLog(str(tmp_path), snapshot_every=3, fsync=False).attach(first)
+    AuctionLog(str(tmp_path), snapshot_every=3, fsync=False).attach(second)
+    for step in range(4):
+        sell(first, 1, step)
+        sell(second, 1, step + 5)
+
+    with open(tmp_path / EVENTS_FILE) as file:
+        seqs = [json.loads(line)['seq'] for line in file]
+    assert seqs == list(range(1, len(seqs) + 1))
+    snapshots = sorted(name for name in os.listdir(tmp_path) if name.endswith(".feather"))
+    assert len(snapshots) == len(set(snapshots)) == 1 + len(seqs) // 3
+
+
+def test_restore_rejects_duplicate_seqs(auction, tmp_path):
+    log = AuctionLog(str(tmp_path), fsync=False)
+    log.attach(auction)
+    sell(auction, 3)
+    log.close()
+    with open(tmp_path / EVENTS_FILE) as file:
+        lines = file.readlines()
+    with open(tmp_path / EVENTS_FILE, 'a') as file:
+        file.write(lines[1])
+
+    with pytest.raises(CorruptLogError):
+        AuctionLog(str(tmp_path), fsync=False).restore()
+
+
+def test_restore_without_snapshot_replays_onto_the_baseline(auction, tmp_path):
+    baseline = auction.fork()
+    log = AuctionLog(str(tmp_path), fsync=False)
+    log.attach(auction)
+    sell(auction, 5)
+    log.close()
+    expected = AuctionLog(str(tmp_path)).restore()
+    for name in os.listdir(tmp_path):
+        if name.startswith("snapshot_"):
+            os.remove(tmp_path / name)
+
+    reopened = AuctionLog(str(tmp_path))
+    with pytest.raises(CorruptLogError):
+        reopened.restore()
+    restored = reopened.restore(baseline=baseline)
+    pd.testing.assert_frame_equal(restored.players_df, expected.players_df, check_categorical=False)
+
+
+@pytest.mark.parametrize("snapshot_every", [1, 4, 100])
+def test_restore_then_process_data_matches_the_live_auction(auction, tmp_path, snapshot_every):
+    log = AuctionLog(str(tmp_path), snapshot_every=snapshot_every, fsync=False)
+    log.attach(auction)
+    sell(auction, 6)
+    rostered = auction.players_df.index[auction.players_df['FCHL TEAM'] == auction.config.own_team][0]
+    auction.update_player_salary(rostered, 2.5)
+    auction.process_data()
+    log.close()
+
+    restored = AuctionLog(str(tmp_path)).restore(auction.config)
+    restored.process_data()
+    pd.testing.assert_frame_equal(restored.players_df, auction.players_df, check_categorical=False)
+    assert restored.get_team_budgets() == auction.get_team_budgets()
+    assert restored.get_roster_limits() == auction.get_roster_limits()
+
+
+def test_new_draft_writes_nothing_until_its_first_event(auction, tmp_path):
+    directory = tmp_path / "draft"
+    log = AuctionLog(str(directory), fsync=False)
+    log.attach(auction)
+    assert not directory.exists()
+
+    sell(auction, 1)
+    log.close()
+    assert sorted(os.listdir(directory)) == [EVENTS_FILE, "snapshot_00000001.feather",
+                                             "snapshot_00000001.feather.json"]
+
+
+def test_remove_unused_drafts_keeps_drafts_with_events(auction, tmp_path):
+    (tmp_path / "opened").mkdir()
+    (tmp_path / "opened" / "snapshot_00000000.feather").write_bytes(b"")
+    log = AuctionLog(str(tmp_path / "used"), fsync=False)
+    log.attach(auction)
+    sell(auction, 1)
+    log.close()
+
+    assert remove_unused_drafts(str(tmp_path)) == []
+    assert remove_unused_drafts(str(tmp_path), min_age=0) == [str(tmp_path / "opened")]
+    assert sorted(os.listdir(tmp_path)) == ["used"]
@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+from auction_simulator import simulate_auctions
+
+
+def test_simulate_auctions_is_deterministic_for_a_seed(auction):
+    def simulate(seed, **options):
+        return simulate_auctions(auction, ('value', 'budget'), n_drafts=3, seed=seed, **options)
+
+    results = simulate(7, max_workers=1)
+    pd.testing.assert_frame_equal(simulate(7, max_workers=1), results)
+    # Each draft has its own seed, so neither the chunking nor the worker processes change the drafts
+    pd.testing.assert_frame_equal(simulate(7, max_workers=2, chunk_size=1), results)
+    assert not simulate(8, max_workers=1)['pts'].equals(results['pts'])
+
+
+def test_simulated_drafts_stay_within_bots_cap_and_slots(auction):
+    limits = auction.get_roster_limits()
+    results = simulate_auctions(auction, n_drafts=2, max_workers=1)
+    assert list(results['strategy'].unique()) == ['value', 'stars', 'budget']
+    for _, draft in results.iterrows():
+        assert draft['spend'] <= limits['cap'] + 1e-6
+        assert draft['remaining'] == pytest.approx(limits['cap'] - draft['spend'])
+        assert draft['players_bought'] + draft['open_slots'] == sum(limits['slots'].values())
+        bought = auction.players_df.loc[draft['players']]
+        assert draft['pts'] == pytest.approx(limits['points'] + bought['PTS'].sum())
+        for pos, need in limits['slots'].items():
+            assert (bought['POS'] == pos).sum() <= need
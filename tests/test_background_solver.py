@@ -0,0 +1,56 @@
+import time
+
+from fantasy_auction import BackgroundSolver
+
+
+def test_worker_starts_on_request_and_stop_joins_it(auction):
+    solver = BackgroundSolver(auction.config, debounce=0.0, backend='knapsack')
+    assert solver.thread is None
+    solver.request(auction)
+    assert solver.wait(30)
+    thread = solver.thread
+    solver.stop(timeout=10)
+    assert not thread.is_alive()
+
+
+def test_idle_worker_exits_and_the_next_request_restarts_it(auction):
+    solver = BackgroundSolver(auction.config, debounce=0.0, backend='knapsack', idle_timeout=0.2)
+    solver.request(auction)
+    assert solver.wait(30)
+    deadline = time.monotonic() + 10
+    while solver.thread is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert solver.thread is None
+
+    player = auction.get_available_players().index[0]
+    auction.assign_player_to_team(player, 'GVR', 1.0)
+    auction.process_data()
+    solver.request(auction)
+    assert solver.wait(30) and solver.result['version'] == auction.data_version
+    solver.stop(timeout=10)
+
+
+def test_persistent_scip_session_solves_silently(auction, capfd):
+    solver = BackgroundSolver(auction.config, debounce=0.0, backend='scip')
+    solver.request(auction)
+    assert solver.wait(60) and solver.result['objective'] is not None
+    # Re-solves of the updated model are where SCIP warned about starting solutions
+    for player in auction.get_available_players().index[:3]:
+        auction.assign_player_to_team(player, 'GVR', 1.0)
+        auction.process_data()
+        solver.request(auction)
+        assert solver.wait(60)
+    solver.stop(timeout=10)
+    out, err = capfd.readouterr()
+    assert out == "" and err == ""
+
+
+def test_alternative_rosters_stop_at_the_time_limit(auction):
+    solver = BackgroundSolver(auction.config, debounce=0.0, backend='knapsack', alternatives=1000, time_limit=1.0)
+    start = time.monotonic()
+    solver.request(auction)
+    assert solver.wait(30)
+    elapsed = time.monotonic() - start
+    solver.stop(timeout=10)
+    assert 1 < len(solver.result['rosters']) < 1000
+    assert elapsed < 5
@@ -0,0 +1,20 @@
+from benchmark import compare_results
+
+
+def result(operation, median_ms):
+    return {'pool': 'players-24.csv', 'operation': operation, 'median_ms': median_ms}
+
+
+def test_regressions_need_both_the_ratio_and_the_absolute_slowdown():
+    baseline = {'results': [result('get_team_budgets', 0.07), result('process_data', 20.0),
+                            result('build_model', 40.0), result('solve_model', 4.0)]}
+    results = [
+        result('get_team_budgets', 0.1),  # 1.4x but a few microseconds
+        result('process_data', 30.0),  # 1.5x and 10 ms
+        result('build_model', 41.5),  # 1.5 ms but within the ratio
+        result('solve_model', 4.9),  # 1.23x and under 1 ms
+        result('new operation', 5.0),
+    ]
+    assert compare_results(results, baseline, threshold=1.25) == [('players-24.csv', 'process_data')]
+    assert compare_results(results, baseline, threshold=1.25, min_delta_ms=0.0) == [
+        ('players-24.csv', 'get_team_budgets'), ('players-24.csv', 'process_data')]
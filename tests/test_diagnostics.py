@@ -0,0 +1,19 @@
+import time
+
+
+def test_phases_hold_self_time(auction):
+    start = time.perf_counter()
+    auction.process_data()
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    phases = auction.get_diagnostics()[-1]['phases']
+    assert {'process_data', 'calculate_z_scores', 'update_bids', 'revalue_market'} <= set(phases)
+    # Nested phases are not counted again in process_data, so the phases add up to the wall time
+    assert all(ms >= 0 for ms in phases.values())
+    assert sum(phases.values()) <= wall_ms
+
+
+def test_diagnostics_are_copied(auction):
+    records = auction.get_diagnostics()
+    records[-1]['phases']['process_data'] = -1.0
+    assert auction.get_diagnostics()[-1]['phases']['process_data'] >= 0
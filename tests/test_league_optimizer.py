@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from fantasy_auction import POSITIONS
+from league_optimizer import build_league, optimize_league
+
+
+def assert_fits_every_team(auction, result):
+    """Each player taken once from the free agents, within every team's remaining cap and open slots"""
+    league = build_league(auction)
+    assignment = result['assignment']
+    assert assignment['player'].is_unique
+    assert set(assignment['player']) <= set(league['index'])
+    assert result['objective'] == pytest.approx(assignment['PTS'].sum())
+    assert result['objective'] <= result['bound'] + 1e-6
+    for team_id, team in enumerate(league['teams']):
+        taken = assignment[assignment['team_id'] == team_id]
+        assert (taken['team'] == team).all()
+        assert taken['price'].sum() <= league['budget'][team_id] + 1e-6, team
+        for i, pos in enumerate(POSITIONS):
+            count = (taken['POS'] == pos).sum()
+            if result['complete'] and league['fillable'][i]:
+                assert count == league['needs'][team_id, i], (team, pos)
+            else:
+                assert count <= league['needs'][team_id, i], (team, pos)
+
+
+@pytest.mark.parametrize('gap_limit', [0.005, 0.0])
+def test_optimize_league_respects_every_teams_limits(auction, gap_limit):
+    teams = list(auction.config.teams)
+    result = optimize_league(auction, gap_limit=gap_limit, time_limit=1.0)
+    assert result['complete']
+    assert_fits_every_team(auction, result)
+    for sale in range(4):
+        player = auction.get_available_players().index[sale]
+        auction.assign_player_to_team(player, teams[sale % len(teams)], float(auction.players_df.at[player, 'BID']) * 1.3)
+        auction.process_data()
+        result = optimize_league(auction, previous=result, gap_limit=gap_limit, time_limit=1.0)
+        assert result['complete']
+        assert_fits_every_team(auction, result)
+        assert not np.isin(player, result['assignment']['player'])
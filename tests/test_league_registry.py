@@ -0,0 +1,64 @@
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from fantasy_auction import DEFAULT_LEAGUE, LeagueRegistry
+from tests.conftest import CSV_PATH
+
+
+def test_leagues_load_from_a_json_config(tmp_path):
+    shutil.copy(CSV_PATH, tmp_path / "players.csv")
+    (tmp_path / "teams.json").write_text(json.dumps({
+        "BOT": {"id": 1, "name": "Bridlewood AI", "penalty": 0.5},
+        "GVR": {"id": 7, "name": "Grovenor Drew", "penalty": 1.0},
+    }))
+    (tmp_path / "leagues.json").write_text(json.dumps({
+        "small": {"teams": "teams.json", "players": "players.csv", "salary": 40.0, "forward": 10},
+    }))
+
+    registry = LeagueRegistry()
+    registry.add_leagues_from_json(str(tmp_path / "leagues.json"))
+    config, csv_path = registry.leagues["small"]
+    assert (config.name, config.salary, config.forward, config.n_teams) == ("small", 40.0, 10, 2)
+    assert csv_path == str(tmp_path / "players.csv")
+
+    auction = registry.create_auction("small")
+    assert auction.config is config
+    assert auction.get_roster_limits()['slots']['F'] <= 10
+
+
+def column_values(players_df, column):
+    values = players_df[column].array
+    return values.codes if isinstance(values, pd.Categorical) else players_df[column].to_numpy()
+
+
+def test_forked_sessions_share_the_baseline_columns():
+    registry = LeagueRegistry()
+    registry.add_league(DEFAULT_LEAGUE.name, DEFAULT_LEAGUE, CSV_PATH)
+    baseline = registry.get_baseline(DEFAULT_LEAGUE.name)[0].players_df
+    session = registry.create_auction(DEFAULT_LEAGUE.name)
+
+    # A valued fork, revalued or not, writes nothing into its table
+    session.process_data()
+    for column in baseline.columns:
+        assert np.shares_memory(column_values(baseline, column), column_values(session.players_df, column)), column
+
+    # A sale copies only the columns it changes, and the baseline is left as it was
+    before = baseline.copy()
+    player = session.get_available_players().index[0]
+    session.assign_player_to_team(player, 'GVR', 1.0)
+    session.process_data()
+    for column in ('PLAYER', 'POS', 'GROUP', 'NHL TEAM', 'AGE', 'SALARY', 'PTS'):
+        assert np.shares_memory(column_values(baseline, column), column_values(session.players_df, column)), column
+    pd.testing.assert_frame_equal(baseline, before)
+
+
+def test_fork_copies_the_table_without_copy_on_write(auction):
+    with pd.option_context("mode.copy_on_write", False):
+        session = auction.fork()
+        player = session.get_available_players().index[0]
+        session.assign_player_to_team(player, 'GVR', 1.0)
+        session.process_data()
+    assert auction.players_df.loc[player, 'FCHL TEAM'] != 'GVR'
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+
+def unsold_draftable(auction):
+    """Positions of the unsold draftable players revalue_market prices"""
+    state = auction.get_state()
+    return np.flatnonzero(state.draftable & (state.pos >= 0) & (state.owner < 0))
+
+
+def test_revalue_market_conserves_the_money_left(auction):
+    teams = list(auction.config.teams)
+    for sale in range(8):
+        before = auction.market_history[-1]
+        player = auction.get_available_players().index[0]
+        price = float(auction.players_df.at[player, 'BID']) + 1.5
+        auction.assign_player_to_team(player, teams[sale % len(teams)], price)
+        auction.process_data()
+
+        market = auction.market_history[-1]
+        # Every team still has open slots, so only the price paid leaves the market
+        assert before['money'] - market['money'] == pytest.approx(price, abs=0.011)
+        # The unsold players' bids share out what is left, up to rounding each to 0.1
+        rows = unsold_draftable(auction)
+        assert market['supply'] == len(rows)
+        assert auction.players_df['BID'].iloc[rows].sum() == pytest.approx(market['money'], abs=0.05 * len(rows))
+
+
+def test_revalue_market_changes_nothing_without_a_sale(auction):
+    rows = unsold_draftable(auction)
+    bids = auction.players_df['BID'].iloc[rows].to_numpy()
+    assert auction.market_history[-1]['inflation'] == pytest.approx(1.0)
+    auction.revalue_market()
+    np.testing.assert_array_equal(auction.players_df['BID'].iloc[rows].to_numpy(), bids)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from tests.conftest import CSV_PATH
+from fantasy_auction import PLAYER_CATEGORIES, FantasyAuction, load_players_csv
+
+
+def test_loaded_columns_are_typed(players_table):
+    raw = pd.read_csv(CSV_PATH)
+    for column, known in PLAYER_CATEGORIES.items():
+        if column in players_table.columns:
+            assert isinstance(players_table[column].dtype, pd.CategoricalDtype), column
+            assert list(players_table[column].cat.categories[:len(known)]) == known, column
+            # Only cells blank in the CSV are missing
+            pd.testing.assert_series_equal(players_table[column].astype(object), raw[column].astype(object),
+                                           check_dtype=False)
+    assert players_table['AGE'].dtype == players_table['PTS'].dtype == np.int16
+    assert players_table['SALARY'].dtype == players_table['BID'].dtype == np.float64
+
+
+def test_unknown_codes_are_kept_as_new_categories(tmp_path):
+    df = pd.read_csv(CSV_PATH)
+    df.loc[0, 'POS'], df.loc[1, 'STATUS'] = 'W', 'IR'
+    df.to_csv(tmp_path / "players.csv", index=False)
+
+    players = load_players_csv(tmp_path / "players.csv")
+    assert players.loc[0, 'POS'] == 'W' and players.loc[1, 'STATUS'] == 'IR'
+    assert list(players['POS'].cat.categories) == PLAYER_CATEGORIES['POS'] + ['W']
+    assert list(players['STATUS'].cat.categories) == PLAYER_CATEGORIES['STATUS'] + ['IR']
+    pd.testing.assert_frame_equal(players[['POS', 'STATUS']].astype(object), df[['POS', 'STATUS']].astype(object))
+
+    # Neither value is one the valuation knows, so the table is still processed
+    auction = FantasyAuction(df=players)
+    auction.process_data()
+    assert auction.players_df.loc[0, 'POS'] == 'W' and auction.players_df.loc[1, 'STATUS'] == 'IR'
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from fantasy_auction import AuctionState
+
+
+def test_process_data_after_sales_and_undos_matches_a_full_recompute(auction):
+    teams = list(auction.config.teams)
+    sold = []
+    for step in range(12):
+        if step % 4 == 3:
+            # Undo the latest sale
+            auction.remove_player_from_team(sold.pop())
+        elif step % 5 == 4:
+            auction.update_player_salary(sold[0], 2.5)
+        else:
+            player = auction.get_available_players().index[0]
+            auction.assign_player_to_team(player, teams[step % len(teams)], 1.0)
+            sold.append(player)
+        result = auction.process_data()
+
+        full = auction.fork()
+        assert full.process_data() == result
+        pd.testing.assert_frame_equal(auction.players_df, full.players_df)
+        # The state kernel refreshed in place agrees with one built from the table
+        state, rebuilt = auction.get_state(), AuctionState(auction.players_df, teams)
+        for field in ('owner', 'status', 'bid', 'salary', 'z_score', 'draftable',
+                      'committed', 'spending', 'counts', 'start_counts', 'minor_counts'):
+            np.testing.assert_array_equal(getattr(state, field), getattr(rebuilt, field), err_msg=field)
@@ -0,0 +1,25 @@
+import time
+
+import numpy as np
+
+from fantasy_auction import COST_GRID, POSITIONS, enumerate_rosters
+
+
+def test_enumeration_shares_one_time_limit():
+    rng = np.random.default_rng(1)
+    n_players = 2000
+    arrays = {
+        'pts': rng.integers(0, 90, size=n_players).astype(float),
+        'cost': np.round(rng.uniform(0.5, 12.0, size=n_players) / COST_GRID) * COST_GRID,
+        'pos': rng.choice(POSITIONS, size=n_players, p=[0.57, 0.32, 0.11]).astype(object),
+        'fixed': np.zeros(n_players, dtype=bool),
+    }
+    limits = {'cap': 60.0, 'slots': {'F': 6, 'D': 4, 'G': 2}, 'points': 0.0}
+
+    start = time.monotonic()
+    rosters = enumerate_rosters(arrays, limits, 200, solver_limits={'time_limit': 0.5, 'gap_limit': None})
+    assert time.monotonic() - start < 2.0
+    assert len(rosters) < 200
+    # Each roster found is still distinct and within the cap
+    assert len({tuple(roster['players']) for roster in rosters}) == len(rosters)
+    assert all(roster['cost'] <= limits['cap'] + 1e-6 for roster in rosters)
@@ -0,0 +1,68 @@
+import itertools
+import numpy as np
+import pytest
+
+from fantasy_auction import POSITIONS, get_model_players
+
+
+def test_forcing_out_a_rostered_player_leaves_the_roster_unchanged(auction):
+    rostered = auction.players_df.index[auction.players_df['FCHL TEAM'] == auction.config.own_team][0]
+    base, forced_out = auction.solve_scenarios([{}, {'force_out': [rostered]}], max_workers=1)
+    assert forced_out['status'] == base['status'] == 'optimal'
+    assert forced_out['objective'] == pytest.approx(base['objective'])
+    assert rostered not in forced_out['players']
+
+
+def test_forcing_out_a_pool_player_drops_them(auction):
+    base, = auction.solve_scenarios([{}], max_workers=1)
+    player = base['players'][0]
+    forced_out, = auction.solve_scenarios([{'force_out': [player]}], max_workers=1)
+    assert player not in forced_out['players']
+    assert forced_out['objective'] <= base['objective'] + 1e-6
+
+
+def small_pool(auction, sizes):
+    """Leave only the cheapest sizes[pos] free agents of each position on the market"""
+    pool = get_model_players(auction.players_df).sort_values('BID', kind='stable')
+    kept = pool.groupby('POS', observed=True).head(max(sizes.values())).index
+    kept = [idx for pos, count in sizes.items() for idx in kept[pool.loc[kept, 'POS'] == pos][:count]]
+    for idx in pool.index.difference(kept):
+        auction.update_player_bid(idx, 0.0)
+    return auction.players_df.loc[kept]
+
+
+def brute_force_max_bid(pool, player, limits, step):
+    """Largest multiple of step at which some roster with player scores as well as the best one without"""
+    positions = [np.flatnonzero(pool['POS'].to_numpy() == pos) for pos in POSITIONS]
+    rosters = np.array([
+        sum(combination, ())
+        for combination in itertools.product(*[
+            itertools.combinations(rows, limits['slots'][pos]) for pos, rows in zip(POSITIONS, positions)
+        ])
+    ])
+    pts = pool['PTS'].to_numpy(dtype=float)[rosters].sum(axis=1)
+    cost = (pool['SALARY'] + pool['BID']).to_numpy(dtype=float)[rosters].sum(axis=1)
+    with_player = (rosters == pool.index.get_loc(player)).any(axis=1)
+    fits = ~with_player & (cost <= limits['cap'] + 1e-9)
+    without = pts[fits].max() if fits.any() else -np.inf
+    # What the cap leaves for the player's bid in each roster that is worth it
+    slack = (limits['cap'] - cost + pool.at[player, 'BID'])[with_player & (pts >= without)]
+    if not len(slack) or slack.max() < -1e-9:
+        return None
+    return np.floor(slack.max() / step + 1e-9) * step
+
+
+@pytest.mark.parametrize('step', [0.05, 0.1, 0.25])
+def test_max_bid_is_the_largest_bid_that_still_fits(auction, step):
+    limits = auction.get_roster_limits()
+    pool = small_pool(auction, {pos: limits['slots'][pos] + 2 for pos in POSITIONS})
+    for player in pool.sort_values('PTS', ascending=False).index[:3]:
+        expected = brute_force_max_bid(pool, player, limits, step)
+        assert expected is not None
+        assert auction.max_bid(player, step=step)['max_bid'] == pytest.approx(expected)
+
+
+def test_max_bid_rejects_a_player_already_on_the_roster(auction):
+    rostered = auction.players_df.index[auction.players_df['FCHL TEAM'] == auction.config.own_team][0]
+    with pytest.raises(ValueError):
+        auction.max_bid(rostered)
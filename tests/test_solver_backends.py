@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from fantasy_auction import COST_GRID, POSITIONS, SOLVER_BACKENDS
+
+
+def random_arrays(n_players, seed):
+    """Model arrays of a random pool with grid costs, as get_model_arrays returns them"""
+    rng = np.random.default_rng(seed)
+    return {
+        'pts': rng.integers(0, 90, size=n_players).astype(float),
+        'cost': np.round(rng.uniform(0.5, 12.0, size=n_players) / COST_GRID) * COST_GRID,
+        'pos': rng.choice(POSITIONS, size=n_players, p=[0.57, 0.32, 0.11]).astype(object),
+        'fixed': np.zeros(n_players, dtype=bool),
+    }
+
+
+def solve_with_every_backend(arrays, limits):
+    return {name: backend().solve(arrays, limits) for name, backend in SOLVER_BACKENDS.items()}
+
+
+def assert_backends_agree(results, arrays, limits):
+    scip = results['scip']['objective']
+    for name, result in results.items():
+        if scip is None:
+            assert result['objective'] is None, name
+            continue
+        assert result['objective'] == pytest.approx(scip, abs=1e-6), name
+        # The roster returned is feasible and scores the objective
+        players = np.array(result['players'], dtype=int)
+        assert arrays['cost'][players].sum() <= limits['cap'] + 1e-6, name
+        for pos, required in limits['slots'].items():
+            assert (arrays['pos'][players] == pos).sum() == required, name
+        assert arrays['pts'][players].sum() + limits.get('points', 0.0) == pytest.approx(result['objective']), name
+
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('cap', [-1.0, 0.0, 6.3, 25.0, 80.0])
+@pytest.mark.parametrize('slots', [
+    {'F': 0, 'D': 0, 'G': 0},  # Every slot filled already
+    {'F': 2, 'D': 1, 'G': 0},
+    {'F': 4, 'D': 3, 'G': 1},
+    {'F': 0, 'D': 0, 'G': 12},  # More goalies than the pool has
+])
+def test_backends_agree_on_random_pools(seed, cap, slots):
+    arrays = random_arrays(40 + 25 * seed, seed)
+    limits = {'cap': cap, 'slots': slots, 'points': 150.0}
+    assert_backends_agree(solve_with_every_backend(arrays, limits), arrays, limits)
+
+
+def test_backends_agree_through_an_auction(auction):
+    teams = list(auction.config.teams)
+    for sale in range(12):
+        limits = auction.get_roster_limits()
+        results = {}
+        for name in SOLVER_BACKENDS:
+            auction.configure_solver(backend=name)
+            results[name] = auction.solve_roster()
+        objectives = {name: result['objective'] for name, result in results.items()}
+        assert objectives['knapsack'] == pytest.approx(objectives['scip'], abs=1e-6), (sale, objectives)
+        costs = auction.players_df.loc[results['knapsack']['players'], ['SALARY', 'BID']].sum().sum()
+        assert costs <= limits['cap'] + 1e-6
+
+        # Every third sale goes to BOT, so its cap and open slots change too; some are undone
+        player = auction.get_available_players().index[sale % 5]
+        team = auction.config.own_team if sale % 3 == 0 else teams[sale % len(teams)]
+        auction.assign_player_to_team(player, team, float(auction.players_df.loc[player, 'BID']))
+        if sale % 4 == 3:
+            auction.remove_player_from_team(player)
+        auction.process_data()
@@ -0,0 +1,51 @@
+import pytest
+
+from fantasy_auction import SolverSession, get_selected_players
+
+
+def solve(session, players_df, limits):
+    """Sync and solve the session, returning the incumbents it reported and the optimal roster"""
+    reports = []
+    session.reporter.callback = reports.append
+    session.sync(players_df, limits)
+    session.model.optimize()
+    solution = session.model.getBestSol()
+    session.remember_solution(solution)
+    return reports, sorted(get_selected_players(session.model, solution, session.player_vars))
+
+
+def test_incumbents_improve_monotonically_to_the_optimum(auction):
+    session = SolverSession(auction.config)
+    reports, roster = solve(session, auction.players_df, auction.get_roster_limits())
+
+    assert session.model.getStatus() == 'optimal'
+    assert len(reports) > 1
+    for earlier, later in zip(reports, reports[1:]):
+        assert later['objective'] > earlier['objective']
+        assert later['dual_bound'] <= earlier['dual_bound'] + 1e-6
+        assert later['gap'] <= earlier['gap']
+        assert later['time'] >= earlier['time']
+    assert reports[-1]['objective'] == pytest.approx(session.model.getObjVal())
+    assert sorted(reports[-1]['players']) == roster
+
+
+def test_resync_starts_from_the_previous_roster(auction):
+    limits = auction.get_roster_limits()
+    session = SolverSession(auction.config)
+    _, roster = solve(session, auction.players_df, limits)
+    player_vars = dict(session.player_vars)
+    previous_pts = float(auction.players_df.loc[roster, 'PTS'].sum()) + limits['points']
+
+    # A little more cap keeps the previous roster feasible
+    looser = dict(limits, cap=limits['cap'] + 0.5)
+    session.sync(auction.players_df, looser)
+    assert all(session.player_vars[idx] is var for idx, var in player_vars.items())
+    starts = [sorted(get_selected_players(session.model, solution, session.player_vars))
+              for solution in session.model.getSols()]
+    assert roster in starts
+
+    reports, _ = solve(session, auction.players_df, looser)
+    assert all(report['objective'] >= previous_pts - 1e-6 for report in reports)
+    fresh = SolverSession(auction.config)
+    solve(fresh, auction.players_df, looser)
+    assert session.model.getObjVal() == pytest.approx(fresh.model.getObjVal())
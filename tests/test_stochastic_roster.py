@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from fantasy_auction import POSITIONS
+from stochastic_roster import (build_arrays, generate_scenarios, optimize_stochastic, solve_stochastic,
+                               upper_tail)
+
+ALPHA = 0.2
+
+
+def test_cvar_objective_has_the_better_worst_case(auction):
+    # Eight candidates per position and six open slots, small enough to solve to optimality
+    arrays = build_arrays(auction)
+    keep = np.concatenate([np.flatnonzero(arrays['pos'] == pos)[:8] for pos in POSITIONS])
+    arrays = {key: values[np.sort(keep)] for key, values in arrays.items()}
+    limits = dict(auction.get_roster_limits(), cap=28.0, slots={'F': 3, 'D': 2, 'G': 1})
+    scenarios = generate_scenarios(arrays, 50, seed=0, max_workers=1)
+    rosters = {objective: solve_stochastic(arrays, limits, scenarios, objective, ALPHA,
+                                           {'time_limit': 30.0, 'gap_limit': 0.0})
+               for objective in ('mean', 'cvar')}
+    worst_case, expected = {}, {}
+    for objective, result in rosters.items():
+        assert result['status'] == 'optimal'
+        players = result['players']
+        # Both fit the cap over the worst price scenarios
+        assert upper_tail(scenarios['cost'][:, players].sum(axis=1), ALPHA) <= limits['cap'] + 1e-6
+        worst_case[objective] = -upper_tail(-scenarios['pts'][:, players].sum(axis=1), ALPHA)
+        expected[objective] = arrays['pts'][players].sum()
+    assert rosters['cvar']['players'] != rosters['mean']['players']
+    assert worst_case['cvar'] >= worst_case['mean'] - 1e-6
+    assert expected['mean'] >= expected['cvar'] - 1e-6
+
+
+def test_optimize_stochastic_is_deterministic_for_a_seed(auction):
+    limits = auction.get_roster_limits()
+    # A time limit it never reaches, so the search stops at the gap limit the same way each time
+    first, second = (optimize_stochastic(auction, 'mean', n_scenarios=50, seed=3, max_workers=workers, time_limit=60.0)
+                     for workers in (1, 2))
+    assert first['status'] in ('optimal', 'gaplimit')
+    assert first['players'] == second['players']
+    assert first['objective'] == pytest.approx(second['objective'])
+    free_agents = first['optimal_team'][first['optimal_team']['STATUS'] != 'START']
+    for pos, need in limits['slots'].items():
+        assert (free_agents['POS'] == pos).sum() == need
+    assert free_agents['TOTAL_COST'].sum() <= limits['cap'] + 1e-6
+    np.testing.assert_array_equal(first['evaluation'].to_numpy(), second['evaluation'].to_numpy())
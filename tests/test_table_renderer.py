@@ -0,0 +1,44 @@
+import re
+import pandas as pd
+
+from table_renderer import BADGE_STYLE, GROUP_STYLES, POSITION_STYLES, TEAM_PANEL_STYLES, render_table_html
+
+LOGOS = {'EDM': {'data_url': "data:image/png;base64,AAAA"}}
+TEAMS = {'BOT': {'id': 3}}
+
+
+def render(df):
+    return render_table_html(df, ['PLAYER', 'POS', 'GROUP', 'FCHL TEAM', 'BID'], logos=LOGOS, teams=TEAMS)
+
+
+def test_formatted_row_uses_css_classes():
+    df = pd.DataFrame({'PLAYER': ["Connor McDavid"], 'NHL TEAM': ["EDM"], 'POS': ["F"], 'GROUP': ["2"],
+                       'FCHL TEAM': ["BOT"], 'BID': [12.5]}).astype({'POS': 'category'})
+    html = render(df)
+
+    row, = re.findall(r"<tr style='border-bottom: 1px solid #eee;'>(.*?)</tr>", html)
+    assert row == (
+        "<td class='ft-cell'><span class=\"ft-logo-EDM\"></span>Connor McDavid</td>"
+        "<td class='ft-cell'><span class=\"ft-pos-F\">F</span></td>"
+        "<td class='ft-cell'><span class=\"ft-group-2\">2</span></td>"
+        "<td class='ft-cell'><span class=\"ft-team-BOT\">BOT</span></td>"
+        "<td class='ft-cell'>12.5</td>"
+    )
+    assert f".ft-pos-F {{ {BADGE_STYLE} {POSITION_STYLES['F']} }}" in html
+    assert f".ft-group-2 {{ {BADGE_STYLE} {GROUP_STYLES['2']} }}" in html
+    assert f".ft-team-BOT {{ {BADGE_STYLE} {TEAM_PANEL_STYLES[3]} }}" in html
+    assert "url(data:image/png;base64,AAAA)" in html
+
+
+def test_each_style_is_emitted_once():
+    df = pd.DataFrame({'PLAYER': ["A", "B", "C"], 'NHL TEAM': ["EDM", "EDM", "XXX"], 'POS': ["F", "F", "D"],
+                       'GROUP': ["2", "2", "3"], 'FCHL TEAM': ["BOT", "UFA", "BOT"], 'BID': [1.0, 2.0, 3.0]})
+    html = render(df)
+
+    style = re.search(r"<style>(.*?)</style>", html).group(1)
+    rules = re.findall(r"\.([\w-]+) \{", style)
+    assert sorted(rules) == sorted(['ft-cell', 'ft-logo-EDM', 'ft-pos-F', 'ft-pos-D', 'ft-group-2', 'ft-group-3',
+                                    'ft-team-BOT'])
+    # Free-agent codes and players without a logo are plain text
+    assert "<td class='ft-cell'>UFA</td>" in html
+    assert "<td class='ft-cell'>C</td>" in html
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def reference_z_scores(players_df, config):
+    """Draftable players, their Z-scores and the totals, valued one position at a time"""
+    z_by_player, total_z = {}, 0.0
+    for pos, group in players_df.groupby('POS', observed=True):
+        if pos not in config.position_requirements:
+            continue
+        baseline = config.position_requirements[pos] * config.n_teams
+        group = group[group['STATUS'] != 'MINOR'].sort_values('PTS', ascending=False, kind='stable')
+        below = group.iloc[baseline:]
+        top = group.head(baseline - int((below['STATUS'] == 'START').sum()))
+        points = top.loc[top['FCHL TEAM'].isin(['ENT', 'RFA', 'UFA']), 'PTS']
+        if len(points):
+            stdev = points.std()
+            z_scores = (points - points.mean()) / (1 if stdev == 0 or pd.isna(stdev) else stdev)
+            z_scores -= z_scores.min()
+            z_by_player.update(z_scores)
+            total_z += z_scores.sum()
+    return pd.Series(z_by_player, dtype=float), total_z
+
+
+def test_z_scores_match_a_per_position_valuation(auction):
+    teams = list(auction.config.teams)
+    for sale in range(15):
+        player_count, total_z = auction.calculate_z_scores()
+        expected, expected_total = reference_z_scores(auction.players_df, auction.config)
+
+        draftable = auction.players_df.index[auction.players_df['Draftable'] == 'YES']
+        assert sorted(draftable) == sorted(expected.index)
+        assert player_count == len(expected)
+        assert total_z == pytest.approx(expected_total, rel=1e-9)
+        np.testing.assert_allclose(auction.players_df.loc[expected.index, 'Z-score'], expected.round(2), atol=1e-9)
+
+        # Sales change the baseline adjustments, the free agent pool and every position's statistics
+        player = auction.get_available_players().index[sale % 6]
+        team = teams[sale % len(teams)]
+        auction.assign_player_to_team(player, team, float(auction.players_df.loc[player, 'BID']))
+        if sale % 5 == 4:
+            auction.update_player_status(player, 'MINOR')
+        auction.process_data()